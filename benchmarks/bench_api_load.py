@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: benchmarks/bench_api_load.py
+DESCRIÇÃO:
+    Teste de carga do caminho de resumo do lexis (lexis_core.summarize.main) contra o
+    servidor local que imita o Gemini (lexis_core.standin), sem gastar cota real.
+
+    Para cada nível de concorrência (--concurrency), gera uma pasta de canal sintética
+    (benchmarks/corpus.py), roda o main() nela (modo threaded com --workers N, ou
+    --async com concorrência fixa N) e mede:
+    - arquivos/s do processamento completo (leitura, API, gravação e arquivamento);
+    - latência das chamadas lógicas (p50/p95/p99/máx, incluindo retentativas e backoff);
+    - retentativas do cliente e a cota desperdiçada: tentativas e tokens de entrada que
+      o servidor rejeitou (429/500), tirados do /stats do standin.
+
+    O standin roda no próprio processo (porta livre) com latência e falhas injetadas
+    pelas opções abaixo, ou use --base-url para apontar para um já em execução
+    (`python -m lexis_core.standin ...`). LEXIS_HOME aponta para uma pasta temporária,
+    então nem o .env nem o cache de resumos do checkout são usados.
+
+USO:
+    python benchmarks/bench_api_load.py --files 200 --concurrency 1 4 16 --latency lognormal:0.3,0.5
+    python benchmarks/bench_api_load.py --async --concurrency 8 32 --error-429 0.05 --server-rpm 600
+    python benchmarks/bench_api_load.py --files 300 --cues 60 --extra=--pack-shorts --json carga.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shlex
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from lexis_core.report import RunReport, percentile  # noqa: E402
+from lexis_core.shortpack import format_pack_videos, pack_keys, parse_pack_response  # noqa: E402
+from lexis_core.standin import FaultProfile, fake_response, make_server  # noqa: E402
+from corpus import make_tree  # noqa: E402
+
+
+def check_pack_roundtrip(summarize, count=3):
+    """
+    Um grupo do --pack-shorts precisa voltar do standin com um resumo por vídeo; se faltar
+    algum, o lexis refaz o vídeo numa chamada individual e a contagem de requisições da
+    carga fica inflada.
+    """
+    keys = pack_keys(count)
+    prompt = summarize.PACK_PROMPT_TEMPLATE.format(
+        count=count, videos=format_pack_videos(keys, (f"transcrição {key}" for key in keys)))
+    response = fake_response(prompt, {"responseMimeType": "application/json"})
+    summaries = parse_pack_response(response["candidates"][0]["content"]["parts"][0]["text"], keys)
+    if len(summaries) != count:
+        raise SystemExit(f"Standin devolveu {len(summaries)}/{count} resumos para um grupo do --pack-shorts")
+
+
+def fetch_stats(base_url):
+    with urllib.request.urlopen(base_url.rstrip("/") + "/stats", timeout=10) as response:
+        return json.load(response)
+
+
+def start_standin(args):
+    """Servidor local numa porta livre, em thread daemon. Retorna (server, base_url)."""
+    faults = FaultProfile(args.latency, args.error_429, args.error_500, args.server_rpm, args.server_tpm,
+                          args.retry_delay, args.output_tokens, args.seed)
+    server = make_server("127.0.0.1", 0, faults=faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def reset_summarize(summarize):
+    """Estado limpo entre execuções: relatório, cliente e cache de resumos (senão tudo vira acerto de cache)."""
+    summarize.run_report = RunReport()
+    summarize.client.reset()
+    # O main() fecha a conexão ao terminar; reset() faz a próxima execução abrir um cache novo
+    summarize.summary_cache.reset()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(summarize.CACHE_PATH + suffix):
+            os.remove(summarize.CACHE_PATH + suffix)
+
+
+def run_level(summarize, workdir, concurrency, args, base_url):
+    channel_dir = os.path.join(workdir, "Canal000")
+    shutil.rmtree(workdir, ignore_errors=True)
+    corpus = make_tree(workdir, channels=1, videos=args.files, cues=args.cues, formats=10, seed=args.seed or 42)
+    reset_summarize(summarize)
+
+    argv = ["--keep-duplicates", "--report", os.path.join(workdir, "relatorio.json")]
+    if args.use_async:
+        argv += ["--async", "--initial-concurrency", str(concurrency), "--max-concurrency", str(concurrency)]
+    else:
+        argv += ["--workers", str(concurrency)]
+    if args.rpm:
+        argv += ["--rpm", str(args.rpm)]
+    if args.tpm:
+        argv += ["--tpm", str(args.tpm)]
+    argv += shlex.split(args.extra)
+
+    before = fetch_stats(base_url)
+    previous_dir = os.getcwd()
+    os.chdir(channel_dir)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            summarize.main(argv)
+        seconds = time.perf_counter() - start
+    finally:
+        os.chdir(previous_dir)
+    after = fetch_stats(base_url)
+    served = {key: after[key] - before[key] for key in after}
+
+    calls = list(summarize.run_report.api_calls)
+    elapsed = sorted(call["elapsed"] for call in calls)
+    written = sum(1 for name in os.listdir(channel_dir) if name.endswith(".txt"))
+    attempts = served["requests"]
+    rejected = served["rate_limited"] + served["server_errors"]
+    attempted_tokens = served["prompt_tokens"] + served["rejected_prompt_tokens"]
+    return {
+        "concurrency": concurrency,
+        "files": corpus["videos"],
+        "summarized": written,
+        "seconds": round(seconds, 3),
+        "files_per_s": round(written / seconds, 2) if seconds else None,
+        "calls": len(calls),
+        "failed_calls": sum(1 for call in calls if not call["ok"]),
+        "client_retries": sum(call["retries"] for call in calls),
+        "latency_p50": _round(percentile(elapsed, 50)),
+        "latency_p95": _round(percentile(elapsed, 95)),
+        "latency_p99": _round(percentile(elapsed, 99)),
+        "latency_max": _round(elapsed[-1] if elapsed else None),
+        "attempts": attempts,
+        "rejected_429": served["rate_limited"],
+        "rejected_500": served["server_errors"],
+        "wasted_attempts_pct": round(100 * rejected / attempts, 1) if attempts else 0.0,
+        "wasted_prompt_tokens": served["rejected_prompt_tokens"],
+        "wasted_tokens_pct": round(100 * served["rejected_prompt_tokens"] / attempted_tokens, 1)
+                             if attempted_tokens else 0.0,
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+def format_table(results):
+    header = (f"{'conc':>5} {'ok/arq':>9} {'s':>8} {'arq/s':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'máx':>7} "
+              f"{'retent':>7} {'429':>5} {'500':>5} {'desperd':>8}")
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['concurrency']:>5} {r['summarized']:>4}/{r['files']:<4} {r['seconds']:>8.2f} {r['files_per_s'] or 0:>8.2f} "
+            f"{r['latency_p50'] or 0:>7.3f} {r['latency_p95'] or 0:>7.3f} {r['latency_p99'] or 0:>7.3f} "
+            f"{r['latency_max'] or 0:>7.3f} {r['client_retries']:>7} {r['rejected_429']:>5} {r['rejected_500']:>5} "
+            f"{r['wasted_tokens_pct']:>7.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do lexis contra o servidor local do Gemini.")
+    parser.add_argument("--files", type=int, default=100, help="Vídeos (.srt + .info.json) por execução.")
+    parser.add_argument("--cues", type=int, default=300, help="Blocos de legenda por vídeo (tamanho da transcrição).")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16],
+                        help="Níveis de concorrência (--workers, ou concorrência fixa com --async).")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Usa o modo --async do lexis.")
+    parser.add_argument("--rpm", type=int, default=None, help="--rpm do lexis (limite do cliente).")
+    parser.add_argument("--tpm", type=int, default=None, help="--tpm do lexis (limite do cliente).")
+    parser.add_argument("--extra", default="", help="Outras opções do lexis, ex: --extra=--pack-shorts.")
+    parser.add_argument("--base-url", default=None,
+                        help="Usa um standin já em execução (ignora as opções do servidor abaixo).")
+    server_group = parser.add_argument_group("servidor local (standin)")
+    server_group.add_argument("--latency", default="lognormal:0.3,0.5",
+                              help="Distribuição de latência (ver lexis_core.standin.parse_latency).")
+    server_group.add_argument("--error-429", type=float, default=0.0, help="Fração de respostas 429.")
+    server_group.add_argument("--error-500", type=float, default=0.0, help="Fração de respostas 500.")
+    server_group.add_argument("--server-rpm", type=int, default=None, help="Cota de requisições/min do servidor.")
+    server_group.add_argument("--server-tpm", type=int, default=None, help="Cota de tokens/min do servidor.")
+    server_group.add_argument("--retry-delay", type=float, default=None, help="retryDelay (s) nas respostas 429.")
+    server_group.add_argument("--output-tokens", type=int, default=300, help="Tamanho das respostas em tokens.")
+    server_group.add_argument("--seed", type=int, default=None, help="Semente do corpus e das falhas.")
+    parser.add_argument("--json", metavar="ARQUIVO", help="Grava os resultados em JSON.")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="lexis_load_")
+    server = None
+    try:
+        base_url = args.base_url
+        if not base_url:
+            server, base_url = start_standin(args)
+        # O summarize lê LEXIS_HOME no import e a chave/endpoint ao criar o cliente
+        os.environ["LEXIS_HOME"] = home
+        os.environ["GEMINI_API_KEY"] = "load-test"
+        os.environ["GEMINI_BASE_URL"] = base_url
+        from lexis_core import summarize
+        check_pack_roundtrip(summarize)
+
+        mode = "async" if args.use_async else "threaded"
+        print(f"Servidor: {base_url} | modo {mode} | {args.files} vídeos x {args.cues} blocos")
+        results = []
+        for concurrency in args.concurrency:
+            results.append(run_level(summarize, os.path.join(home, "run"), concurrency, args, base_url))
+            print(f"  concorrência {concurrency}: {results[-1]['files_per_s']} arq/s")
+        reset_summarize(summarize)
+
+        print()
+        print(format_table(results))
+        print("\nLatência (s) por chamada lógica, com retentativas; desperdiçado = tokens de entrada em tentativas "
+              "rejeitadas.")
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({"mode": mode, "base_url": base_url, "options": vars(args), "results": results},
+                          f, indent=2, ensure_ascii=False)
+            print(f"Resultados gravados em {args.json}")
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(home, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: benchmarks/bench_archive.py
+DESCRIÇÃO:
+    Compara os dois modos de arquivamento do lexis (--archive-mode) sobre o mesmo corpus
+    sintético de legendas roll-up + .info.json (benchmarks/corpus.py):
+    - move: um shutil.move por arquivo para archive/ (o modo padrão);
+    - pack: lotes anexados a pacotes zip indexados (lexis_core.archive), um fsync por lote.
+    Mede o tempo de arquivamento, os arquivos que ficam em archive/ (inodes), o espaço em
+    disco ocupado (blocos alocados), o tempo de listar archive/ e a extração de um vídeo
+    pelo ID (no modo move, a busca equivalente é um os.listdir + cópia).
+
+USO:
+    python benchmarks/bench_archive.py --videos 2000 --cues 300 --batch 200
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexis_core.archive import ARCHIVE_DIR_NAME, ArchivePacks  # noqa: E402
+from corpus import make_tree  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def disk_usage(directory):
+    """(arquivos, bytes alocados em disco) de uma pasta."""
+    count = used = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                count += 1
+                used += getattr(entry.stat(), "st_blocks", 0) * 512 or entry.stat().st_size
+    return count, used
+
+
+def channel_files(channel_dir):
+    names = sorted(os.listdir(channel_dir))
+    return [os.path.join(channel_dir, name) for name in names if name.endswith((".srt", ".info.json"))]
+
+
+def archive_move(paths, archive_dir):
+    os.makedirs(archive_dir, exist_ok=True)
+    for path in paths:
+        shutil.move(path, os.path.join(archive_dir, os.path.basename(path)))
+
+
+def archive_pack(paths, archive_dir, batch):
+    packs = ArchivePacks(archive_dir)
+    try:
+        for i in range(0, len(paths), batch):
+            for path, _ in packs.add_files([(path, None) for path in paths[i:i + batch]]):
+                os.remove(path)
+    finally:
+        packs.close()
+
+
+def extract_move(archive_dir, video_id, destination):
+    for name in os.listdir(archive_dir):
+        if video_id in name:
+            shutil.copy2(os.path.join(archive_dir, name), destination)
+
+
+def extract_pack(archive_dir, video_id, destination):
+    packs = ArchivePacks(archive_dir)
+    try:
+        packs.extract(video_id, destination, overwrite=True)
+    finally:
+        packs.close()
+
+
+def median_seconds(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run_mode(mode, root, args):
+    shutil.rmtree(root, ignore_errors=True)
+    stats = make_tree(root, channels=1, videos=args.videos, cues=args.cues, formats=args.formats, seed=args.seed)
+    channel_dir = os.path.join(root, "Canal000")
+    paths = channel_files(channel_dir)
+    ids = [os.path.basename(path)[len("Canal000-"):-len(".srt")] for path in paths if path.endswith(".srt")]
+    archive_dir = os.path.join(channel_dir, ARCHIVE_DIR_NAME)
+
+    start = time.perf_counter()
+    if mode == "move":
+        archive_move(paths, archive_dir)
+    else:
+        archive_pack(paths, archive_dir, args.batch)
+    seconds = time.perf_counter() - start
+
+    files, used = disk_usage(archive_dir)
+    listing = median_seconds(lambda: os.listdir(archive_dir), args.repeat)
+    destination = os.path.join(root, "extraido")
+    os.makedirs(destination, exist_ok=True)
+    rng = random.Random(args.seed)
+    extract = extract_move if mode == "move" else extract_pack
+    extraction = median_seconds(lambda: extract(archive_dir, rng.choice(ids), destination), args.repeat)
+    return {
+        "mode": mode,
+        "input_mb": round((stats["srt_bytes"] + stats["info_bytes"]) / MB, 2),
+        "seconds": round(seconds, 3),
+        "files_in_archive": files,
+        "disk_mb": round(used / MB, 2),
+        "listdir_ms": round(listing * 1000, 3),
+        "extract_ms": round(extraction * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos modos de arquivamento (move x pack).")
+    parser.add_argument("--videos", type=int, default=1000, help="Vídeos (.srt + .info.json).")
+    parser.add_argument("--cues", type=int, default=300, help="Blocos de legenda por vídeo.")
+    parser.add_argument("--formats", type=int, default=100, help="Tamanho do array formats do .info.json.")
+    parser.add_argument("--batch", type=int, default=100, help="Arquivos por lote no modo pack.")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetições da listagem e da extração.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="lexis_archive_")
+    try:
+        results = [run_mode(mode, os.path.join(root, mode), args) for mode in ("move", "pack")]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"{args.videos} vídeos ({results[0]['input_mb']} MB de .srt + .info.json), lotes de {args.batch}\n")
+    print(f"{'modo':6} {'tempo (s)':>10} {'arquivos':>9} {'disco (MB)':>11} {'listdir (ms)':>13} {'extrair (ms)':>13}")
+    for r in results:
+        print(f"{r['mode']:6} {r['seconds']:>10.3f} {r['files_in_archive']:>9} {r['disk_mb']:>11.2f} "
+              f"{r['listdir_ms']:>13.3f} {r['extract_ms']:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
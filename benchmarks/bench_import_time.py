@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: benchmarks/bench_import_time.py
+DESCRIÇÃO:
+    Mede o tempo de partida dos comandos do Lexis: cada medição é um processo
+    Python novo (`python -c "import ..."` ou `python lexis.py --help`), com o
+    melhor de N repetições, descontado o tempo de um interpretador vazio.
+    Também confere quais dependências pesadas (google.genai, dotenv) cada
+    módulo carrega: o comando offline (lexis-join) e o --help não devem tocar
+    no SDK do Gemini, que só é importado na primeira chamada à API.
+
+USO:
+    python benchmarks/bench_import_time.py                  # melhor de 5
+    python benchmarks/bench_import_time.py --repeat 10 --output import.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    "lexis_core.srt",
+    "lexis_core.metadata",
+    "lexis_core.volumes",
+    "lexis_core.join",
+    "lexis_core.summarize",
+    "lexis_core.search",
+    "lexis_core.archive",
+)
+SCRIPTS = ("lexis.py", "lexis-join.py", "lexis-search.py")
+HEAVY_MODULES = ("google.genai", "dotenv")
+
+PROBE = "import sys; {imports}; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+
+
+def run_python(args):
+    """Executa `python <args>` no diretório do repositório; retorna (segundos, stdout)."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, *args], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, proc.stdout
+
+
+def best_of(args, repeat):
+    return min(run_python(args)[0] for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de importação/partida dos comandos do Lexis.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições por medição (vale o melhor).")
+    parser.add_argument("--output", help="Grava os resultados em JSON neste caminho.")
+    args = parser.parse_args()
+
+    baseline = best_of(["-c", "pass"], args.repeat)
+    print(f"Interpretador vazio: {baseline * 1000:.1f} ms (descontado abaixo)")
+    print(f"  {'alvo':28} {'ms':>8}  dependências pesadas carregadas")
+
+    results = {"baseline_ms": round(baseline * 1000, 2), "modules": {}, "scripts": {}}
+    for module in MODULES:
+        elapsed = best_of(["-c", f"import {module}"], args.repeat) - baseline
+        _, loaded = run_python(["-c", PROBE.format(imports=f"import {module}", heavy=HEAVY_MODULES)])
+        loaded = [name for name in loaded.strip().split(",") if name]
+        results["modules"][module] = {"ms": round(elapsed * 1000, 2), "heavy_loaded": loaded}
+        print(f"  {module:28} {elapsed * 1000:8.1f}  {', '.join(loaded) or '-'}")
+
+    for script in SCRIPTS:
+        elapsed = best_of([script, "--help"], args.repeat) - baseline
+        results["scripts"][f"{script} --help"] = {"ms": round(elapsed * 1000, 2)}
+        print(f"  {script + ' --help':28} {elapsed * 1000:8.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: benchmarks/bench_memory.py
+DESCRIÇÃO:
+    Pico de memória (tracemalloc) da limpeza de uma legenda longa (live de várias horas,
+    roll-up sintético de benchmarks/corpus.py), no caminho anterior e no caminho em streaming:
+    - lexis.py: f.read() + process_srt_content (texto, sentenças e parágrafos inteiros)
+      vs iter_transcript_chunks -> SpooledText -> arquivo de saída;
+    - lexis-join.py: f.read() + clean_srt_content + linhas + texto consolidado + encode
+      vs iter_clean_chunks -> SpooledText -> volume.
+    No streaming o pico deve ficar estável ao aumentar --cues; no caminho anterior ele
+    cresce com o tamanho do arquivo.
+
+USO:
+    python benchmarks/bench_memory.py --cues 200000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import make_rollup_srt  # noqa: E402
+from lexis_core.spool import SpooledText  # noqa: E402
+from lexis_core.srt import (clean_srt_content, iter_clean_chunks, iter_transcript_chunks,  # noqa: E402
+                            process_srt_content)
+from lexis_core.tokens import TokenEstimator  # noqa: E402
+
+
+def legacy_summarize(path, work_dir, estimator):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    _, full_text = process_srt_content(content)
+    estimator.estimate(full_text)
+    with open(os.devnull, 'w', encoding='utf-8') as out:
+        out.write(full_text + "\n")
+    return len(full_text)
+
+
+def streaming_summarize(path, work_dir, estimator):
+    with open(path, 'r', encoding='utf-8') as f, SpooledText(work_dir, count_tokens=estimator.estimate) as text:
+        for chunk in iter_transcript_chunks(f):
+            text.write(chunk)
+        with open(os.devnull, 'wb') as out:
+            text.copy_to(out)
+        return text.chars
+
+
+def legacy_join(path, work_dir, estimator):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    clean_text = clean_srt_content(content.strip())
+    lines = [line.strip() for line in clean_text.split('\n') if line.strip()]
+    processed = "HEADER\n" + ' '.join(lines) + "\nFOOTER\n"
+    with open(os.devnull, 'wb') as out:
+        out.write(processed.encode('utf-8'))
+    return len(processed)
+
+
+def streaming_join(path, work_dir, estimator):
+    with open(path, 'r', encoding='utf-8') as f, SpooledText(work_dir) as processed:
+        processed.write("HEADER\n")
+        for chunk in iter_clean_chunks(f):
+            processed.write(chunk)
+        processed.write("\nFOOTER\n")
+        with open(os.devnull, 'wb') as out:
+            processed.copy_to(out)
+        return processed.chars
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    chars = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pico de memória da limpeza de legendas longas.")
+    parser.add_argument("--cues", type=int, default=200000, help="Blocos da legenda sintética (~120 bytes cada).")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="lexis_mem_")
+    try:
+        path = os.path.join(work_dir, "live.srt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_rollup_srt(args.cues))
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"SRT sintético: {args.cues} blocos, {size_mb:.1f} MB (pico medido com tracemalloc)")
+        print(f"  {'caso':34} {'pico (MB)':>10} {'tempo (s)':>10} {'texto (chars)':>14}")
+        estimator = TokenEstimator()
+        rows = [
+            ("lexis.py anterior", legacy_summarize),
+            ("lexis.py streaming", streaming_summarize),
+            ("lexis-join.py anterior", legacy_join),
+            ("lexis-join.py streaming", streaming_join),
+        ]
+        for label, fn in rows:
+            peak, elapsed, chars = measure(fn, path, work_dir, estimator)
+            print(f"  {label:34} {peak / (1024 * 1024):10.1f} {elapsed:10.2f} {chars:14d}")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
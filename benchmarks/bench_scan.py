@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: benchmarks/bench_scan.py
+DESCRIÇÃO:
+    Compara a varredura da biblioteca (lexis_core.scan) com a listagem anterior
+    numa árvore sintética canais/playlists (arquivos vazios: só conta o custo de
+    listar). A listagem anterior, aplicada a cada pasta, fazia três leituras do
+    diretório: glob("*.srt") do lexis.py, os.listdir + regex do lexis-join.py e o
+    scandir do índice de metadados. A varredura nova faz um scandir por pasta e
+    entrega os .info.json ao índice. Mede também a versão com threads.
+
+USO:
+    python benchmarks/bench_scan.py --channels 50 --playlists 4 --videos 50 --threads 4
+"""
+import argparse
+import glob
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexis_core import metadata  # noqa: E402
+from lexis_core.scan import prime_metadata, scan_tree  # noqa: E402
+
+
+def make_library(root, channels, playlists, videos):
+    """Canal/Playlist/Canal-ID{.srt,.txt,.info.json} + archive/ em cada canal. Retorna o nº de arquivos."""
+    count = 0
+    for c in range(channels):
+        channel = f"Canal{c:03d}"
+        os.makedirs(os.path.join(root, channel, "archive"))
+        for p in range(playlists):
+            folder = os.path.join(root, channel, f"Playlist{p:02d}")
+            os.makedirs(folder)
+            for v in range(videos):
+                base = os.path.join(folder, f"{channel}-{c:03d}{p:02d}{v:06d}")
+                for suffix in (".srt", ".txt", ".info.json"):
+                    open(base + suffix, 'w').close()
+                    count += 1
+    return count
+
+
+def legacy_listing(root):
+    """Uma passada do os.walk e, por pasta, as três listagens que os scripts faziam."""
+    srt_files = []
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in ("archive", "volumes_notebooklm")]
+        srt_files.extend(glob.glob(os.path.join(glob.escape(dirpath), "*.srt")))
+        name = os.path.basename(dirpath)
+        pattern = re.compile(rf"^{re.escape(name)}-[A-Za-z0-9_-]{{11}}(?:-[a-zA-Z0-9-]+)?\.(txt|srt)$")
+        [f for f in os.listdir(dirpath) if pattern.match(f)]
+        metadata.MetadataIndex(dirpath)
+    return len(srt_files)
+
+
+def new_scan(root, threads):
+    folders = scan_tree(root, threads=threads)
+    prime_metadata(folders)
+    return sum(len(folder.srt) for folder in folders)
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        # Índices de metadados novos a cada repetição (o cache por processo mascararia o custo)
+        metadata._indexes.clear()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura da biblioteca: scandir único vs listagens por pasta.")
+    parser.add_argument("--channels", type=int, default=50)
+    parser.add_argument("--playlists", type=int, default=4)
+    parser.add_argument("--videos", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="lexis_scan_")
+    try:
+        files = make_library(root, args.channels, args.playlists, args.videos)
+        print(f"Árvore: {args.channels} canais x {args.playlists} playlists x {args.videos} vídeos "
+              f"({files} arquivos)")
+        rows = [
+            ("listagens por pasta (anterior)", lambda: legacy_listing(root)),
+            ("scan_tree (1 thread)", lambda: new_scan(root, 1)),
+            (f"scan_tree ({args.threads} threads)", lambda: new_scan(root, args.threads)),
+        ]
+        for label, fn in rows:
+            elapsed, srt_count = timed(fn, args.repeat)
+            print(f"  {label:32} {elapsed * 1000:9.1f} ms  {files / elapsed:12.0f} arquivos/s  ({srt_count} .srt)")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
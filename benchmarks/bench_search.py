@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: benchmarks/bench_search.py
+DESCRIÇÃO:
+    Mede o índice de busca do lexis-search (lexis_core.search) sobre volumes sintéticos no
+    formato do lexis-join (vocabulário com distribuição de Zipf):
+    - construção do índice completo (MB/s) e tamanho do índice em relação aos volumes
+      (como o lexis-join o deixa e após compact(), como no `lexis-search --reindex`);
+    - sync() sem mudanças e depois de alterar um único volume (atualização incremental);
+    - latência das consultas (mediana e p95 de consultas aleatórias de 1 a 3 termos)
+      contra uma varredura estilo grep (ler todos os volumes e procurar os termos).
+
+USO:
+    python benchmarks/bench_search.py --volumes 40 --videos 20 --words 15000 --queries 200
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexis_core.join import video_footer, video_header  # noqa: E402
+from lexis_core.search import INDEX_FILENAME, SearchIndex, fold  # noqa: E402
+from lexis_core.volumes import volume_filename, volume_header  # noqa: E402
+
+SYLLABLES = "ba be bi bo bu ca ce ci co cu da de di do du fa fe fi fo ga gi go la le li lo lu ma me mi mo " \
+            "mu na ne ni no nu pa pe pi po pu ra re ri ro ru sa se si so su ta te ti to tu va ve vi vo ção são".split()
+
+
+def make_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_volumes(directory, volumes, videos, words, vocabulary, rng):
+    """Grava os volumes e retorna o total de bytes."""
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    total = 0
+    for v in range(1, volumes + 1):
+        parts = [volume_header("Canal", v)]
+        for i in range(videos):
+            name = f"Canal-{v:05d}{i:06d}.srt"
+            meta = {"date": "20240101", "title": " ".join(rng.choices(vocabulary, weights, k=5)), "id": name[6:17]}
+            text = " ".join(rng.choices(vocabulary, weights, k=words))
+            parts.append(video_header(name, meta) + text + video_footer(name))
+        data = "".join(parts).encode('utf-8')
+        with open(os.path.join(directory, volume_filename("Canal", v)), 'wb') as f:
+            f.write(data)
+        total += len(data)
+    return total
+
+
+def grep_scan(directory, terms):
+    """Linha de base: lê todos os volumes e conta os vídeos que contêm algum dos termos."""
+    pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\b")
+    hits = 0
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".txt"):
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            for block in f.read().split("--- METADADOS DO DOCUMENTO ---"):
+                if pattern.search(fold(block)):
+                    hits += 1
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice de busca (BM25) dos volumes: construção e consultas.")
+    parser.add_argument("--volumes", type=int, default=40)
+    parser.add_argument("--videos", type=int, default=20, help="Vídeos por volume.")
+    parser.add_argument("--words", type=int, default=15000, help="Palavras por vídeo.")
+    parser.add_argument("--vocabulary", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    directory = tempfile.mkdtemp(prefix="lexis_search_")
+    try:
+        vocabulary = make_vocabulary(args.vocabulary, rng)
+        total = make_volumes(directory, args.volumes, args.videos, args.words, vocabulary, rng)
+        print(f"Volumes: {args.volumes} x {args.videos} vídeos x {args.words} palavras "
+              f"({total / (1024 * 1024):.1f} MB)")
+
+        index_path = os.path.join(directory, INDEX_FILENAME)
+        index = SearchIndex(index_path)
+        start = time.perf_counter()
+        changed, _ = index.sync(directory)
+        build = time.perf_counter() - start
+        index.close()
+        size = os.path.getsize(index_path)
+        print(f"  construção completa      {build:8.2f} s  {total / (1024 * 1024) / build:6.1f} MB/s  "
+              f"({len(changed)} volumes, índice {size / (1024 * 1024):.1f} MB = {size / total:.0%} dos volumes)")
+        index = SearchIndex(index_path)
+        index.compact()
+        size = os.path.getsize(index_path)
+        print(f"  após compact (VACUUM)    índice {size / (1024 * 1024):.1f} MB = {size / total:.0%} dos volumes")
+
+        start = time.perf_counter()
+        index.sync(directory)
+        print(f"  sync sem mudanças        {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        with open(os.path.join(directory, volume_filename("Canal", 1)), 'a', encoding='utf-8') as f:
+            f.write(video_header("Canal-extra000000.srt", {"date": "20240102", "title": "extra", "id": "extra000000"})
+                    + "palavra nova inédita" + video_footer("Canal-extra000000.srt"))
+        start = time.perf_counter()
+        changed, _ = index.sync(directory)
+        print(f"  sync com 1 volume alterado {(time.perf_counter() - start) * 1000:6.1f} ms  ({len(changed)} reindexado)")
+
+        queries = [" ".join(rng.sample(vocabulary[:5000], rng.randint(1, 3))) for _ in range(args.queries)]
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"  consulta (BM25, top 10)  mediana {statistics.median(latencies) * 1000:.2f} ms, "
+              f"p95 {p95 * 1000:.2f} ms ({len(queries)} consultas)")
+
+        start = time.perf_counter()
+        for query in queries[:5]:
+            grep_scan(directory, [fold(word) for word in query.split()])
+        print(f"  varredura estilo grep    {(time.perf_counter() - start) / 5 * 1000:.1f} ms por consulta")
+        index.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: benchmarks/bench_srt_parser.py
+DESCRIÇÃO:
+    Compara o parser de legendas em streaming (lexis_core.srt) com a implementação
+    anterior baseada na regex DOTALL `((?:(?!\\n\\n).)*?)`, usando um .srt sintético
+    no estilo "roll-up" das legendas automáticas do YouTube.
+    Confere que o parser produz exatamente o mesmo texto da implementação anterior
+    (process_srt_content) e mede quantas palavras repetidas o dedup por sobreposição
+    de palavras (KMP) remove a mais que o dedup antigo por linhas (clean_srt_content).
+
+USO:
+    python benchmarks/bench_srt_parser.py --cues 20000 --repeat 5
+"""
+import argparse
+import io
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexis_core.srt import clean_srt_content, dedup_ratio, process_srt_content  # noqa: E402
+from corpus import make_rollup_srt  # noqa: E402
+
+
+def legacy_clean_srt_content(content):
+    """Implementação anterior do lexis-join.py (mantida aqui só para comparação)."""
+    content = content.replace('\r\n', '\n')
+    pattern = re.compile(r'(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n((?:(?!\n\n).)*?)(?=\n\n|$)', re.DOTALL)
+    blocks = []
+    for match in pattern.finditer(content):
+        text_block = match.group(4).strip()
+        text_block = re.sub(r'<[^>]*>', '', text_block)
+        if text_block:
+            blocks.append(text_block)
+
+    cleaned_lines = []
+    if blocks:
+        cleaned_lines.append(blocks[0])
+        for i in range(1, len(blocks)):
+            prev_text = blocks[i-1]
+            curr_text = blocks[i]
+            if curr_text.startswith(prev_text):
+                new_part = curr_text[len(prev_text):].strip()
+                if new_part:
+                    cleaned_lines.append(new_part)
+                continue
+            prev_lines = [l.strip() for l in prev_text.split('\n') if l.strip()]
+            curr_lines = [l.strip() for l in curr_text.split('\n') if l.strip()]
+            start_idx = 0
+            if prev_lines and curr_lines:
+                if curr_lines[0] == prev_lines[-1]:
+                    start_idx = 1
+                elif len(prev_lines) < len(curr_lines) and curr_lines[:len(prev_lines)] == prev_lines:
+                    start_idx = len(prev_lines)
+            for j in range(start_idx, len(curr_lines)):
+                cleaned_lines.append(curr_lines[j])
+    return ' '.join(cleaned_lines)
+
+
+REGEX_TIMESTAMPS = re.compile(r'\d+\n\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}')
+REGEX_HTML = re.compile(r'<[^>]+>')
+REGEX_SENTENCE_SPLIT = re.compile(r'(?<=[.!?]) +')
+
+
+def legacy_process_srt_content(content, overlap_sentences=2):
+    """Implementação anterior do lexis.py (mantida aqui só para comparação)."""
+    clean_text = REGEX_TIMESTAMPS.sub('', content)
+    clean_text = REGEX_HTML.sub('', clean_text)
+    lines = [line.strip() for line in clean_text.split('\n') if line.strip()]
+    full_text = ' '.join(lines)
+
+    sentences = REGEX_SENTENCE_SPLIT.split(full_text)
+    paragraphs = []
+    chunk_size = 12
+    for i in range(0, len(sentences), chunk_size - overlap_sentences):
+        chunk = sentences[i : i + chunk_size]
+        paragraphs.append(" ".join(chunk))
+        if i + chunk_size >= len(sentences): break
+    return "\n\n".join(paragraphs), full_text
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do parser de .srt (streaming vs regex DOTALL).")
+    parser.add_argument("--cues", type=int, default=20000, help="Blocos no .srt sintético (default: 20000).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições; vale o melhor tempo (default: 5).")
+    args = parser.parse_args(argv)
+
+    content = make_rollup_srt(args.cues)
+    size_mb = len(content.encode('utf-8')) / (1024 * 1024)
+    print(f"SRT sintético: {args.cues} blocos, {size_mb:.2f} MB")
+
+    cases = [
+        ("clean_srt_content (lexis-join)",
+         lambda: legacy_clean_srt_content(content),
+         lambda: clean_srt_content(content),
+         lambda: clean_srt_content(io.StringIO(content)),
+         False),
+        ("process_srt_content (lexis.py)",
+         lambda: legacy_process_srt_content(content)[1],
+         lambda: process_srt_content(content)[1],
+         lambda: process_srt_content(io.StringIO(content))[1],
+         True),
+    ]
+
+    print(f"{'caso':34} {'regex (s)':>10} {'stream (s)':>11} {'arquivo (s)':>12} {'speedup':>8} {'MB/s':>8}")
+    for name, legacy, new, new_file, same_as_legacy in cases:
+        legacy_time, legacy_out = best_of(legacy, args.repeat)
+        new_time, new_out = best_of(new, args.repeat)
+        file_time, file_out = best_of(new_file, args.repeat)
+        expected = legacy_out if same_as_legacy else new_out
+        same = "ok" if expected == new_out == file_out else "DIFERENTE"
+        print(f"{name:34} {legacy_time:10.3f} {new_time:11.3f} {file_time:12.3f} "
+              f"{legacy_time / new_time:7.1f}x {size_mb / new_time:8.1f}  saída: {same}")
+
+    stats = {}
+    deduped = clean_srt_content(content, stats)
+    legacy_words = len(legacy_clean_srt_content(content).split())
+    print(f"\nDedup roll-up: {stats['words_removed']} palavras removidas / {stats['words_kept']} mantidas "
+          f"(razão {dedup_ratio(stats):.2f}); texto final {len(deduped.split())} palavras "
+          f"vs {legacy_words} no dedup antigo por linhas")
+
+
+if __name__ == "__main__":
+    main()
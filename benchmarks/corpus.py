@@ -0,0 +1,107 @@
+"""
+MÓDULO: benchmarks/corpus.py
+DESCRIÇÃO:
+    Geradores de corpus sintético para os benchmarks:
+    - make_rollup_srt: legendas automáticas do YouTube no estilo "roll-up"
+      (a 1ª linha de cada bloco repete a última do bloco anterior);
+    - make_info_json: .info.json do yt-dlp com arrays formats/thumbnails grandes
+      e `upload_date` no fim, como nos arquivos reais;
+    - make_tree: árvore de vários canais (pastas) com .srt + .info.json por vídeo.
+    Tudo é determinístico a partir de `seed`.
+"""
+import json
+import os
+import random
+
+WORDS = (
+    "então a gente vai falar hoje sobre graça fé obra salvação igreja texto "
+    "capítulo versículo paulo romanos evangelho história contexto importante "
+    "pergunta resposta exemplo prática vida comunhão oração ação lição"
+).split()
+
+ID_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+
+
+def _timestamp(ms):
+    h, rest = divmod(ms, 3600000)
+    m, rest = divmod(rest, 60000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def make_rollup_srt(cues, seed=42, partial=0.3):
+    """
+    Gera um .srt com duas linhas por bloco, onde a 1ª linha repete a 2ª do bloco anterior.
+    Numa fração `partial` dos blocos só as últimas palavras da linha anterior são repetidas
+    (sobreposição parcial, que o dedup antigo por linhas não reconhecia).
+    """
+    rng = random.Random(seed)
+    out = []
+    previous = ""
+    for i in range(cues):
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9)))
+        if rng.random() < 0.05:
+            line = f"<font color=\"#E5E5E5\">{line}</font>"
+        if previous and rng.random() < partial:
+            text = " ".join(previous.split()[-rng.randint(2, 3):]) + " " + line
+        else:
+            text = f"{previous}\n{line}" if previous else line
+        out.append(f"{i + 1}\n{_timestamp(i * 2000)} --> {_timestamp(i * 2000 + 1990)}\n{text}\n")
+        previous = line
+    return "\n".join(out) + "\n"
+
+
+def make_video_id(rng):
+    return "".join(rng.choice(ID_CHARS) for _ in range(11))
+
+
+def make_info_json(video_id, title, upload_date, formats=400, seed=42):
+    """Dict no formato do yt-dlp: id/title no início, arrays grandes no meio, upload_date no fim."""
+    rng = random.Random(seed)
+    return {
+        "id": video_id,
+        "title": title,
+        "formats": [{
+            "format_id": str(i),
+            "url": f"https://rr{rng.randint(1, 9)}.googlevideo.com/videoplayback?id={video_id}&itag={i}"
+                   f"&sig={rng.getrandbits(256):064x}",
+            "ext": rng.choice(("mp4", "webm", "m4a")),
+            "width": rng.choice((256, 640, 1280, 1920)),
+            "tbr": round(rng.uniform(50, 5000), 3),
+            "http_headers": {"User-Agent": "Mozilla/5.0", "Accept-Language": "pt-BR"},
+        } for i in range(formats)],
+        "thumbnails": [{"url": f"https://i.ytimg.com/vi/{video_id}/{i}.jpg", "id": str(i)} for i in range(formats // 10)],
+        "description": " ".join(rng.choice(WORDS) for _ in range(300)),
+        "duration": rng.randint(300, 7200),
+        "channel": "Canal",
+        "upload_date": upload_date,
+        "timestamp": rng.randint(1500000000, 1700000000),
+    }
+
+
+def make_tree(root, channels=4, videos=10, cues=2000, formats=400, seed=42):
+    """
+    Cria `channels` pastas de canal em `root`, cada uma com `videos` pares
+    <Canal>-<ID>.srt + <Canal>-<ID>.info.json. Retorna estatísticas do corpus.
+    """
+    rng = random.Random(seed)
+    stats = {"channels": channels, "videos": 0, "cues": 0, "srt_bytes": 0, "info_bytes": 0}
+    for c in range(channels):
+        channel = f"Canal{c:03d}"
+        channel_dir = os.path.join(root, channel)
+        os.makedirs(channel_dir, exist_ok=True)
+        for v in range(videos):
+            video_id = make_video_id(rng)
+            base = os.path.join(channel_dir, f"{channel}-{video_id}")
+            srt = make_rollup_srt(cues, seed=rng.getrandbits(32))
+            with open(base + ".srt", 'w', encoding='utf-8') as f:
+                f.write(srt)
+            info = make_info_json(video_id, f"Vídeo {v} do {channel}", f"2024{1 + v % 12:02d}{1 + v % 28:02d}",
+                                  formats=formats, seed=rng.getrandbits(32))
+            with open(base + ".info.json", 'w', encoding='utf-8') as f:
+                json.dump(info, f, ensure_ascii=False)
+            stats["videos"] += 1
+            stats["cues"] += cues
+            stats["srt_bytes"] += len(srt.encode('utf-8'))
+            stats["info_bytes"] += os.path.getsize(base + ".info.json")
+    return stats
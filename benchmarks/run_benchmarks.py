@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: benchmarks/run_benchmarks.py
+DESCRIÇÃO:
+    Suíte de benchmarks do Lexis sobre um corpus sintético (benchmarks/corpus.py).
+    Mede, com o melhor de N repetições:
+    - clean_srt_content / process_srt_content sobre um .srt roll-up grande;
+    - TokenEstimator.estimate / truncate (estimativa offline de tokens) sobre o texto limpo;
+    - process_content do lexis_core.join (limpeza + cabeçalho de um vídeo);
+    - get_metadata do lexis_core.join com o índice frio (sem cache lateral) e quente;
+    - consolidate_by_channel completo (--rebuild) numa árvore de vários canais.
+    Reporta MB/s e blocos/s (cues/s) e grava tudo em JSON para comparar commits.
+
+USO:
+    python benchmarks/run_benchmarks.py                       # grava em benchmarks/results/
+    python benchmarks/run_benchmarks.py --output atual.json --compare base.json
+    python benchmarks/run_benchmarks.py --channels 20 --videos 20 --cues 4000 --jobs 4
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from lexis_core import join, metadata  # noqa: E402
+from lexis_core.srt import clean_srt_content, process_srt_content  # noqa: E402
+from lexis_core.tokens import TokenEstimator  # noqa: E402
+from corpus import make_rollup_srt, make_tree  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+MB = 1024 * 1024
+
+
+def best_of(fn, repeat, setup=None):
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def result(seconds, size_bytes=None, cues=None, items=None):
+    entry = {"seconds": round(seconds, 6)}
+    if size_bytes is not None:
+        entry["mb"] = round(size_bytes / MB, 3)
+        entry["mb_per_s"] = round(size_bytes / MB / seconds, 3)
+    if cues is not None:
+        entry["cues_per_s"] = round(cues / seconds, 1)
+    if items is not None:
+        entry["items_per_s"] = round(items / seconds, 1)
+    return entry
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def reset_metadata_indexes(root):
+    """Índice frio: descarta os índices em memória e os caches laterais da árvore."""
+    metadata._indexes.clear()
+    for dirpath, _, filenames in os.walk(root):
+        if metadata.SIDECAR_NAME in filenames:
+            os.remove(os.path.join(dirpath, metadata.SIDECAR_NAME))
+
+
+def run_suite(args):
+    results = {}
+
+    # 1. Parser de legendas sobre um único .srt grande
+    content = make_rollup_srt(args.cues * 10, seed=args.seed)
+    size = len(content.encode('utf-8'))
+    cues = args.cues * 10
+    results["clean_srt_content"] = result(best_of(lambda: clean_srt_content(content), args.repeat), size, cues)
+    results["process_srt_content"] = result(best_of(lambda: process_srt_content(content), args.repeat), size, cues)
+
+    # 1b. Estimativa de tokens (coeficientes padrão) sobre o texto limpo; truncate no meio do texto
+    clean_text = clean_srt_content(content)
+    clean_size = len(clean_text.encode('utf-8'))
+    estimator = TokenEstimator()
+    half = estimator.estimate(clean_text) // 2
+    results["estimate_tokens"] = result(best_of(lambda: estimator.estimate(clean_text), args.repeat), clean_size)
+    results["truncate_tokens"] = result(best_of(lambda: estimator.truncate(clean_text, half), args.repeat),
+                                        clean_size)
+
+    work_dir = tempfile.mkdtemp(prefix="lexis-bench-")
+    try:
+        corpus = make_tree(work_dir, args.channels, args.videos, args.cues, args.formats, seed=args.seed)
+        srt_paths = sorted(
+            os.path.join(dirpath, name)
+            for dirpath, _, filenames in os.walk(work_dir) for name in filenames if name.endswith(".srt")
+        )
+
+        # 2. process_content (um vídeo: limpeza + dedup + cabeçalho), metadados já resolvidos
+        sample = srt_paths[0]
+        with open(sample, 'r', encoding='utf-8') as f:
+            sample_content = f.read()
+        sample_meta = join.get_metadata(sample)
+        results["process_content"] = result(
+            best_of(lambda: join.process_content(sample_content, os.path.basename(sample), sample, None, sample_meta),
+                    args.repeat),
+            len(sample_content.encode('utf-8')), args.cues)
+
+        # 3. get_metadata para todos os vídeos: índice frio (parse dos .info.json) e quente (cache lateral)
+        def lookup_all():
+            for path in srt_paths:
+                join.get_metadata(path)
+            metadata.save_indexes()
+
+        cold = best_of(lookup_all, args.repeat, setup=lambda: reset_metadata_indexes(work_dir))
+        results["get_metadata_cold"] = result(cold, corpus["info_bytes"], items=len(srt_paths))
+        warm = best_of(lookup_all, args.repeat, setup=metadata._indexes.clear)
+        results["get_metadata_warm"] = result(warm, items=len(srt_paths))
+
+        # 4. consolidate_by_channel completo, reconstruindo todos os canais a cada repetição
+        previous_dir = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            def consolidate():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    join.consolidate_by_channel('.', rebuild=True, jobs=args.jobs)
+
+            results["consolidate_by_channel"] = result(
+                best_of(consolidate, args.repeat, setup=metadata._indexes.clear),
+                corpus["srt_bytes"], corpus["cues"])
+            results["consolidate_by_channel"]["jobs"] = args.jobs
+        finally:
+            os.chdir(previous_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "params": {
+            "channels": args.channels, "videos": args.videos, "cues": args.cues,
+            "formats": args.formats, "repeat": args.repeat, "jobs": args.jobs, "seed": args.seed,
+        },
+        "corpus": corpus,
+        "results": results,
+    }
+
+
+def print_report(report, baseline=None):
+    base_results = (baseline or {}).get("results", {})
+    print(f"{'benchmark':24} {'tempo (s)':>10} {'MB/s':>9} {'cues/s':>11} {'itens/s':>10}"
+          + (f" {'vs base':>9}" if baseline else ""))
+    for name, entry in report["results"].items():
+        line = (f"{name:24} {entry['seconds']:10.4f} {entry.get('mb_per_s', ''):>9} "
+                f"{entry.get('cues_per_s', ''):>11} {entry.get('items_per_s', ''):>10}")
+        base = base_results.get(name)
+        if base:
+            # > 1.0x = mais rápido que a base
+            line += f" {base['seconds'] / entry['seconds']:8.2f}x"
+        print(line)
+    if baseline:
+        print(f"\nBase: commit {baseline.get('commit')} em {baseline.get('timestamp')} "
+              f"(parâmetros {'iguais' if baseline.get('params') == report['params'] else 'DIFERENTES'})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do Lexis sobre um corpus sintético.")
+    parser.add_argument("--channels", type=int, default=4, help="Canais na árvore sintética (default: 4).")
+    parser.add_argument("--videos", type=int, default=10, help="Vídeos por canal (default: 10).")
+    parser.add_argument("--cues", type=int, default=2000, help="Blocos por .srt (default: 2000).")
+    parser.add_argument("--formats", type=int, default=400,
+                        help="Entradas em `formats` de cada .info.json (default: 400).")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições; vale o melhor tempo (default: 3).")
+    parser.add_argument("--jobs", type=int, default=1, help="--jobs do consolidate_by_channel (default: 1).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Arquivo JSON de saída (default: benchmarks/results/<commit>-<data>.json).")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar.")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{report['commit'] or 'local'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"\nResultados gravados em {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+SCRIPT: lexis-search.py
+DESCRIÇÃO:
+    Atalho para o comando `lexis-search` (lexis_core.search), para quem roda direto do
+    checkout: `python /caminho/para/lexis-search.py "termos" [opções]`. Veja o README.
+"""
+from lexis_core.search import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+PACOTE: lexis_core
+DESCRIÇÃO:
+    Componentes reutilizáveis compartilhados pelos scripts do Lexis
+    (lexis.py e lexis-join.py). Cada submódulo é independente e deve ser
+    importado diretamente (ex: `from lexis_core.cache import SummaryCache`),
+    mantendo a importação do pacote leve.
+"""
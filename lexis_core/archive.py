@@ -0,0 +1,444 @@
+"""
+MÓDULO: lexis_core.archive (comando `lexis-archive`, ou `python -m lexis_core.archive`)
+DESCRIÇÃO:
+    Arquivamento compactado das legendas já processadas (modo `lexis --archive-mode pack`).
+
+    Em vez de mover cada .srt para archive/ (centenas de milhares de arquivos pequenos
+    ao longo dos anos, que pesam em toda listagem de pasta e gastam inodes), os .srt e
+    os .info.json são anexados a pacotes zip rotativos em archive/ (lexis_pack_0001.zip,
+    0002, ...; um novo pacote começa quando o atual passa de PACK_MAX_BYTES). Zip com
+    deflate, da biblioteca padrão: os pacotes abrem em qualquer descompactador.
+
+    - Cada lote (add_files) é gravado de uma vez e recebe um único fsync; só depois o
+      índice é confirmado e quem chamou pode apagar os originais.
+    - Antes de anexar, o diretório central do pacote (o fim do zip, que o append
+      sobrescreve) é salvo num diário (<pacote>.journal). Se o processo cair no meio do
+      lote, a próxima abertura devolve o pacote ao estado anterior; os originais ainda
+      estão na pasta e entram no próximo lote.
+    - O índice (archive/.lexis_archive.sqlite3) guarda, por membro, o pacote, o
+      deslocamento no zip, os tamanhos, o CRC e o ID do vídeo. Extrair um vídeo pelo ID
+      abre só o pacote certo. Se o índice sumir, é refeito a partir dos pacotes.
+
+USO:
+    lexis --archive-mode pack                       # arquiva em pacotes ao fim do processamento
+    lexis-archive list [ID ou arquivo] [--dir archive]
+    lexis-archive extract <ID ou arquivo>... [--dir archive] [--to .]
+    lexis-archive pack [--dir archive]              # empacota os arquivos soltos de um archive/ antigo
+    lexis-archive reindex [--dir archive]
+"""
+import argparse
+import os
+import re
+import sqlite3
+import struct
+import sys
+import time
+import warnings
+import zipfile
+import zlib
+
+from lexis_core.metadata import candidate_stems
+
+ARCHIVE_DIR_NAME = "archive"
+INDEX_FILENAME = ".lexis_archive.sqlite3"
+SCHEMA_VERSION = 1
+PACK_FILENAME = "lexis_pack_{:04d}.zip"
+PACK_PATTERN = re.compile(r"^lexis_pack_(\d{4,})\.zip$")
+JOURNAL_SUFFIX = ".journal"
+PACK_MAX_BYTES = 128 * 1024 * 1024
+# Deflate nível 1: ~4x mais rápido que o 6 e só ~20% maior em legendas e .info.json
+COMPRESS_LEVEL = 1
+COPY_CHUNK_BYTES = 1024 * 1024
+# Cabeçalho local de um membro do zip (o mesmo formato do zipfile.structFileHeader)
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+# ID do YouTube no fim do nome base ("Canal-<ID>"), para membros sem .info.json conhecido
+REGEX_VIDEO_ID = re.compile(r'-([A-Za-z0-9_-]{11})$')
+
+
+def guess_video_id(filename):
+    """ID do vídeo pelo nome do arquivo ('Canal-abc123def45.pt.srt' -> 'abc123def45'), ou None."""
+    for stem in candidate_stems(filename):
+        match = REGEX_VIDEO_ID.search(stem)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _file_crc(path):
+    crc = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(COPY_CHUNK_BYTES), b""):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+
+def _copy_member(pack_path, member, out):
+    """
+    Descompacta um membro direto pelo deslocamento e tamanhos do índice, sem ler o diretório
+    central do pacote (que cresce com o número de membros). Confere o CRC no fim.
+    """
+    with open(pack_path, 'rb') as f:
+        f.seek(member["offset"])
+        header = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+        signature, method, name_length, extra_length = header[0], header[4], header[10], header[11]
+        if signature != LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"Membro {member['name']} não encontrado em {pack_path}")
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise zipfile.BadZipFile(f"Compressão não suportada ({method}) em {member['name']}")
+        f.seek(name_length + extra_length, os.SEEK_CUR)
+
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == zipfile.ZIP_DEFLATED else None
+        crc = 0
+        remaining = member["compressed"]
+        while remaining:
+            block = f.read(min(COPY_CHUNK_BYTES, remaining))
+            if not block:
+                raise zipfile.BadZipFile(f"Pacote truncado em {member['name']}")
+            remaining -= len(block)
+            data = decompressor.decompress(block) if decompressor else block
+            crc = zlib.crc32(data, crc)
+            out.write(data)
+        if decompressor:
+            data = decompressor.flush()
+            crc = zlib.crc32(data, crc)
+            out.write(data)
+    if crc != member["crc"]:
+        raise zipfile.BadZipFile(f"CRC inválido em {member['name']} ({pack_path})")
+
+
+def _fsync_dir(directory):
+    """Persiste a entrada de um arquivo novo no diretório (não suportado no Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except (OSError, AttributeError):
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ArchivePacks:
+    """
+    Uso:
+        packs = ArchivePacks("Canal/archive")
+        for path, pack in packs.add_files([("Canal/Canal-ID.srt", "ID"), ...]):
+            os.remove(path)                    # já está num pacote (gravado e com fsync)
+        packs.extract("ID", "Canal")           # recupera .srt/.info.json do vídeo
+        packs.close()
+    """
+
+    def __init__(self, directory, max_pack_bytes=PACK_MAX_BYTES):
+        self.directory = directory
+        self.max_pack_bytes = max_pack_bytes
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, INDEX_FILENAME)
+        rebuild = not os.path.exists(path)
+        self._conn = sqlite3.connect(path)
+        with self._conn:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for table in ("packs", "members"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                rebuild = True
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS packs ("
+                " name TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS members ("
+                " pack TEXT NOT NULL,"
+                " offset INTEGER NOT NULL,"
+                " name TEXT NOT NULL,"
+                " video_id TEXT,"
+                " size INTEGER NOT NULL,"
+                " compressed INTEGER NOT NULL,"
+                " crc INTEGER NOT NULL,"
+                " archived REAL NOT NULL,"
+                " PRIMARY KEY (pack, offset)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS members_video ON members (video_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS members_name ON members (name)")
+        self._recover()
+        if rebuild and self.pack_names():
+            self.rebuild_index()
+
+    def close(self):
+        self._conn.close()
+
+    def pack_names(self):
+        names = [name for name in os.listdir(self.directory) if PACK_PATTERN.match(name)]
+        return sorted(names, key=lambda name: int(PACK_PATTERN.match(name).group(1)))
+
+    # --- Gravação ---
+
+    def _recover(self):
+        """Desfaz lotes interrompidos: o pacote volta ao último estado confirmado no índice."""
+        for name in os.listdir(self.directory):
+            if not name.endswith(JOURNAL_SUFFIX):
+                continue
+            journal_path = os.path.join(self.directory, name)
+            pack = name[:-len(JOURNAL_SUFFIX)]
+            pack_path = os.path.join(self.directory, pack)
+            row = self._conn.execute("SELECT size FROM packs WHERE name = ?", (pack,)).fetchone()
+            committed = row is not None and os.path.exists(pack_path) and os.path.getsize(pack_path) == row[0]
+            if committed:
+                # Tamanho confirmado no índice: o lote terminou, desde que o zip esteja íntegro
+                try:
+                    zipfile.ZipFile(pack_path).close()
+                except zipfile.BadZipFile:
+                    committed = False
+            if not committed:
+                with open(journal_path, 'rb') as f:
+                    start = struct.unpack(">Q", f.read(8))[0]
+                    tail = f.read()
+                if start == 0:
+                    if os.path.exists(pack_path):
+                        os.remove(pack_path)
+                else:
+                    with open(pack_path, 'r+b') as f:
+                        f.truncate(start)
+                        f.seek(start)
+                        f.write(tail)
+                        f.flush()
+                        os.fsync(f.fileno())
+                print(f"Arquivo: lote interrompido desfeito em {pack_path}", file=sys.stderr)
+            os.remove(journal_path)
+
+    def _write_journal(self, pack_path):
+        """Salva o diretório central do pacote (o que o append sobrescreve) antes de anexar."""
+        start, tail = 0, b""
+        if os.path.exists(pack_path):
+            with open(pack_path, 'rb') as f:
+                with zipfile.ZipFile(f) as zf:
+                    start = zf.start_dir
+                f.seek(start)
+                tail = f.read()
+        with open(pack_path + JOURNAL_SUFFIX, 'wb') as f:
+            f.write(struct.pack(">Q", start))
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _current_pack(self):
+        names = self.pack_names()
+        if names:
+            last = names[-1]
+            if os.path.getsize(os.path.join(self.directory, last)) < self.max_pack_bytes:
+                return last
+            return PACK_FILENAME.format(int(PACK_PATTERN.match(last).group(1)) + 1)
+        return PACK_FILENAME.format(1)
+
+    def _is_archived(self, name, path, size):
+        """True se um membro idêntico (nome, tamanho e CRC) já está num pacote."""
+        crcs = [row[0] for row in self._conn.execute(
+            "SELECT crc FROM members WHERE name = ? AND size = ?", (name, size))]
+        return bool(crcs) and _file_crc(path) in crcs
+
+    def _append(self, pack, items):
+        """Anexa itens ao pacote até ele encher. Retorna quantos itens foram gravados."""
+        pack_path = os.path.join(self.directory, pack)
+        exists = os.path.exists(pack_path)
+        self._write_journal(pack_path)
+        rows = []
+        now = time.time()
+        with open(pack_path, 'r+b' if exists else 'w+b') as f:
+            with zipfile.ZipFile(f, 'a' if exists else 'w', zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as zf:
+                with warnings.catch_warnings():
+                    # Mesmo nome com outro conteúdo (legenda baixada de novo): o índice distingue pelo deslocamento
+                    warnings.filterwarnings("ignore", "Duplicate name")
+                    for path, name, video_id in items:
+                        zf.write(path, name)
+                        info = zf.infolist()[-1]
+                        rows.append((pack, info.header_offset, name, video_id, info.file_size,
+                                     info.compress_size, info.CRC, now))
+                        if f.tell() >= self.max_pack_bytes:
+                            break
+            f.flush()
+            os.fsync(f.fileno())
+            size = os.fstat(f.fileno()).st_size
+        if not exists:
+            _fsync_dir(self.directory)
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO packs VALUES (?, ?)", (pack, size))
+        os.remove(pack_path + JOURNAL_SUFFIX)
+        return len(rows)
+
+    def add_files(self, entries):
+        """
+        Arquiva [(caminho, id do vídeo ou None)] num único lote. Retorna [(caminho, pacote)]
+        dos que estão seguros num pacote (gravados agora, ou idênticos a um membro já
+        arquivado, com pacote None); só esses podem ser apagados por quem chamou.
+        """
+        archived = []
+        pending = []
+        for path, video_id in entries:
+            name = os.path.basename(path)
+            if self._is_archived(name, path, os.path.getsize(path)):
+                archived.append((path, None))
+            else:
+                pending.append((path, name, video_id or guess_video_id(name)))
+
+        while pending:
+            pack = self._current_pack()
+            try:
+                written = self._append(pack, pending)
+            except BaseException:
+                # Ex: disco cheio: o pacote volta ao estado anterior já agora (os originais continuam na pasta)
+                self._recover()
+                raise
+            archived.extend((path, pack) for path, _, _ in pending[:written])
+            pending = pending[written:]
+        return archived
+
+    # --- Consulta e extração ---
+
+    def find(self, key):
+        """Membros com esse ID de vídeo ou nome de arquivo, do mais antigo ao mais recente."""
+        rows = self._conn.execute(
+            "SELECT pack, offset, name, video_id, size, compressed, crc, archived FROM members "
+            "WHERE video_id = ? OR name = ? ORDER BY archived, pack, offset", (key, key)
+        ).fetchall()
+        keys = ("pack", "offset", "name", "video_id", "size", "compressed", "crc", "archived")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def stats(self):
+        """(pacotes, membros, bytes originais, bytes nos pacotes)."""
+        members, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM members").fetchone()
+        packs, packed = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM packs").fetchone()
+        return packs, members, size, packed
+
+    def extract(self, key, destination, overwrite=False):
+        """
+        Extrai para `destination` os arquivos do vídeo (ID ou nome de arquivo). Se um nome foi
+        arquivado mais de uma vez, vale a versão mais recente. Retorna os caminhos gravados.
+        """
+        latest = {}
+        for member in self.find(key):
+            latest[member["name"]] = member
+        os.makedirs(destination, exist_ok=True)
+        extracted = []
+        for name, member in sorted(latest.items()):
+            target = os.path.join(destination, name)
+            if os.path.exists(target) and not overwrite:
+                print(f"Já existe, não sobrescrito: {target}", file=sys.stderr)
+                continue
+            tmp_path = target + ".tmp"
+            try:
+                with open(tmp_path, 'wb') as out:
+                    _copy_member(os.path.join(self.directory, member["pack"]), member, out)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            os.replace(tmp_path, target)
+            extracted.append(target)
+        return extracted
+
+    def rebuild_index(self):
+        """
+        Refaz o índice lendo o diretório central de cada pacote. Os IDs vêm do nome dos
+        arquivos e a data de arquivamento passa a ser a data do arquivo guardada no zip.
+        """
+        with self._conn:
+            self._conn.execute("DELETE FROM members")
+            self._conn.execute("DELETE FROM packs")
+            for pack in self.pack_names():
+                pack_path = os.path.join(self.directory, pack)
+                try:
+                    with zipfile.ZipFile(pack_path) as zf:
+                        infos = zf.infolist()
+                except zipfile.BadZipFile:
+                    print(f"Pacote ilegível ignorado: {pack_path}", file=sys.stderr)
+                    continue
+                self._conn.executemany("INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+                    (pack, info.header_offset, info.filename, guess_video_id(info.filename), info.file_size,
+                     info.compress_size, info.CRC, time.mktime(info.date_time + (0, 0, -1)))
+                    for info in infos
+                ))
+                self._conn.execute("INSERT INTO packs VALUES (?, ?)", (pack, os.path.getsize(pack_path)))
+
+
+def loose_files(directory):
+    """Arquivos soltos de um archive/ (o formato antigo, um arquivo por legenda)."""
+    skip = (INDEX_FILENAME, INDEX_FILENAME + "-journal", INDEX_FILENAME + "-wal", INDEX_FILENAME + "-shm")
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.is_file() and entry.name not in skip
+            and not PACK_PATTERN.match(entry.name) and not entry.name.endswith(JOURNAL_SUFFIX)
+            and not entry.name.endswith(".tmp")
+        )
+
+
+def _format_mb(size):
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pacotes compactados do archive/ do lexis: listar, extrair, empacotar.")
+    parser.add_argument("--dir", default=ARCHIVE_DIR_NAME, help="Pasta archive/ (default: ./archive).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="Resumo dos pacotes, ou os membros de um vídeo.")
+    list_parser.add_argument("key", nargs="?", help="ID do vídeo ou nome do arquivo.")
+    extract_parser = commands.add_parser("extract", help="Extrai os arquivos de um ou mais vídeos.")
+    extract_parser.add_argument("keys", nargs="+", metavar="ID", help="ID do vídeo ou nome do arquivo.")
+    extract_parser.add_argument("--to", default=".", help="Pasta de destino (default: pasta atual).")
+    extract_parser.add_argument("--force", action="store_true", help="Sobrescreve arquivos existentes.")
+    commands.add_parser("pack", help="Move para pacotes os arquivos soltos da pasta (archive/ antigo).")
+    commands.add_parser("reindex", help="Refaz o índice a partir dos pacotes.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.isdir(args.dir):
+        print(f"Pasta de arquivo não encontrada: {args.dir}", file=sys.stderr)
+        sys.exit(1)
+
+    packs = ArchivePacks(args.dir)
+    try:
+        if args.command == "reindex":
+            packs.rebuild_index()
+        elif args.command == "pack":
+            paths = loose_files(args.dir)
+            archived = packs.add_files([(path, None) for path in paths])
+            for path, _ in archived:
+                os.remove(path)
+            print(f"{len(archived)} arquivo(s) soltos movidos para pacotes.")
+        elif args.command == "extract":
+            missing = False
+            for key in args.keys:
+                if not packs.find(key):
+                    print(f"Não encontrado no arquivo: {key}", file=sys.stderr)
+                    missing = True
+                    continue
+                for path in packs.extract(key, args.to, args.force):
+                    print(path)
+            if missing:
+                sys.exit(1)
+        elif args.key:
+            members = packs.find(args.key)
+            for member in members:
+                print(f"{member['pack']}  {member['name']}  {member['size']} bytes  "
+                      f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(member['archived']))}")
+            if not members:
+                print(f"Não encontrado no arquivo: {args.key}", file=sys.stderr)
+                sys.exit(1)
+
+        if args.command in ("list", "pack", "reindex") and not getattr(args, "key", None):
+            count, members, size, packed = packs.stats()
+            ratio = f" ({packed / size:.0%} do original)" if size else ""
+            print(f"{count} pacote(s), {members} arquivo(s): {_format_mb(size)} -> {_format_mb(packed)}{ratio}")
+    finally:
+        packs.close()
+
+
+if __name__ == "__main__":
+    main()
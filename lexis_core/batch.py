@@ -0,0 +1,150 @@
+"""
+MÓDULO: lexis_core.batch
+DESCRIÇÃO:
+    Suporte ao modo --batch do lexis.py (Gemini Batch API).
+    Em vez de centenas de chamadas interativas, os pedidos de resumo pendentes
+    são gravados em um arquivo JSONL, enviados como um único job assíncrono e
+    coletados depois, quando o job termina. O estado dos jobs é persistido em
+    disco para que o processo possa ser interrompido e retomado.
+
+    Estrutura do estado (.lexis_batch/state.json no diretório de trabalho):
+    {
+      "jobs": [
+        {"name": "batches/123", "model": "...", "input_file": "files/abc",
+         "jsonl": ".lexis_batch/20250101-120000.jsonl", "created": 1700000000.0,
+         "state": "JOB_STATE_PENDING",
+         "entries": {"<cache_key>": ["video1.srt", "video1-copia.srt"]}}
+      ]
+    }
+    A chave de cada pedido é a mesma chave de conteúdo do cache de resumos
+    (lexis_core.cache.make_summary_key): transcrições idênticas viram um único pedido.
+
+    As funções recebem o `client` (genai.Client) já configurado; o SDK só é
+    importado dentro de submit_job (para os tipos de configuração do upload).
+"""
+import json
+import os
+import time
+
+STATE_DIR_NAME = ".lexis_batch"
+STATE_FILE_NAME = "state.json"
+
+TERMINAL_STATES = {
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED",
+}
+
+
+def _state_name(job):
+    """Normaliza o estado de um BatchJob do SDK (enum JobState) para string."""
+    state = getattr(job, 'state', None)
+    return getattr(state, 'name', None) or str(state or "")
+
+
+class BatchState:
+    """Estado persistente dos jobs de batch de um diretório."""
+
+    def __init__(self, base_dir):
+        self.dir = os.path.join(base_dir, STATE_DIR_NAME)
+        self.path = os.path.join(self.dir, STATE_FILE_NAME)
+        self.jobs = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.jobs = json.load(f).get("jobs", [])
+
+    def save(self):
+        os.makedirs(self.dir, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"jobs": self.jobs}, f, ensure_ascii=False, indent=2)
+        # Substituição atômica: um Ctrl+C no meio da escrita não corrompe o estado
+        os.replace(tmp_path, self.path)
+
+    def in_flight_files(self):
+        """Arquivos que já pertencem a um job ainda não coletado."""
+        return {name for job in self.jobs for names in job["entries"].values() for name in names}
+
+    def remove(self, job):
+        self.jobs = [j for j in self.jobs if j["name"] != job["name"]]
+
+
+def write_requests_jsonl(path, requests):
+    """Grava os pedidos no formato do Batch API: uma linha {"key", "request"} por pedido."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for key, prompt in requests:
+            line = {
+                "key": key,
+                "request": {"contents": [{"role": "user", "parts": [{"text": prompt}]}]},
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def submit_job(client, model, jsonl_path, display_name):
+    """Envia o JSONL (files.upload) e cria o job (batches.create). Retorna o dict do job para o estado."""
+    from google.genai import types
+
+    uploaded = client.files.upload(
+        file=jsonl_path,
+        config=types.UploadFileConfig(display_name=display_name, mime_type='jsonl')
+    )
+    job = client.batches.create(model=model, src=uploaded.name, config={'display_name': display_name})
+    return {
+        "name": job.name,
+        "model": model,
+        "input_file": uploaded.name,
+        "jsonl": jsonl_path,
+        "created": time.time(),
+        "state": _state_name(job),
+    }
+
+
+def refresh_job(client, job):
+    """Atualiza o estado do job. Retorna o BatchJob do SDK."""
+    remote = client.batches.get(name=job["name"])
+    job["state"] = _state_name(remote)
+    return remote
+
+
+def _response_text(response):
+    parts = []
+    for candidate in (response or {}).get("candidates") or []:
+        for part in (candidate.get("content") or {}).get("parts") or []:
+            if part.get("text") and not part.get("thought"):
+                parts.append(part["text"])
+        if parts:
+            break
+    return "".join(parts)
+
+
+def parse_results(data):
+    """Converte o JSONL de respostas em {key: (texto, erro)}."""
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    results = {}
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        key = record.get("key")
+        if "error" in record or ("status" in record and "response" not in record):
+            results[key] = ("", record.get("error") or record.get("status"))
+        else:
+            results[key] = (_response_text(record.get("response")), None)
+    return results
+
+
+def download_results(client, remote_job):
+    """Baixa e interpreta os resultados de um job concluído (arquivo ou respostas inline)."""
+    dest = getattr(remote_job, 'dest', None)
+    if dest is None:
+        return {}
+    if getattr(dest, 'file_name', None):
+        return parse_results(client.files.download(file=dest.file_name))
+
+    results = {}
+    for i, inlined in enumerate(getattr(dest, 'inlined_responses', None) or []):
+        key = (getattr(inlined, 'metadata', None) or {}).get("key", str(i))
+        if getattr(inlined, 'error', None):
+            results[key] = ("", inlined.error)
+        else:
+            results[key] = (getattr(inlined.response, 'text', "") or "", None)
+    return results
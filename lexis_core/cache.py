@@ -0,0 +1,181 @@
+"""
+MÓDULO: lexis_core.cache
+DESCRIÇÃO:
+    Cache persistente (SQLite) de resumos gerados pelo Gemini, endereçado por conteúdo.
+    A chave é o hash SHA-256 de (modelo + template do prompt + transcrição limpa),
+    portanto o mesmo vídeo renomeado, movido de pasta ou com o .txt apagado
+    reaproveita o resumo já pago em vez de chamar a API novamente.
+
+    Políticas de despejo (eviction):
+    - Idade: entradas criadas há mais de `max_age_days` são descartadas.
+    - Tamanho: acima de `max_entries` entradas ou `max_bytes` de resumos,
+      as entradas menos acessadas recentemente (LRU) são removidas.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_ENTRIES = 50000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 365
+
+
+def make_summary_key(text, model_id, prompt_template):
+    """
+    Gera a chave de conteúdo do cache.
+    Cada parte é prefixada pelo seu tamanho para que concatenações diferentes
+    (ex: modelo "a" + texto "bc" vs modelo "ab" + texto "c") nunca colidam.
+    """
+    digest = hashlib.sha256()
+    for part in (model_id, prompt_template, text):
+        data = part.encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def make_summary_key_stream(byte_chunks, size, model_id, prompt_template):
+    """
+    A mesma chave de make_summary_key para uma transcrição lida em pedaços
+    (`byte_chunks` em UTF-8, `size` = total de bytes; ex: SpooledText.byte_chunks()).
+    """
+    digest = hashlib.sha256()
+    for part in (model_id, prompt_template):
+        data = part.encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    digest.update(size.to_bytes(8, 'big'))
+    for chunk in byte_chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    Cache de resumos thread-safe (uma conexão compartilhada protegida por lock),
+    pensado para ser usado pelas threads do ThreadPoolExecutor do lexis.py.
+    Contadores de acertos/falhas são mantidos por execução e acumulados no banco.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " summary TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries(accessed)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+        self._evict()
+
+    def get(self, key):
+        """Retorna o resumo armazenado para `key` ou None (contabilizando acerto/falha)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, created FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.max_age_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                self.evictions += 1
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            with self._conn:
+                self._conn.execute("UPDATE summaries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, model_id, summary):
+        """Armazena um resumo. Resumos vazios (falhas da API) nunca são cacheados."""
+        if not summary:
+            return
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO summaries (key, model, summary, size, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model_id, summary, len(summary.encode('utf-8')), now, now)
+                )
+            self.writes += 1
+        self._evict()
+
+    def _evict(self):
+        """Aplica os limites de idade e tamanho, removendo primeiro as entradas LRU."""
+        cutoff = time.time() - self.max_age_seconds
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM summaries WHERE created < ?", (cutoff,)).rowcount
+
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+            ).fetchone()
+            if count <= self.max_entries and total <= self.max_bytes:
+                self.evictions += removed
+                return
+
+            # Percorre do menos para o mais recentemente acessado até caber nos limites
+            victims = []
+            for key, size in self._conn.execute("SELECT key, size FROM summaries ORDER BY accessed ASC"):
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                victims.append((key,))
+                count -= 1
+                total -= size
+            self._conn.executemany("DELETE FROM summaries WHERE key = ?", victims)
+            self.evictions += removed + len(victims)
+
+    def stats(self):
+        """Estatísticas da execução atual e totais acumulados no banco."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+            ).fetchone()
+            lifetime = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total,
+            "lifetime_hits": lifetime.get("hits", 0) + self.hits,
+            "lifetime_misses": lifetime.get("misses", 0) + self.misses,
+        }
+
+    def close(self):
+        """Acumula os contadores da execução no banco e fecha a conexão."""
+        with self._lock:
+            with self._conn:
+                for name, value in (("hits", self.hits), ("misses", self.misses)):
+                    self._conn.execute(
+                        "INSERT INTO counters (name, value) VALUES (?, ?)"
+                        " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                        (name, value)
+                    )
+            self._conn.close()
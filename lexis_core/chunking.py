@@ -0,0 +1,94 @@
+"""
+MÓDULO: lexis_core.chunking
+DESCRIÇÃO:
+    Planejamento do resumo hierárquico (map-reduce) de transcrições longas.
+    Em vez de truncar o texto, ele é dividido em trechos nos limites de sentença
+    (ou de palavra, quando uma "sentença" sem pontuação passa do tamanho do trecho),
+    cada trecho é resumido em paralelo (map) e os resumos parciais são combinados
+    em uma única chamada final (reduce).
+
+    O tamanho dos trechos e o fan-out crescem com o tamanho da transcrição:
+    - textos médios viram poucos trechos de MIN_CHUNK_CHARS;
+    - textos longos mantêm o fan-out em MAX_FANOUT, aumentando o tamanho do trecho;
+    - só acima de MAX_CHUNK_CHARS * MAX_FANOUT o fan-out passa do teto.
+    Como os trechos são resumidos simultaneamente, a latência total fica próxima
+    à de um único trecho + a chamada de reduce.
+"""
+import math
+
+MIN_CHUNK_CHARS = 8000
+MAX_CHUNK_CHARS = 120000
+MAX_FANOUT = 16
+
+
+def plan_chunks(total_chars, min_chunk=MIN_CHUNK_CHARS, max_chunk=MAX_CHUNK_CHARS, max_fanout=MAX_FANOUT):
+    """Retorna (tamanho_alvo_do_trecho, quantidade_de_trechos) para um texto de `total_chars`."""
+    if total_chars <= min_chunk:
+        return total_chars, 1
+    fanout = max(2, min(max_fanout, math.ceil(total_chars / min_chunk)))
+    chunk_chars = math.ceil(total_chars / fanout)
+    if chunk_chars > max_chunk:
+        chunk_chars = max_chunk
+        fanout = math.ceil(total_chars / max_chunk)
+    return chunk_chars, fanout
+
+
+def _split_at_words(sentence, max_chars):
+    """
+    Quebra uma sentença maior que `max_chars` em pedaços de até `max_chars`, no último
+    espaço antes do limite. Legendas automáticas quase não têm pontuação, então uma
+    transcrição inteira pode chegar aqui como uma única "sentença".
+    """
+    start = 0
+    while len(sentence) - start > max_chars:
+        cut = sentence.rfind(' ', start + 1, start + max_chars + 1)
+        if cut == -1:
+            # Palavra maior que o trecho: corte seco
+            cut = start + max_chars
+        yield sentence[start:cut]
+        start = cut + 1 if sentence[cut:cut + 1] == ' ' else cut
+    if start < len(sentence):
+        yield sentence[start:]
+
+
+def _iter_pieces(sentences, max_chars):
+    for sentence in sentences:
+        if len(sentence) > max_chars:
+            yield from _split_at_words(sentence, max_chars)
+        else:
+            yield sentence
+
+
+def pack_sentences(sentences, target_chars):
+    """
+    Agrupa sentenças consecutivas em trechos de aproximadamente `target_chars`.
+    Uma sentença maior que o alvo é quebrada em limite de palavra (ver _split_at_words).
+    """
+    chunks = []
+    current = []
+    current_len = 0
+    for sentence in _iter_pieces(sentences, max(1, target_chars)):
+        if not sentence:
+            continue
+        added = len(sentence) + (1 if current else 0)
+        if current and current_len + added > target_chars:
+            chunks.append(" ".join(current))
+            current = []
+            current_len = 0
+            added = len(sentence)
+        current.append(sentence)
+        current_len += added
+    if current:
+        tail = " ".join(current)
+        # Evita um último trecho minúsculo (gasto de uma chamada para poucas frases)
+        if chunks and len(tail) < target_chars // 5:
+            chunks[-1] = chunks[-1] + " " + tail
+        else:
+            chunks.append(tail)
+    return chunks
+
+
+def split_for_map_reduce(sentences, total_chars, **limits):
+    """Divide as sentenças de uma transcrição nos trechos planejados por plan_chunks."""
+    chunk_chars, _ = plan_chunks(total_chars, **limits)
+    return pack_sentences(sentences, chunk_chars)
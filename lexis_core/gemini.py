@@ -0,0 +1,38 @@
+"""
+MÓDULO: lexis_core.gemini
+DESCRIÇÃO:
+    Criação do cliente do Gemini (SDK google-genai) a partir do .env.
+    O SDK leva centenas de milissegundos para importar, então ele só é importado
+    dentro de make_client, chamado sob demanda (ver lexis_core.lazy.Lazy) quando
+    um resumo, contagem de tokens ou job de batch realmente precisa da API.
+
+    Variáveis: GEMINI_API_KEY (obrigatória) e GEMINI_BASE_URL (opcional, ex: o
+    servidor local `python -m lexis_core.standin`), no .env ou no ambiente.
+"""
+from lexis_core.settings import ENV_PATH, read_env
+
+
+class MissingApiKey(RuntimeError):
+    """GEMINI_API_KEY ausente do .env e do ambiente."""
+
+    def __init__(self, env_path):
+        super().__init__(f"A variável GEMINI_API_KEY não foi encontrada no arquivo .env em: {env_path}")
+        self.env_path = env_path
+
+
+def has_api_key(env_path=ENV_PATH):
+    return read_env("GEMINI_API_KEY", env_path) is not None
+
+
+def make_client(env_path=ENV_PATH):
+    """genai.Client configurado (importa o SDK). Levanta MissingApiKey sem chave."""
+    api_key = read_env("GEMINI_API_KEY", env_path)
+    if not api_key:
+        raise MissingApiKey(env_path)
+
+    from google import genai
+    from google.genai import types
+
+    base_url = read_env("GEMINI_BASE_URL", env_path)
+    http_options = types.HttpOptions(base_url=base_url) if base_url else None
+    return genai.Client(api_key=api_key, http_options=http_options)
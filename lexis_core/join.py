@@ -0,0 +1,799 @@
+"""
+MÓDULO: lexis_core.join (comando `lexis-join`, ou `python lexis-join.py`)
+DESCRIÇÃO:
+    Consolida os .txt/.srt de cada canal (pasta) em volumes CONSOLIDADO_<canal>_VOL_NNN.txt
+    para o NotebookLM, 100% offline: não importa o SDK do Gemini nem lê o .env.
+
+USO:
+    lexis-join [--rebuild] [--max-mb 1.8 | --max-chars N | --max-tokens N] [--pack] [--jobs N] [--recursive]
+"""
+import os
+import re
+import time
+import argparse
+import tempfile
+import multiprocessing
+from collections import deque
+
+from lexis_core.lazy import Lazy
+from lexis_core.manifest import ChannelManifest
+from lexis_core.metadata import save_indexes, video_metadata
+from lexis_core.neardup import (DEFAULT_LANGUAGE_PREFERENCE, DEFAULT_THRESHOLD, decode_signature, encode_signature,
+                                find_duplicates, parse_language_preference, transcript_signature)
+from lexis_core.packing import fill_ratios, pack_volumes, sequential_volume_count
+from lexis_core.report import RunReport
+from lexis_core.search import INDEX_FILENAME, SearchIndex
+from lexis_core.scan import DEFAULT_SCAN_THREADS, prime_metadata, scan_folder, scan_tree
+from lexis_core.settings import HOME_DIR
+from lexis_core.spool import SpooledText
+from lexis_core.srt import clean_srt_content, dedup_ratio, iter_clean_chunks, measure_chunks
+from lexis_core.tokens import CALIBRATION_FILENAME, TokenEstimator
+from lexis_core.volumes import VolumeWriter, volume_filename, volume_header
+
+# Pasta de Arquivo morto das .srt originais baixadas do Youtube
+# O usuário fica responsável por apagar essa pasta quando quiser.
+ARCHIVE_DIR_NAME = "archive" 
+
+# Configurações de Limite
+# 1.8MB é considerado o ponto ideal de performance e janela de contexto estendida
+# ao integrar esses volumes de texto puro no NotebookLM.
+# O limite é medido em bytes reais do arquivo (UTF-8): texto acentuado em português
+# ocupa mais bytes que caracteres. Use --max-chars para orçar por caracteres.
+MAX_FILE_SIZE_MB = 1.8
+MAX_BYTES = int(MAX_FILE_SIZE_MB * 1024 * 1024)
+
+# Orçamento por tokens (--max-tokens): estimativa offline com a calibração gravada
+# pelo `lexis.py --calibrate-tokens` (mesmo MODEL_ID), ou coeficientes padrão.
+TOKEN_MODEL_ID = 'gemini-flash-latest'
+token_estimator = TokenEstimator.load(os.path.join(HOME_DIR, CALIBRATION_FILENAME), TOKEN_MODEL_ID)
+
+# Pasta de saída dos volumes (e dos manifestos incrementais de cada canal)
+OUTPUT_DIR_NAME = "volumes_notebooklm"
+
+# Início do texto de um vídeo lido para achar a linha "DATA:" do cabeçalho (--pack)
+HEADER_PREFIX_CHARS = 4096
+
+# Metadados usados quando não há .info.json (e no cálculo de assinaturas, que só precisa do texto)
+UNKNOWN_METADATA = {"date": "Desconhecida", "title": "Sem Título", "id": "Sem ID"}
+
+# Instrumentação opcional (--report): tempos por etapa e bytes por volume
+run_report = RunReport()
+
+# Índice de busca dos volumes (lexis-search): cada volume fechado é reindexado e, ao fim,
+# o índice é sincronizado com a pasta (volumes removidos). Desligado com --no-index.
+search_index = Lazy(lambda: SearchIndex(os.path.join(OUTPUT_DIR_NAME, INDEX_FILENAME)))
+index_volumes = True
+
+def get_metadata(srt_filename):
+    """
+    Função principal:
+    Lê atributos do arquivo `.info.json` para preencher os Metadados do RAG (Data, Título e ID).
+    
+    Lógica:
+    Como os downloads podem gerar artefatos terminados com sufixos diferentes ex: 'nomedovideo.pt.srt',
+    o índice de metadados da pasta (lexis_core.metadata) testa os prefixos extraindo hífenes e pontos
+    até casar com a formatação exata do arquivo `.info.json`. O índice faz um único scandir por pasta,
+    lê só as chaves necessárias do JSON e guarda o resultado num cache lateral invalidado por mtime.
+    """
+    try:
+        meta = video_metadata(srt_filename, UNKNOWN_METADATA["title"], UNKNOWN_METADATA["id"])
+    except Exception:
+        meta = None
+
+    return meta if meta is not None else dict(UNKNOWN_METADATA)
+
+def process_content(content, filename, full_path, dedup_stats=None, json_meta=None):
+    """
+    Função principal:
+    Ingere a string bruta de um vídeo (seja .srt de download ou um .txt gerado previamente),
+    parseia o bloco original e reestrutura esse payload acoplando os metadados mais legíveis 
+    para alimentar como Volume consolidado no NotebookLM.
+    
+    Retorno:
+    Tupla de 3 itens sendo o 1º a "Formatação Consolidada" e o 2º item o "Texto Crú" contíguo da transcrição.
+    A extração do Resumo (3º item) foi desativada desta listagem mas mantido o parse reverso 
+    para segurança de compatibilidade com modelos antigos de .txt.
+    dedup_stats (dict opcional) acumula as palavras mantidas/removidas pelo dedup de roll-up dos .srt.
+    json_meta (opcional) são os metadados do .info.json já resolvidos (ver get_metadata).
+    """
+    clean_text = ""
+    summary_text = ""
+    metadata = {}
+    full_metadata_str = ""
+    
+    # Marcadores
+    marker_metadata = "--- METADADOS DO DOCUMENTO ---"
+    marker_transcription = "--- TRANSCRICAO COMPLETA ---"
+    marker_summary = "--- RESUMO EXECUTIVO (VIA GEMINI) ---"
+    
+    # 0. Extração de Metadados
+    if marker_metadata in content:
+        try:
+            # Pega o bloco entre METADADOS e o próximo marcador (usualmente RESUMO ou TRANSCRICAO)
+            parts = content.split(marker_metadata)
+            meta_block = parts[1]
+            
+            # Descobre onde termina o bloco de metadados
+            end_markers = [marker_summary, marker_transcription]
+            min_idx = len(meta_block)
+            for m in end_markers:
+                idx = meta_block.find(m)
+                if idx != -1 and idx < min_idx:
+                    min_idx = idx
+            
+            meta_text = meta_block[:min_idx].strip()
+            # Store the full block for output
+            full_metadata_str = f"{marker_metadata}\n{meta_text}"
+            
+            # Parse linhas
+            for line in meta_text.split('\n'):
+                if ":" in line:
+                    key, val = line.split(":", 1)
+                    metadata[key.strip().upper()] = val.strip()
+        except Exception as e:
+            print(f"  ! Erro ao extrair metadados de {filename}: {e}")
+
+    # 1. Extração da Transcrição
+    if marker_transcription in content:
+        parts = content.split(marker_transcription)
+        clean_text = parts[1].strip()
+        
+        # 2. Extração do Resumo (se houver metadados antes da transcrição)
+        pre_transcription = parts[0]
+        if marker_summary in pre_transcription:
+            # Pega o que está entre o marcador de resumo e o final do bloco
+            summary_part = pre_transcription.split(marker_summary)[1].strip()
+            # Se houver metadados antes do resumo, o split anterior pegou tudo. 
+            # Mas como split(marker_summary) pega o que vem APÓS, isola do metadata.
+            summary_text = summary_part
+            
+            # Hack: Se o summary_text contiver o marcador de transcrição (não deveria, pois usamos pre_transcription), ok.
+            # Mas se contiver metadados (caso a ordem fosse diferente), precisaríamos limpar. 
+            # Assumindo ordem: Metadata -> Resumo -> Transcrição
+    else:
+        # Fallback para arquivos antigos ou sem formato definido
+        raw_text = content.strip()
+        
+        if filename.lower().endswith('.srt'):
+            clean_text = clean_srt_content(raw_text, dedup_stats)
+        else:
+            # Remove timestamps de SRT se ainda existirem (modo legados .txt)
+            clean_text = re.sub(r'\d+\n\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', '', raw_text)
+            
+        summary_text = "Resumo não encontrado no arquivo original."
+    
+    lines = [line.strip() for line in clean_text.split('\n') if line.strip()]
+    full_text = ' '.join(lines)
+    
+    # Formatação do Cabeçalho e Metadados
+    if json_meta is None:
+        json_meta = get_metadata(full_path)
+    header = video_header(filename, json_meta, metadata)
+    footer = video_footer(filename)
+    
+    return header + full_text + footer, full_text, summary_text
+
+def video_header(filename, json_meta, metadata=None):
+    """
+    Cabeçalho de um vídeo no volume consolidado. Os metadados lidos de um .txt do lexis.py
+    (`metadata`, chaves em maiúsculas) têm prioridade sobre os do .info.json (`json_meta`).
+    """
+    metadata = metadata or {}
+    data_str = metadata.get("DATA") or json_meta["date"]
+    titulo_str = metadata.get("TÍTULO") or json_meta["title"]
+    id_str = metadata.get("ID") or json_meta["id"]
+
+    if len(data_str) == 8 and data_str.isdigit():
+        data_str = f"{data_str[:4]}-{data_str[4:6]}-{data_str[6:]}"
+
+    return (
+        f"\n--- METADADOS DO DOCUMENTO ---\n"
+        f"DATA: {data_str}\n"
+        f"TÍTULO: {titulo_str}\n"
+        f"ID: {id_str}\n"
+        f"ARQUIVO: {filename}\n"
+        f"-------------------------------\n\n"
+        f"--- TRANSCRICAO COMPLETA ---\n"
+    )
+
+def video_footer(filename):
+    return f"\n\n{'='*30}\nFIM DO VÍDEO: {filename}\n{'='*30}\n"
+
+def remove_stale_volumes(channel, last_volume):
+    """Após uma reconstrução completa, apaga volumes antigos do canal com número acima de last_volume."""
+    if not os.path.isdir(OUTPUT_DIR_NAME):
+        return
+    pattern = re.compile(rf"^CONSOLIDADO_{re.escape(channel)}_VOL_(\d{{3,}})\.txt$")
+    for name in os.listdir(OUTPUT_DIR_NAME):
+        match = pattern.match(name)
+        if match and int(match.group(1)) > last_volume:
+            os.remove(os.path.join(OUTPUT_DIR_NAME, name))
+            print(f"  - Volume obsoleto removido: {name}")
+
+def resume_point(manifest, channel, log):
+    """
+    Confere o volume aberto do manifesto contra o disco antes de anexar.
+    - Arquivo maior que o registrado: restos de uma execução interrompida -> trunca.
+    - Arquivo ausente ou menor: manifesto não confiável -> retorna False (reconstruir).
+    As mensagens vão para a lista `log` do plano do canal.
+    """
+    volume, volume_bytes, _, _ = manifest.open_volume()
+    if volume_bytes == 0:
+        return True
+    path = os.path.join(OUTPUT_DIR_NAME, volume_filename(channel, volume))
+    actual = os.path.getsize(path) if os.path.exists(path) else -1
+    if actual < volume_bytes:
+        log.append(f"  ! {path} não corresponde ao manifesto. Reconstruindo o canal...")
+        return False
+    if actual > volume_bytes:
+        log.append(f"  ! Descartando {actual - volume_bytes} bytes de uma execução interrompida em {path}")
+        with open(path, 'r+b') as f:
+            f.truncate(volume_bytes)
+    return True
+
+def signature_task(task):
+    """
+    Assinatura MinHash de um vídeo (lexis_core.neardup) sobre o texto limpo, sem metadados.
+    Sem efeitos colaterais: pode rodar num processo do pool (--jobs).
+    Retorna (assinatura ou None, tamanho_do_texto, segundos).
+    """
+    f, full_path = task
+    start = time.perf_counter()
+    lengths = {}
+    try:
+        with open(full_path, 'r', encoding='utf-8') as file:
+            if f.lower().endswith('.srt'):
+                # Legenda lida e limpa em pedaços, direto para o MinHash
+                signature = transcript_signature(measure_chunks(iter_clean_chunks(file), lengths, f))
+            else:
+                _, full_text, _ = process_content(file.read(), f, full_path, json_meta=UNKNOWN_METADATA)
+                signature = transcript_signature(full_text)
+                lengths[f] = len(full_text)
+    except (OSError, UnicodeDecodeError):
+        # Sem assinatura o arquivo segue normalmente (o erro reaparece em load_video)
+        return None, 0, time.perf_counter() - start
+    return signature, lengths[f], time.perf_counter() - start
+
+def find_channel_duplicates(manifest, pending, neardup, mapper):
+    """
+    Separa de `pending` as quase-duplicatas (faixas -pt/-pt-orig/.en do mesmo vídeo, reuploads).
+    Arquivos já consolidados entram na comparação pela assinatura guardada no manifesto e são
+    sempre os canônicos do seu grupo (o volume deles não é reescrito).
+    Retorna (pendentes_restantes, [(arquivo, caminho, canônico)], {arquivo: assinatura}).
+    """
+    signatures = {}
+    lengths = {}
+    for (f, _), (signature, length, seconds) in zip(pending, mapper(signature_task, pending)):
+        run_report.add_time(f, "neardup", seconds)
+        signatures[f] = signature
+        lengths[f] = length
+
+    consolidated = {
+        f: decode_signature(entry["signature"]) for f, entry in manifest.files.items()
+        if entry.get("signature") and entry.get("volume") is not None and f not in signatures
+    }
+    duplicate_of = find_duplicates({**consolidated, **signatures}, neardup["preference"], neardup["threshold"],
+                                   lengths, fixed=consolidated)
+    duplicates = [(f, full_path, duplicate_of[f]) for f, full_path in pending if f in duplicate_of]
+    remaining = [(f, full_path) for f, full_path in pending if f not in duplicate_of]
+    return remaining, duplicates, signatures
+
+def plan_channel(channel_path, channel_name, rebuild=False, max_bytes=MAX_BYTES, max_chars=None,
+                 neardup=None, mapper=map, max_tokens=None, folder=None):
+    """
+    Função principal:
+    Fase de planejamento (barata, só scandir/stat) da consolidação de um canal.
+    Valida os arquivos do canal, carrega o manifesto incremental e separa o que
+    precisa ser processado. Retorna o plano (dict) ou None se o canal não tem arquivos.
+
+    Com `neardup` ({"preference": idiomas, "threshold": limiar}), os pendentes também são
+    comparados por MinHash e as quase-duplicatas saem do plano (plan["duplicates"]); o
+    cálculo das assinaturas usa `mapper` (map, ou pool.imap com --jobs).
+
+    `folder` é a pasta já varrida (lexis_core.scan); sem ela, a pasta é lida aqui.
+
+    As mensagens ficam em plan["log"] e só são impressas na montagem (write_channel),
+    para que a saída continue ordenada por canal mesmo com --jobs.
+    """
+    if folder is None:
+        folder = scan_folder(channel_path)
+
+    # Valida estrutura de nomenclaturas do Youtube do canal selecionado em seu escopo de arquivos no diretório:
+    # Match Regex exige o padrão de prefixo: "[NOME DO CANAL]-[ID DE 11 CARACTERES].extensão"
+    # Numa subpasta (ex: Canal/Playlist, com --recursive) o prefixo pode ser o nome de qualquer pasta do caminho.
+    prefixes = sorted({folder.name, *folder.relpath.split(os.sep)} - {""})
+    pattern = re.compile(rf"^(?:{'|'.join(map(re.escape, prefixes))})-[A-Za-z0-9_-]{{11}}(?:-[a-zA-Z0-9-]+)?\.(txt|srt)$")
+    
+    files = [f for f in folder.txt + folder.srt
+             if pattern.match(f) and not f.startswith("CONSOLIDADO_")]
+    if not files:
+        return None
+
+    # Sort files to ensure deterministic order (optional but good practice)
+    files.sort()
+
+    if max_tokens:
+        limit = {"unit": "tokens", "value": max_tokens}
+        max_bytes = max_chars = None
+    elif max_chars:
+        limit = {"unit": "chars", "value": max_chars}
+        max_bytes = None
+    else:
+        limit = {"unit": "bytes", "value": max_bytes}
+    manifest = ChannelManifest.load(OUTPUT_DIR_NAME, channel_name, limit)
+    log = []
+    if rebuild or not resume_point(manifest, channel_name, log):
+        manifest = ChannelManifest(manifest.path, limit)
+
+    new, changed, removed = manifest.classify([(f, os.path.join(channel_path, f)) for f in files])
+    pending = sorted(new + changed)
+    duplicates = []
+    signatures = {}
+    if neardup and pending:
+        pending, duplicates, signatures = find_channel_duplicates(manifest, pending, neardup, mapper)
+
+    if not pending and not duplicates:
+        log.append(f"--- Canal: {channel_name} sem novidades ({len(files)} arquivos já consolidados) ---")
+    else:
+        log.append(f"--- Processando Canal: {channel_name} ({len(new)} novos, {len(changed)} alterados) ---")
+    for f, _ in changed:
+        old_volume = manifest.files[f]["volume"]
+        if old_volume is not None:
+            log.append(f"  ! {f} foi alterado: a nova versão será anexada; a anterior permanece no Volume {old_volume} "
+                       f"(use --rebuild para reescrever o canal).")
+    for f in removed:
+        if manifest.files[f]["volume"] is not None:
+            log.append(f"  ! {f} não existe mais; permanece no Volume {manifest.files[f]['volume']} até um --rebuild.")
+    for f, _, canonical in duplicates:
+        log.append(f"  ≈ [DUPLICATA] {f} ≈ {canonical} (não será consolidado)")
+
+    return {
+        "channel": channel_name, "manifest": manifest, "pending": pending, "log": log,
+        "duplicates": duplicates, "signatures": signatures,
+        "max_bytes": max_bytes, "max_chars": max_chars, "max_tokens": max_tokens,
+    }
+
+def video_tasks(pending, count_tokens=False):
+    """
+    Tarefas (arquivo, caminho, metadados, contar_tokens) para load_video. Os metadados são
+    resolvidos aqui, no processo principal, para que o índice/cache de .info.json de cada
+    pasta seja um só mesmo com --jobs.
+    """
+    for f, full_path in pending:
+        with run_report.stage(f, "metadata"):
+            json_meta = get_metadata(full_path)
+        yield f, full_path, json_meta, count_tokens
+
+def load_video(task):
+    """
+    Lê e limpa um vídeo (regex, dedup de roll-up, cabeçalho). É o trabalho pesado de CPU,
+    sem efeitos colaterais: pode rodar num processo do pool (--jobs).
+
+    O texto consolidado vai para um SpooledText (lexis_core.spool): legendas .srt são lidas,
+    limpas e gravadas pedaço a pedaço, e uma live de várias horas passa para um arquivo
+    temporário em volumes_notebooklm/ em vez de ficar inteira na memória. Os .txt do
+    lexis.py (já limpos) ainda passam inteiros por process_content.
+
+    Retorna (texto_consolidado, stats_do_dedup, tempos_por_etapa, tokens); os tempos são medidos
+    aqui e registrados no --report pelo processo principal. `tokens` só é estimado com --max-tokens.
+    Quem recebe o texto deve fechá-lo (close) depois de gravá-lo.
+    """
+    f, full_path, json_meta, count_tokens = task
+    dedup_stats = {}
+    start = time.perf_counter()
+    processed = SpooledText(OUTPUT_DIR_NAME, count_tokens=token_estimator.estimate if count_tokens else None)
+    try:
+        with open(full_path, 'r', encoding='utf-8') as file:
+            if f.lower().endswith('.srt'):
+                processed.write(video_header(f, json_meta))
+                for chunk in iter_clean_chunks(file, dedup_stats):
+                    processed.write(chunk)
+                processed.write(video_footer(f))
+            else:
+                text, _, _ = process_content(file.read(), f, full_path, dedup_stats, json_meta)
+                processed.write(text)
+        processed.finish()
+    except BaseException:
+        processed.close()
+        raise
+    # Leitura e limpeza acontecem juntas (pedaço a pedaço): o tempo fica todo em "clean"
+    timings = {"clean": time.perf_counter() - start}
+    return processed, dedup_stats, timings, processed.tokens if count_tokens else None
+
+def write_channel(plan, results):
+    """
+    Função principal:
+    Agrupa vídeos soltos e consolida seus textos lado a lado iterativamente
+    como uma fita cassete. Cada vídeo é gravado direto no volume aberto (streaming);
+    quando o próximo vídeo faria o arquivo passar do limite (max_bytes em UTF-8, ex: 1.8MB,
+    ou max_chars), o volume é fechado e a esteira volumétrica reinicia com ID+1.
+
+    `results` é um iterador com o resultado de load_video para cada arquivo de
+    plan["pending"], na mesma ordem; apenas len(pending) itens são consumidos,
+    então o mesmo iterador pode ser compartilhado entre canais consecutivos.
+
+    Modo incremental:
+    O manifesto do canal (volumes_notebooklm/.manifest_<canal>.json) registra quais arquivos
+    já estão em quais volumes. Apenas arquivos novos/alterados são processados e anexados
+    ao último volume aberto; volumes fechados nunca são reescritos. rebuild=True refaz tudo.
+    """
+    for message in plan["log"]:
+        print(message)
+    pending = plan["pending"]
+    if not record_duplicates(plan):
+        return
+
+    channel_name = plan["channel"]
+    manifest = plan["manifest"]
+
+    # Continua do último volume aberto (ou do Volume 1 num canal novo/reconstruído)
+    fresh_build = manifest.is_empty
+    volume, volume_bytes, volume_chars, volume_tokens = manifest.open_volume()
+
+    dedup_stats = {}
+    writer = VolumeWriter(
+        OUTPUT_DIR_NAME, channel_name,
+        max_bytes=plan["max_bytes"], max_chars=plan["max_chars"], max_tokens=plan["max_tokens"],
+        start_volume=volume, start_bytes=volume_bytes, start_chars=volume_chars, start_tokens=volume_tokens,
+        count_tokens=token_estimator.estimate, on_close=volume_recorder(manifest, channel_name)
+    )
+    try:
+        for f, full_path in pending:
+            processed, tokens = take_result(f, results, dedup_stats)
+
+            # Um vídeo nunca é dividido: se não couber, o writer fecha o volume e abre o próximo
+            with processed, run_report.stage(f, "write"):
+                written_to = writer.add(processed, tokens)
+            manifest.record_file(f, full_path, written_to, signature=encoded_signature(plan, f))
+            print(f"  > Adicionado: {f} (Volume {written_to})")
+    finally:
+        # Salva o último volume (ou o único)
+        writer.close()
+
+    print_dedup_stats(dedup_stats)
+
+    if fresh_build:
+        remove_stale_volumes(channel_name, writer.volume)
+
+def record_duplicates(plan):
+    """
+    Registra as quase-duplicatas do plano no manifesto (volume None), para que não voltem
+    como "novas" na próxima execução. Retorna True se ainda há vídeos a gravar.
+    """
+    manifest = plan["manifest"]
+    for f, full_path, canonical in plan["duplicates"]:
+        manifest.record_file(f, full_path, None, duplicate_of=canonical)
+    if not plan["pending"]:
+        # Nenhum volume será fechado (e salvo) nesta execução: persiste só as duplicatas
+        if plan["duplicates"]:
+            manifest.save()
+        return False
+    return True
+
+def encoded_signature(plan, f):
+    signature = plan["signatures"].get(f)
+    return encode_signature(signature) if signature else None
+
+def volume_recorder(manifest, channel_name):
+    """
+    Callback on_close do VolumeWriter: registra o volume fechado no manifesto e no --report
+    e o reindexa no índice de busca.
+    """
+    def on_close(number, path, size, chars, tokens):
+        # Volume fechado: registra o tamanho exato e persiste o manifesto
+        manifest.record_volume(number, os.path.basename(path), size, chars, tokens)
+        manifest.save()
+        run_report.record_volume(channel_name, number, path, size, chars)
+        print(f"✓ Arquivo gerado: {path} ({size / (1024 * 1024):.2f} MB)")
+        if index_volumes:
+            start = time.perf_counter()
+            search_index.index_volume(path)
+            record_index_time(time.perf_counter() - start)
+    return on_close
+
+def record_index_time(seconds, **totals):
+    """Tempo gasto no índice de busca (--report)."""
+    info = run_report.info.setdefault("search_index", {"seconds": 0.0})
+    info["seconds"] = round(info["seconds"] + seconds, 4)
+    info.update(totals)
+
+def take_result(f, results, dedup_stats):
+    """
+    Consome o próximo resultado de load_video, acumulando o dedup e os tempos do --report.
+    Retorna (texto_consolidado (SpooledText), tokens ou None).
+    """
+    processed, stats, timings, tokens = next(results)
+    for key, value in stats.items():
+        dedup_stats[key] = dedup_stats.get(key, 0) + value
+    for stage, seconds in timings.items():
+        run_report.add_time(f, stage, seconds)
+    return processed, tokens
+
+def print_dedup_stats(dedup_stats):
+    if dedup_stats.get("words_removed"):
+        print(f"  Roll-up: {dedup_stats['words_removed']} palavras repetidas removidas, "
+              f"{dedup_stats['words_kept']} mantidas (razão {dedup_ratio(dedup_stats):.2f})")
+
+def video_date_key(processed):
+    """
+    Chave cronológica de um vídeo processado (texto ou SpooledText), lida da linha "DATA:"
+    do cabeçalho que video_header monta. Datas desconhecidas vão para o fim.
+    """
+    if not isinstance(processed, str):
+        processed = processed.prefix(HEADER_PREFIX_CHARS)
+    date_line = processed.split('\n', 3)[2]
+    date = date_line[len("DATA: "):].strip()
+    if re.match(r"^\d{4}-\d{2}-\d{2}$", date):
+        return (0, date)
+    return (1, "")
+
+def pack_channel(plan, results, window=None):
+    """
+    Função principal:
+    Modo --pack: reconstrói o canal empacotando os vídeos em volumes por first-fit
+    decreasing (lexis_core.packing), em vez de enchê-los em ordem de nome. Os vídeos
+    processados vão para um arquivo temporário (spool) para que o tamanho de todos seja
+    conhecido antes de montar qualquer volume, sem manter o canal inteiro em memória;
+    os que já chegam em arquivo próprio (SpooledText em disco) ficam nele até a gravação.
+
+    Com `window`, os vídeos seguem a ordem cronológica (upload_date) em janelas de
+    `window` vídeos. Dentro de cada volume, os vídeos ficam sempre em ordem cronológica.
+    """
+    for message in plan["log"]:
+        print(message)
+    pending = plan["pending"]
+    if not record_duplicates(plan):
+        return
+
+    channel_name = plan["channel"]
+    manifest = plan["manifest"]
+    max_bytes, max_chars, max_tokens = plan["max_bytes"], plan["max_chars"], plan["max_tokens"]
+
+    dedup_stats = {}
+    items = []
+    try:
+        with tempfile.TemporaryFile() as spool:
+            for f, full_path in pending:
+                processed, tokens = take_result(f, results, dedup_stats)
+                item = {
+                    "name": f, "path": full_path, "bytes": processed.bytes, "chars": processed.chars,
+                    "tokens": tokens, "date": video_date_key(processed), "text": None,
+                }
+                items.append(item)
+                if processed.on_disk:
+                    # Vídeo grande (live) já está no seu próprio arquivo temporário: não é copiado
+                    item["text"] = processed
+                else:
+                    item["offset"] = spool.tell()
+                    with processed:
+                        processed.copy_to(spool)
+
+            # Capacidade útil = limite - cabeçalho (medido com um número de volume de 3 dígitos)
+            header = volume_header(channel_name, 999)
+            if max_tokens:
+                capacity = max_tokens - token_estimator.estimate(header)
+                sizes = [item["tokens"] for item in items]
+            elif max_chars:
+                capacity = max_chars - len(header)
+                sizes = [item["chars"] for item in items]
+            else:
+                capacity = max_bytes - len(header.encode('utf-8'))
+                sizes = [item["bytes"] for item in items]
+            order = sorted(range(len(items)), key=lambda i: (items[i]["date"], items[i]["name"]))
+            bins = pack_volumes(sizes, capacity, order=order, window=window)
+
+            writer = VolumeWriter(
+                OUTPUT_DIR_NAME, channel_name, max_bytes=max_bytes, max_chars=max_chars, max_tokens=max_tokens,
+                count_tokens=token_estimator.estimate, on_close=volume_recorder(manifest, channel_name)
+            )
+            try:
+                for volume in bins:
+                    writer.new_volume()
+                    for i in volume:
+                        item = items[i]
+                        text = item["text"]
+                        if text is None:
+                            spool.seek(item["offset"])
+                            text = spool.read(item["bytes"]).decode('utf-8')
+                        with run_report.stage(item["name"], "write"):
+                            written_to = writer.add(text, item["tokens"])
+                        if item["text"] is not None:
+                            item["text"].close()
+                        manifest.record_file(item["name"], item["path"], written_to,
+                                             signature=encoded_signature(plan, item["name"]))
+                        print(f"  > Adicionado: {item['name']} (Volume {written_to})")
+            finally:
+                writer.close()
+    finally:
+        # Apaga os arquivos temporários dos vídeos grandes (também se a montagem falhar)
+        for item in items:
+            if item["text"] is not None:
+                item["text"].close()
+
+    print_dedup_stats(dedup_stats)
+    remove_stale_volumes(channel_name, writer.volume)
+
+    ratios = fill_ratios(sizes, bins, capacity)
+    sequential = sequential_volume_count([sizes[i] for i in sorted(range(len(items)), key=lambda i: items[i]["name"])],
+                                         capacity)
+    mode = f"FFD, janela de {window} vídeos" if window else "FFD"
+    print(f"  Empacotamento ({mode}): {len(bins)} volumes (sequencial: {sequential}), "
+          f"preenchimento médio {sum(ratios) / len(ratios):.0%}, mínimo {min(ratios):.0%}")
+    run_report.info.setdefault("packing", {})[channel_name] = {
+        "mode": mode, "volumes": len(bins), "sequential_volumes": sequential,
+        "fill_ratios": [round(ratio, 4) for ratio in ratios],
+    }
+
+def assemble_channel(plan, results, pack=False, pack_window=None):
+    """Monta os volumes do canal: empacotados (--pack) ou em sequência (padrão)."""
+    if pack:
+        pack_channel(plan, results, pack_window)
+    else:
+        write_channel(plan, results)
+
+def process_channel(channel_path, channel_name, rebuild=False, max_bytes=MAX_BYTES, max_chars=None,
+                    pack=False, pack_window=None, neardup=None, max_tokens=None, folder=None):
+    """Consolida um único canal no processo atual (planejamento + montagem)."""
+    plan = plan_channel(channel_path, channel_name, rebuild or pack, max_bytes, max_chars, neardup,
+                        max_tokens=max_tokens, folder=folder)
+    if plan:
+        tasks = video_tasks(plan["pending"], count_tokens=bool(max_tokens))
+        assemble_channel(plan, map(load_video, tasks), pack, pack_window)
+
+def ordered_map(pool, func, items, window):
+    """
+    Como pool.imap, mas com no máximo `window` tarefas em voo: os resultados saem na
+    ordem de `items` e a memória fica limitada mesmo que a escrita seja mais lenta.
+    """
+    in_flight = deque()
+    for item in items:
+        in_flight.append(pool.apply_async(func, (item,)))
+        if len(in_flight) >= window:
+            yield in_flight.popleft().get()
+    while in_flight:
+        yield in_flight.popleft().get()
+
+def list_channels(base_path, recursive=False, threads=DEFAULT_SCAN_THREADS):
+    """
+    [(caminho, nome_do_canal, pasta)] na ordem em que os canais são consolidados, a partir de
+    uma única varredura (lexis_core.scan): a pasta base (vídeos avulsos, canal com o nome da
+    pasta) e as subpastas, ou toda a árvore com `recursive`.
+    Subpastas mais fundas viram canais "Canal_Playlist" (caminho relativo unido por "_").
+    """
+    folders = scan_tree(base_path, max_depth=None if recursive else 1, threads=threads,
+                        skip={ARCHIVE_DIR_NAME, OUTPUT_DIR_NAME})
+    prime_metadata(folders)
+    channels = []
+    for folder in folders:
+        if all(f.startswith("CONSOLIDADO_") for f in folder.txt + folder.srt):
+            continue
+        # Use directory name as channel name
+        name = folder.relpath.replace(os.sep, "_") if folder.relpath else folder.name
+        channels.append((folder.path, name, folder))
+    return channels
+
+def consolidate_by_channel(base_path, rebuild=False, max_bytes=MAX_BYTES, max_chars=None, jobs=1,
+                           pack=False, pack_window=None, neardup=None, max_tokens=None,
+                           recursive=False, scan_threads=DEFAULT_SCAN_THREADS):
+    """
+    Função principal:
+    Entry-point do lexis-join que varre recursivamente a pasta base buscando
+    vídeos na raiz que compõe um canal base, para então chamar subdiretórios 
+    (assumindo diretório/pasta = nome de canal distinto) acionando a função iteradora process_channel(subpasta).
+
+    Com jobs > 1, todos os canais são planejados antes e a leitura/limpeza dos arquivos
+    (de todos os canais, em ordem) é distribuída num pool de processos. A montagem dos
+    volumes continua no processo principal, canal a canal e na ordem ordenada dos arquivos,
+    então os volumes e a saída são idênticos aos do modo serial.
+
+    pack=True reconstrói cada canal com o empacotamento FFD (ver pack_channel);
+    execuções incrementais seguintes voltam a anexar ao último volume normalmente.
+
+    neardup (ver plan_channel) pula quase-duplicatas; elas ficam no manifesto com volume None.
+    max_tokens fecha os volumes por tokens estimados (lexis_core.tokens) em vez de bytes/caracteres.
+    recursive consolida toda a árvore de pastas (ver list_channels), varrida com scan_threads threads.
+    """
+    channels = list_channels(base_path, recursive, scan_threads)
+    if jobs <= 1:
+        for channel_path, channel_name, folder in channels:
+            process_channel(channel_path, channel_name, rebuild, max_bytes, max_chars, pack, pack_window, neardup,
+                            max_tokens, folder)
+    else:
+        with multiprocessing.Pool(jobs) as pool:
+            plans = [plan for plan in (plan_channel(path, name, rebuild or pack, max_bytes, max_chars, neardup,
+                                                    mapper=pool.imap, max_tokens=max_tokens, folder=folder)
+                                       for path, name, folder in channels)
+                     if plan]
+            tasks = video_tasks([task for plan in plans for task in plan["pending"]], count_tokens=bool(max_tokens))
+            results = ordered_map(pool, load_video, tasks, window=jobs * 4)
+            for plan in plans:
+                assemble_channel(plan, results, pack, pack_window)
+
+    # Persiste o cache lateral de metadados (.lexis_meta_cache.json) de cada pasta
+    save_indexes()
+
+    if index_volumes and os.path.isdir(OUTPUT_DIR_NAME):
+        update_search_index()
+
+def update_search_index():
+    """
+    Sincroniza o índice do lexis-search com volumes_notebooklm/: remove volumes apagados
+    (ex: obsoletos após um --rebuild) e indexa os que ainda não estão nele (ex: volumes de
+    execuções com --no-index). Os volumes gravados nesta execução já foram indexados ao fechar.
+    """
+    start = time.perf_counter()
+    changed, removed = search_index.sync(OUTPUT_DIR_NAME)
+    volumes, videos = search_index.stats()
+    search_index.close()
+    search_index.reset()
+    record_index_time(time.perf_counter() - start, videos=videos)
+    if changed or removed:
+        print(f"  Índice de busca: {len(changed)} volume(s) indexado(s), {len(removed)} removido(s) "
+              f"({time.perf_counter() - start:.2f} s)")
+    print(f"Índice de busca: {videos} vídeos em {volumes} volumes (use lexis-search \"termos\")")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Consolida .txt/.srt por canal em volumes para o NotebookLM (100% offline)."
+    )
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Ignora os manifestos e reescreve todos os volumes de cada canal.")
+    parser.add_argument("--max-mb", type=float, default=MAX_FILE_SIZE_MB,
+                        help=f"Tamanho máximo de cada volume em MB (bytes UTF-8; default: {MAX_FILE_SIZE_MB}).")
+    parser.add_argument("--max-chars", type=int, default=None,
+                        help="Orçamento por caracteres em vez de bytes.")
+    parser.add_argument("--max-tokens", type=int, default=None,
+                        help="Orçamento por tokens estimados (calibre com `lexis.py --calibrate-tokens`); "
+                             "tem prioridade sobre --max-mb/--max-chars.")
+    parser.add_argument("--pack", action="store_true",
+                        help="Reconstrói os canais empacotando os vídeos (first-fit decreasing) em menos volumes, "
+                             "mais cheios.")
+    parser.add_argument("--pack-window", type=int, default=None, metavar="N",
+                        help="Com --pack, mantém a ordem cronológica (upload_date) em janelas de N vídeos "
+                             "(implica --pack).")
+    parser.add_argument("--report", metavar="ARQUIVO",
+                        help="Grava um relatório (tempos por etapa, bytes por volume) em JSON, "
+                             "ou CSV por arquivo se terminar em .csv, e mostra um resumo.")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Processos para ler/limpar os arquivos em paralelo (0 = todos os núcleos; default: 1).")
+    parser.add_argument("--recursive", action="store_true",
+                        help="Consolida toda a árvore de pastas (canais/playlists), não só as subpastas diretas.")
+    parser.add_argument("--scan-threads", type=int, default=DEFAULT_SCAN_THREADS,
+                        help=f"Threads para varrer as pastas em paralelo (útil em discos de rede; "
+                             f"default: {DEFAULT_SCAN_THREADS}).")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Não detecta transcrições quase idênticas (consolida todas as faixas/cópias).")
+    parser.add_argument("--lang-pref", default=",".join(DEFAULT_LANGUAGE_PREFERENCE),
+                        help="Ordem de preferência do idioma da faixa canônica entre duplicatas "
+                             f"(default: {','.join(DEFAULT_LANGUAGE_PREFERENCE)}).")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Não atualiza o índice de busca do lexis-search (volumes_notebooklm/"
+                             f"{INDEX_FILENAME}).")
+    parser.add_argument("--dup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similaridade (Jaccard estimado) para considerar duplicata (default: {DEFAULT_THRESHOLD}).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    global index_volumes
+    args = parse_args(argv)
+    index_volumes = not args.no_index
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    run_report.enabled = bool(args.report)
+    run_report.info.update({"script": "lexis-join.py", "jobs": jobs, "rebuild": args.rebuild})
+    if args.max_tokens:
+        run_report.info["token_calibration"] = token_estimator.calibration
+    neardup = None if args.keep_duplicates else {
+        "preference": parse_language_preference(args.lang_pref), "threshold": args.dup_threshold,
+    }
+    consolidate_by_channel('.', rebuild=args.rebuild,
+                           max_bytes=int(args.max_mb * 1024 * 1024), max_chars=args.max_chars, jobs=jobs,
+                           pack=args.pack or bool(args.pack_window), pack_window=args.pack_window,
+                           neardup=neardup, max_tokens=args.max_tokens,
+                           recursive=args.recursive, scan_threads=args.scan_threads)
+    if args.report:
+        run_report.write(args.report)
+        print(run_report.format_table())
+        print(f"Relatório gravado em {args.report}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+MÓDULO: lexis_core.lazy
+DESCRIÇÃO:
+    Proxy de inicialização tardia. Objetos caros de criar (cliente do Gemini, que
+    importa o SDK google-genai; conexão SQLite do cache) ficam como globais do
+    módulo, mas só são construídos no primeiro acesso a um atributo. Assim importar
+    o pacote ou rodar modos offline não paga esse custo.
+"""
+import threading
+
+
+class Lazy:
+    """
+    Uso:
+        client = Lazy(lambda: genai.Client(...))
+        client.models.generate_content(...)   # cria o objeto real aqui, uma única vez
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self):
+        return self._instance is not None
+
+    def resolve(self):
+        """Objeto real (criado na primeira chamada; seguro entre threads)."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def reset(self):
+        """Descarta o objeto real: o próximo acesso cria outro (ex: depois de fechar uma conexão)."""
+        with self._lock:
+            self._instance = None
+
+    def __getattr__(self, name):
+        # Só é chamado para atributos que o proxy não tem: delega ao objeto real
+        return getattr(self.resolve(), name)
@@ -0,0 +1,124 @@
+"""
+MÓDULO: lexis_core.manifest
+DESCRIÇÃO:
+    Manifesto por canal da consolidação incremental do lexis-join.py.
+    Registra, para cada arquivo de entrada (.txt/.srt), em qual volume
+    CONSOLIDADO_<canal>_VOL_NNN.txt ele foi gravado, junto com tamanho e mtime.
+    Na execução seguinte apenas arquivos novos ou alterados são processados e
+    anexados ao último volume aberto; volumes anteriores não são tocados, o que
+    preserva os volumes já enviados ao NotebookLM.
+
+    Formato (volumes_notebooklm/.manifest_<canal>.json):
+    {
+      "version": 1,
+      "limit": {"unit": "bytes", "value": 1887436},   (ou "chars", ou "tokens" com --max-tokens)
+      "volumes": {"1": {"file": "CONSOLIDADO_canal_VOL_001.txt", "size": 1800000, "chars": 1750000,
+                        "tokens": 420000}},
+      "files": {"canal-abc.txt": {"size": 1234, "mtime_ns": 1700000000000000000, "volume": 1,
+                                  "signature": "<MinHash em hex>"},
+                "canal-abc-en.srt": {"size": 1200, "mtime_ns": ..., "volume": null,
+                                     "duplicate_of": "canal-abc.txt"}}
+    }
+    `limit` guarda o limite usado na construção: se ele mudar, o canal é reconstruído.
+    `size` é o tamanho exato em bytes do volume no momento do registro; um volume
+    maior que isso no disco contém restos de uma execução interrompida.
+    Arquivos com "volume": null são quase-duplicatas de outro arquivo do canal
+    (lexis_core.neardup) e não foram gravados em nenhum volume.
+"""
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path(output_dir, channel):
+    return os.path.join(output_dir, f".manifest_{channel}.json")
+
+
+def file_signature(full_path):
+    """(tamanho, mtime_ns) de um arquivo de entrada: o que define 'alterado'."""
+    st = os.stat(full_path)
+    return st.st_size, st.st_mtime_ns
+
+
+class ChannelManifest:
+    def __init__(self, path, limit):
+        self.path = path
+        self.limit = limit
+        self.volumes = {}
+        self.files = {}
+
+    @classmethod
+    def load(cls, output_dir, channel, limit):
+        """Carrega o manifesto do canal. Manifesto ausente, corrompido ou de outro limite = vazio."""
+        manifest = cls(manifest_path(output_dir, channel), limit)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if data.get("version") != MANIFEST_VERSION or data.get("limit") != limit:
+            return manifest
+        manifest.volumes = {int(k): v for k, v in data.get("volumes", {}).items()}
+        manifest.files = data.get("files", {})
+        return manifest
+
+    @property
+    def is_empty(self):
+        return not self.volumes
+
+    def classify(self, entries):
+        """
+        Separa as entradas [(nome, caminho_completo)] em (novas, alteradas, removidas).
+        Arquivos inalterados (mesmo tamanho e mtime) não aparecem em nenhuma lista.
+        """
+        new, changed = [], []
+        seen = set()
+        for name, full_path in entries:
+            seen.add(name)
+            known = self.files.get(name)
+            if known is None:
+                new.append((name, full_path))
+            elif (known["size"], known["mtime_ns"]) != file_signature(full_path):
+                changed.append((name, full_path))
+        removed = [name for name in self.files if name not in seen]
+        return new, changed, removed
+
+    def open_volume(self):
+        """
+        (número, bytes, caracteres, tokens) do último volume, que recebe os próximos anexos;
+        (1, 0, 0, 0) se não houver.
+        """
+        if not self.volumes:
+            return 1, 0, 0, 0
+        number = max(self.volumes)
+        volume = self.volumes[number]
+        return number, volume["size"], volume.get("chars", 0), volume.get("tokens", 0)
+
+    def record_volume(self, number, filename, size, chars, tokens=0):
+        self.volumes[number] = {"file": filename, "size": size, "chars": chars, "tokens": tokens}
+
+    def record_file(self, name, full_path, volume, **extra):
+        """
+        Registra um arquivo de entrada. `extra` guarda campos opcionais (ex: "signature",
+        a assinatura MinHash, ou "duplicate_of" com volume=None para duplicatas puladas).
+        """
+        size, mtime_ns = file_signature(full_path)
+        entry = {"size": size, "mtime_ns": mtime_ns, "volume": volume}
+        entry.update((key, value) for key, value in extra.items() if value is not None)
+        self.files[name] = entry
+
+    def volume_files(self):
+        return [v["file"] for _, v in sorted(self.volumes.items())]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "limit": self.limit,
+                "volumes": {str(k): v for k, v in sorted(self.volumes.items())},
+                "files": self.files,
+            }, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,315 @@
+"""
+MÓDULO: lexis_core.metadata
+DESCRIÇÃO:
+    Índice de metadados (.info.json do yt-dlp) por diretório, compartilhado pelo
+    lexis.py e pelo lexis-join.py.
+
+    - Um único os.scandir por diretório mapeia o nome base de cada .info.json
+      ("Canal-ID") para o arquivo; a busca pelos candidatos de uma legenda
+      ('video.pt.srt' -> 'video', 'canal-id-lang.srt' -> 'canal-id') vira consulta
+      em dicionário, sem os.path.exists por candidato.
+    - Só as chaves de 1º nível `id`, `title` e `upload_date` são extraídas, membro a
+      membro, parando assim que as três aparecem. O arquivo é lido em pedaços de
+      tamanho fixo; os valores das outras chaves (formats, thumbnails, legendas...)
+      são pulados por uma varredura de colchetes e aspas, sem decodificá-los nem
+      guardá-los inteiros na memória.
+    - Os campos extraídos ficam num cache lateral pequeno (.lexis_meta_cache.json no
+      próprio diretório), invalidado por tamanho + mtime de cada .info.json.
+"""
+import json
+import os
+import re
+import threading
+
+INFO_SUFFIX = ".info.json"
+SIDECAR_NAME = ".lexis_meta_cache.json"
+SIDECAR_VERSION = 1
+INFO_FIELDS = ("id", "title", "upload_date")
+READ_CHUNK_CHARS = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+_decoder = json.JSONDecoder()
+# Varredura de valores pulados: uma string JSON completa e, dentro de arrays/objetos, tudo
+# até o próximo colchete/chave (strings inteiras incluídas, com o que tiverem dentro)
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_UNTIL_BRACKET = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL)
+
+
+def candidate_stems(srt_filename):
+    """
+    Nomes base candidatos ao .info.json de uma legenda, na ordem de preferência.
+    Como os downloads podem gerar sufixos diferentes (ex: 'nomedovideo.pt.srt'),
+    remove sufixos após pontos e depois após hífens.
+    """
+    base_name = os.path.splitext(os.path.basename(srt_filename))[0]
+    candidates = [base_name]
+
+    temp_name = base_name
+    while '.' in temp_name:
+        temp_name = temp_name.rsplit('.', 1)[0]
+        if temp_name:
+            candidates.append(temp_name)
+
+    temp_name = base_name
+    while '-' in temp_name:
+        temp_name = temp_name.rsplit('-', 1)[0]
+        if temp_name:
+            candidates.append(temp_name)
+
+    # Remove duplicatas preservando ordem
+    return list(dict.fromkeys(candidates))
+
+
+class _MemberReader:
+    """Lê um objeto JSON em pedaços e decodifica um membro de 1º nível por vez."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        data = self.handle.read(READ_CHUNK_CHARS)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def skip(self, chars=_WHITESPACE):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in chars:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.skip() != char:
+            raise ValueError(f"JSON inesperado: esperava {char!r}")
+        self.pos += 1
+
+    def value(self):
+        self.skip()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Um número no fim do buffer pode continuar no próximo pedaço (ex: '0.' + '0015')
+            if not self.eof and not self.buffer[end:].strip(_NUMBER_CHARS) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        """
+        Pula o próximo valor sem decodificá-lo. Arrays e objetos são varridos pedaço a
+        pedaço contando colchetes/chaves fora das strings; o buffer guarda só o trecho
+        ainda não varrido (no máximo uma string cortada no fim do pedaço) mais um pedaço.
+        """
+        first = self.skip()
+        if first == '"':
+            while True:
+                match = _STRING.match(self.buffer, self.pos)
+                if match:
+                    self.pos = match.end()
+                    return
+                if not self._fill():
+                    raise ValueError("JSON inesperado: string incompleta")
+        if first not in ('[', '{'):
+            # Número, true/false/null: curtos, o decodificador resolve
+            self.value()
+            return
+        depth = 0
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while True:
+                pos = _UNTIL_BRACKET.match(buffer, pos).end()
+                # Parou no fim do buffer ou numa string cortada: falta o próximo pedaço
+                if pos == len(buffer) or buffer[pos] == '"':
+                    break
+                depth += 1 if buffer[pos] in '[{' else -1
+                pos += 1
+                if depth == 0:
+                    self.pos = pos
+                    return
+            self.pos = pos
+            if not self._fill():
+                raise ValueError("JSON inesperado: valor incompleto")
+
+
+def read_info_fields(path, fields=INFO_FIELDS):
+    """
+    Extrai apenas as chaves de 1º nível pedidas de um .info.json, sem carregar o
+    documento inteiro. Retorna {chave: valor} (chaves ausentes não aparecem).
+    """
+    wanted = set(fields)
+    found = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _MemberReader(f)
+        reader.skip(_WHITESPACE + '\ufeff')
+        reader.expect('{')
+        if reader.skip() == '}':
+            return found
+        while wanted:
+            key = reader.value()
+            reader.expect(':')
+            if key in wanted:
+                found[key] = reader.value()
+                wanted.discard(key)
+            else:
+                reader.skip_value()
+            separator = reader.skip()
+            if separator != ',':
+                break
+            reader.pos += 1
+    return found
+
+
+class MetadataIndex:
+    """
+    Índice dos .info.json de um diretório.
+        index = MetadataIndex(pasta)
+        fields = index.lookup("Canal-abc123def45.pt.srt")   # {"id", "title", "upload_date"} ou None
+        index.save()                                       # persiste o cache lateral, se mudou
+    Seguro para uso por várias threads.
+    """
+
+    def __init__(self, directory, entries=None):
+        self.directory = directory
+        self.sidecar_path = os.path.join(directory, SIDECAR_NAME)
+        self.lock = threading.Lock()
+        self.infos = {}     # nome base -> (nome do arquivo, tamanho, mtime_ns)
+        self.cached = {}    # nome do arquivo -> {"size", "mtime_ns", "fields"}
+        self.dirty = False
+        if entries is None:
+            self._scan()
+        else:
+            # [(nome, tamanho, mtime_ns)] dos .info.json, vindos de uma varredura já feita (lexis_core.scan)
+            self.infos = {name[:-len(INFO_SUFFIX)]: (name, size, mtime_ns) for name, size, mtime_ns in entries}
+        self._load_sidecar()
+
+    def _scan(self):
+        infos = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(INFO_SUFFIX) and entry.is_file():
+                        st = entry.stat()
+                        stem = entry.name[:-len(INFO_SUFFIX)]
+                        infos[stem] = (entry.name, st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        self.infos = infos
+
+    def refresh(self):
+        """Refaz o scandir (processos longos, ex: lexis.py --watch, veem .info.json novos/alterados)."""
+        self._scan()
+
+    def has_info(self, srt_filename):
+        """True se a legenda tem um .info.json no índice (sem ler o JSON)."""
+        infos = self.infos
+        return any(stem in infos for stem in candidate_stems(srt_filename))
+
+    def _load_sidecar(self):
+        try:
+            with open(self.sidecar_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != SIDECAR_VERSION:
+            return
+        self.cached = data.get("entries", {})
+        # Entradas de .info.json que não existem mais são descartadas no próximo save()
+        live = {name for name, _, _ in self.infos.values()}
+        if any(name not in live for name in self.cached):
+            self.cached = {name: entry for name, entry in self.cached.items() if name in live}
+            self.dirty = True
+
+    def lookup(self, srt_filename):
+        """
+        Campos {id, title, upload_date} do .info.json da legenda (só os presentes), ou None
+        se não houver .info.json. Erros de leitura/parse propagam para o chamador.
+        """
+        for stem in candidate_stems(srt_filename):
+            info = self.infos.get(stem)
+            if info:
+                return self._fields(*info)
+        return None
+
+    def _fields(self, name, size, mtime_ns):
+        with self.lock:
+            entry = self.cached.get(name)
+            if entry and entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+                return entry["fields"]
+        fields = read_info_fields(os.path.join(self.directory, name))
+        with self.lock:
+            self.cached[name] = {"size": size, "mtime_ns": mtime_ns, "fields": fields}
+            self.dirty = True
+        return fields
+
+    def save(self):
+        """Grava o cache lateral (atômico). Pastas sem permissão de escrita são ignoradas."""
+        with self.lock:
+            if not self.dirty:
+                return
+            tmp_path = self.sidecar_path + ".tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"version": SIDECAR_VERSION, "entries": self.cached}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.sidecar_path)
+            except OSError:
+                return
+            self.dirty = False
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(directory, entries=None):
+    """
+    Índice (único por processo) do diretório; criado na primeira consulta.
+    `entries` ([(nome, tamanho, mtime_ns)] dos .info.json) evita o scandir na criação.
+    """
+    key = os.path.abspath(directory or ".")
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = MetadataIndex(key, entries)
+        return index
+
+
+def lookup_metadata(srt_path):
+    """Atalho: get_index(pasta da legenda).lookup(legenda)."""
+    return get_index(os.path.dirname(srt_path)).lookup(srt_path)
+
+
+def video_metadata(srt_path, title="Sem Título", video_id="Sem ID"):
+    """
+    Metadados {date, title, id} de uma legenda para o cabeçalho dos .txt/volumes, ou None se
+    não houver .info.json. `title`/`video_id` preenchem chaves ausentes do JSON.
+    Erros de leitura/parse propagam para o chamador.
+    """
+    fields = lookup_metadata(srt_path)
+    if fields is None:
+        return None
+    return {
+        "date": fields.get('upload_date', 'Desconhecida'),
+        "title": fields.get('title', title),
+        "id": fields.get('id', video_id),
+    }
+
+
+def save_indexes():
+    """Persiste o cache lateral de todos os índices usados neste processo."""
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for index in indexes:
+        index.save()
@@ -0,0 +1,164 @@
+"""
+MÓDULO: lexis_core.neardup
+DESCRIÇÃO:
+    Detecção de transcrições quase idênticas (MinHash + LSH) antes de resumir
+    (lexis.py) e de consolidar (lexis-join.py).
+
+    O yt-dlp costuma deixar várias faixas do mesmo vídeo (`-pt.srt`, `-pt-orig.srt`,
+    `.en.srt`) e canais republicam o mesmo conteúdo; sem esta etapa cada cópia
+    gasta uma chamada de API e ocupa bytes nos volumes.
+
+    - Assinatura: shingles de 5 palavras do texto limpo (minúsculo, só palavras),
+      com MinHash de permutação única (one-permutation hashing): cada shingle é
+      hasheado uma vez (crc32) e cai num de 64 compartimentos, que guardam o menor
+      valor; compartimentos vazios são preenchidos por rotação (densificação).
+      A fração de compartimentos iguais entre duas assinaturas estima a similaridade
+      de Jaccard dos conjuntos de shingles. A assinatura é determinística (pode ir
+      para o manifesto ou ser calculada em outro processo).
+    - LSH: 16 faixas de 4 valores; só pares que coincidem em alguma faixa são
+      comparados, então o custo não cresce com o quadrado do número de arquivos.
+    - Clusters: pares com similaridade >= limiar são unidos (union-find) e um arquivo
+      canônico por cluster é escolhido pela preferência de idioma da faixa.
+"""
+import re
+import zlib
+
+NUM_BINS = 64
+BANDS = 16
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_LANGUAGE_PREFERENCE = ("pt", "pt-BR", "pt-orig", "en", "en-orig")
+
+REGEX_WORD = re.compile(r'\w+')
+# Sufixo de idioma da faixa: "Canal-<ID de 11>.pt.srt", "Canal-<ID>-pt-orig.srt", "video.en-US.srt"
+REGEX_TRACK_LANGUAGE = re.compile(r'-[A-Za-z0-9_-]{11}[.-]([A-Za-z]{2,3}(?:-[A-Za-z]+)*)$')
+REGEX_DOT_LANGUAGE = re.compile(r'\.([A-Za-z]{2,3}(?:-[A-Za-z]+)*)$')
+
+_EMPTY = 1 << 32
+_ROTATION_OFFSET = 1 << 26
+
+
+def transcript_signature(text, num_bins=NUM_BINS, shingle_words=SHINGLE_WORDS):
+    """
+    Assinatura MinHash (tupla de num_bins inteiros) do texto, ou None se ele for curto demais.
+    `text` pode ser uma string ou um iterável de pedaços quebrados entre palavras (ex:
+    iter_clean_chunks): os shingles que atravessam dois pedaços são contados uma vez só.
+    """
+    chunks = (text,) if isinstance(text, str) else text
+    bins = [_EMPTY] * num_bins
+    crc32 = zlib.crc32
+    carry = []   # últimas shingle_words - 1 palavras do pedaço anterior
+    total = 0
+    for chunk in chunks:
+        found = REGEX_WORD.findall(chunk.lower())
+        total += len(found)
+        words = carry + found
+        for shingle in zip(*(words[i:] for i in range(shingle_words))):
+            value, b = divmod(crc32(' '.join(shingle).encode('utf-8')), num_bins)
+            if value < bins[b]:
+                bins[b] = value
+        carry = words[max(0, len(words) - shingle_words + 1):] if shingle_words > 1 else []
+    if total < shingle_words:
+        return None
+
+    # Densificação: compartimento vazio copia o próximo preenchido (circular) + deslocamento
+    if _EMPTY in bins:
+        filled = [b for b in range(num_bins) if bins[b] != _EMPTY]
+        for b in range(num_bins):
+            if bins[b] == _EMPTY:
+                distance = min((f - b) % num_bins for f in filled)
+                bins[b] = bins[(b + distance) % num_bins] + distance * _ROTATION_OFFSET
+    return tuple(bins)
+
+
+def encode_signature(signature):
+    """Assinatura -> string hex compacta (9 dígitos por compartimento), para o manifesto."""
+    return "".join(f"{value:09x}" for value in signature)
+
+
+def decode_signature(encoded):
+    return tuple(int(encoded[i:i + 9], 16) for i in range(0, len(encoded), 9))
+
+
+def similarity(sig_a, sig_b):
+    """Estimativa de Jaccard: fração de compartimentos iguais."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def track_language(filename):
+    """Idioma da faixa a partir do nome ('Canal-ID.pt.srt' -> 'pt'); '' se não houver sufixo."""
+    stem = filename.rsplit('.', 1)[0] if '.' in filename else filename
+    match = REGEX_TRACK_LANGUAGE.search(stem) or REGEX_DOT_LANGUAGE.search(stem)
+    return match.group(1) if match else ""
+
+
+def parse_language_preference(value):
+    """'pt,pt-orig,en' -> ('pt', 'pt-orig', 'en')."""
+    return tuple(part.strip() for part in value.split(',') if part.strip())
+
+
+def _language_rank(filename, preference):
+    language = track_language(filename)
+    lowered = [p.lower() for p in preference]
+    if language.lower() in lowered:
+        return lowered.index(language.lower())
+    return len(preference)
+
+
+def find_clusters(signatures, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+    """
+    Agrupa nomes com assinaturas parecidas. `signatures` = {nome: assinatura ou None}.
+    Retorna apenas clusters com 2+ nomes (listas ordenadas).
+    """
+    names = sorted(name for name, sig in signatures.items() if sig is not None)
+    parent = {name: name for name in names}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    buckets = {}
+    for name in names:
+        sig = signatures[name]
+        rows = len(sig) // bands
+        for band in range(bands):
+            buckets.setdefault((band, sig[band * rows:(band + 1) * rows]), []).append(name)
+
+    checked = set()
+    for members in buckets.values():
+        for i in range(1, len(members)):
+            for j in range(i):
+                pair = (members[j], members[i])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                root_a, root_b = find(pair[0]), find(pair[1])
+                if root_a != root_b and similarity(signatures[pair[0]], signatures[pair[1]]) >= threshold:
+                    parent[root_b] = root_a
+
+    clusters = {}
+    for name in names:
+        clusters.setdefault(find(name), []).append(name)
+    return [sorted(members) for members in clusters.values() if len(members) > 1]
+
+
+def find_duplicates(signatures, preference=DEFAULT_LANGUAGE_PREFERENCE, threshold=DEFAULT_THRESHOLD,
+                    lengths=None, fixed=()):
+    """
+    Retorna {duplicata: canônico} para todos os clusters.
+    O canônico é, em ordem: um nome de `fixed` (já processado/consolidado, não deve ser
+    refeito), a faixa de idioma mais preferido, o texto mais longo (`lengths`), o menor nome.
+    """
+    lengths = lengths or {}
+    fixed = set(fixed)
+    duplicates = {}
+    for members in find_clusters(signatures, threshold):
+        canonical = min(members, key=lambda name: (
+            name not in fixed, _language_rank(name, preference), -lengths.get(name, 0), name
+        ))
+        for name in members:
+            if name != canonical and name not in fixed:
+                duplicates[name] = canonical
+    return duplicates
@@ -0,0 +1,69 @@
+"""
+MÓDULO: lexis_core.packing
+DESCRIÇÃO:
+    Empacotamento de vídeos em volumes (bin packing) para o modo --pack do
+    lexis-join.py. O modo padrão enche os volumes em ordem de nome e fecha um
+    volume assim que o próximo vídeo não cabe, o que deixa sobras; aqui os vídeos
+    são distribuídos por first-fit decreasing (FFD): do maior para o menor, cada
+    um entra no primeiro volume com espaço, e só então um volume novo é aberto.
+
+    Com `window`, os vídeos são tratados em janelas de N vídeos consecutivos em
+    ordem cronológica: o FFD roda dentro de cada janela e só o último volume da
+    janela anterior continua aberto. Assim um vídeo nunca fica a mais de uma janela
+    de distância dos vizinhos de data, ao custo de volumes um pouco menos cheios.
+
+    Tamanhos e capacidade estão na mesma unidade (bytes ou caracteres), já sem o
+    cabeçalho do volume. Um vídeo maior que a capacidade ocupa um volume sozinho.
+"""
+
+
+def pack_volumes(sizes, capacity, order=None, window=None):
+    """
+    Distribui os itens (índices de `sizes`) em volumes.
+    `order` é a ordem cronológica dos índices (default: 0..n-1); `window` limita o
+    FFD a janelas de tantos itens consecutivos dessa ordem (None = todos de uma vez).
+    Retorna a lista de volumes (listas de índices em ordem cronológica), ordenada
+    pelo item mais antigo de cada volume.
+    """
+    order = list(range(len(sizes))) if order is None else list(order)
+    rank = {index: position for position, index in enumerate(order)}
+    window = window or len(order) or 1
+
+    bins = []
+    loads = []
+    for start in range(0, len(order), window):
+        group = order[start:start + window]
+        # Só o último volume da janela anterior continua recebendo vídeos
+        first_open = max(len(bins) - 1, 0)
+        for index in sorted(group, key=lambda i: (-sizes[i], rank[i])):
+            size = sizes[index]
+            for b in range(first_open, len(bins)):
+                if loads[b] + size <= capacity:
+                    bins[b].append(index)
+                    loads[b] += size
+                    break
+            else:
+                bins.append([index])
+                loads.append(size)
+
+    for volume in bins:
+        volume.sort(key=rank.__getitem__)
+    bins.sort(key=lambda volume: rank[volume[0]])
+    return bins
+
+
+def sequential_volume_count(sizes, capacity):
+    """Volumes que o enchimento sequencial (modo padrão) usaria para os mesmos itens, na ordem dada."""
+    count = 0
+    load = 0
+    for size in sizes:
+        if count == 0 or (load > 0 and load + size > capacity):
+            count += 1
+            load = 0
+        load += size
+    return count
+
+
+def fill_ratios(sizes, bins, capacity):
+    """Fração da capacidade ocupada em cada volume (pode passar de 1.0 com vídeos gigantes)."""
+    return [sum(sizes[i] for i in volume) / capacity for volume in bins] if capacity > 0 else []
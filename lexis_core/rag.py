@@ -0,0 +1,84 @@
+"""
+MÓDULO: lexis_core.rag
+DESCRIÇÃO:
+    Exportação das transcrições em trechos para RAG (comando `lexis --export-rag`).
+
+    Cada legenda é lida em streaming (lexis_core.srt) e perde as repetições do roll-up
+    das legendas automáticas (dedup_cues, o mesmo dedup do lexis-join). As sentenças são
+    agrupadas em janelas de N sentenças com sobreposição, como os parágrafos do
+    process_srt_content, e cada janela vira um registro JSON numa linha (JSONL), com:
+        video_id, title, date, channel, source   metadados do vídeo (.info.json)
+        chunk                                    ordinal do trecho no vídeo (0, 1, ...)
+        start, end                               segundos aproximados, pelos blocos da legenda
+        url                                      link do YouTube no início do trecho
+        text, chars, tokens                      o trecho e seu tamanho (tokens estimados)
+    Os registros são planos (sem objetos aninhados) e podem ser carregados direto por
+    pipelines de vetores, pandas ou pyarrow (JSONL -> Parquet), sem reprocessar os .txt.
+    Nem a legenda nem o arquivo de saída ficam inteiros em memória.
+"""
+import json
+import os
+
+from lexis_core.srt import dedup_cues, iter_cues, iter_overlap_windows, iter_timed_sentences
+
+DEFAULT_CHUNK_SENTENCES = 12
+DEFAULT_OVERLAP_SENTENCES = 2
+# Legendas automáticas quase não têm pontuação: uma "sentença" fecha no fim do bloco após esse tamanho
+MAX_SENTENCE_CHARS = 400
+YOUTUBE_URL = "https://www.youtube.com/watch?v={id}&t={seconds}s"
+NO_ID = ("N/A", "Sem ID", "")
+
+
+def parse_timestamp(value):
+    """'01:02:03,500' (ou com ponto) -> 3723.5 segundos."""
+    hours, minutes, seconds = value.replace(',', '.').split(':')
+    return round(int(hours) * 3600 + int(minutes) * 60 + float(seconds), 3)
+
+
+def _format_date(date_str):
+    if len(date_str) == 8 and date_str.isdigit():
+        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+    return date_str
+
+
+def chunk_records(source, meta, filename, chunk_sentences=DEFAULT_CHUNK_SENTENCES,
+                  overlap_sentences=DEFAULT_OVERLAP_SENTENCES, max_sentence_chars=MAX_SENTENCE_CHARS,
+                  count_tokens=None):
+    """
+    Gera os registros (dict) dos trechos de uma legenda (arquivo aberto ou string).
+    `meta` é o dict {date, title, id} do get_metadata; `filename` vai no campo source.
+    """
+    video_id = meta.get("id", "")
+    base = {
+        "video_id": video_id,
+        "title": meta.get("title", ""),
+        "date": _format_date(meta.get("date", "")),
+        "channel": os.path.basename(os.path.dirname(os.path.abspath(filename))),
+        "source": filename,
+    }
+    sentences = iter_timed_sentences(dedup_cues(iter_cues(source)), max_sentence_chars)
+    windows = iter_overlap_windows(sentences, chunk_sentences, overlap_sentences)
+    for ordinal, window in enumerate(windows):
+        text = " ".join(sentence for sentence, _, _ in window)
+        start = parse_timestamp(window[0][1])
+        record = dict(base)
+        record.update({
+            "chunk": ordinal,
+            "start": start,
+            "end": parse_timestamp(window[-1][2]),
+            "url": None if video_id in NO_ID else YOUTUBE_URL.format(id=video_id, seconds=int(start)),
+            "text": text,
+            "chars": len(text),
+            "tokens": count_tokens(text) if count_tokens else None,
+        })
+        yield record
+
+
+def write_records(records, handle):
+    """Grava os registros como JSONL num arquivo de texto aberto. Retorna quantos foram gravados."""
+    count = 0
+    for record in records:
+        handle.write(json.dumps(record, ensure_ascii=False))
+        handle.write("\n")
+        count += 1
+    return count
@@ -0,0 +1,177 @@
+"""
+MÓDULO: lexis_core.ratelimit
+DESCRIÇÃO:
+    Controle de vazão para chamadas à API do Gemini:
+    - RateLimiter: token bucket duplo (requisições/min e tokens/min) que respeita a cota.
+    - AIMDController: concorrência adaptativa (aumento aditivo / redução multiplicativa),
+      cresce enquanto as chamadas têm sucesso e recua ao receber 429.
+    - Funções de retry com backoff exponencial e jitter ("full jitter").
+
+    O módulo não importa o SDK do Gemini; os erros são inspecionados por duck typing
+    (`exc.code` / `exc.status`), o que mantém a importação barata.
+"""
+import asyncio
+import random
+import re
+import threading
+import time
+
+RATE_LIMIT_CODES = {429}
+TRANSIENT_CODES = {408, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Token bucket por reserva: cada aquisição consome `amount` imediatamente
+    (o saldo pode ficar negativo) e devolve quanto tempo o chamador deve esperar.
+    Assim as chamadas são servidas em ordem de chegada, sem "starvation" das grandes.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        """Consome `amount` e retorna o atraso (segundos) até a reserva estar coberta."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Combina os limites de requisições/min (RPM) e tokens/min (TPM). Valores None desativam o limite."""
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def _reserve(self, tokens):
+        delay = 0.0
+        if self.requests:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens:
+            delay = max(delay, self.tokens.reserve(tokens))
+        return delay
+
+    def acquire_sync(self, tokens=0):
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self, tokens=0):
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AIMDController:
+    """
+    Limite de concorrência adaptativo no estilo AIMD (controle de congestionamento TCP).
+    - Sucesso: limite += increase / limite (≈ +increase por "janela" completa).
+    - 429: limite *= decrease, no máximo uma vez por janela de `cooldown` segundos,
+      para que uma rajada de 429 de chamadas simultâneas conte como um único sinal.
+    Uso: `async with controller: ...` em volta de cada tentativa de chamada.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=64, increase=1.0, decrease=0.5, cooldown=2.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.peak = self.limit
+        self.throttles = 0
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = None
+
+    def _condition(self):
+        # Criado sob demanda para ficar ligado ao event loop em execução
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    async def __aenter__(self):
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        cond = self._condition()
+        async with cond:
+            self._in_flight -= 1
+            cond.notify_all()
+        return False
+
+    def on_success(self):
+        self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+        self.peak = max(self.peak, self.limit)
+
+    def on_throttle(self):
+        now = time.monotonic()
+        self.throttles += 1
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.decrease)
+
+
+def error_code(exc):
+    """Extrai o código HTTP de um erro do SDK (google.genai.errors.APIError) ou similar."""
+    code = getattr(exc, 'code', None)
+    if isinstance(code, int):
+        return code
+    status = str(getattr(exc, 'status', '') or '')
+    if status == 'RESOURCE_EXHAUSTED':
+        return 429
+    if status in ('UNAVAILABLE', 'INTERNAL', 'DEADLINE_EXCEEDED'):
+        return 503
+    return None
+
+
+def is_rate_limited(exc):
+    return error_code(exc) in RATE_LIMIT_CODES
+
+
+def is_retryable(exc):
+    code = error_code(exc)
+    if code is None:
+        # Falhas de rede (timeout, conexão recusada) não trazem código HTTP
+        return isinstance(exc, (TimeoutError, ConnectionError, asyncio.TimeoutError))
+    return code in RATE_LIMIT_CODES or code in TRANSIENT_CODES
+
+
+REGEX_RETRY_DELAY = re.compile(r"""['"]retryDelay['"]\s*:\s*['"](\d+(?:\.\d+)?)s['"]""")
+
+
+def retry_after(exc):
+    """Atraso sugerido pelo servidor (RetryInfo.retryDelay do Gemini), se presente."""
+    match = REGEX_RETRY_DELAY.search(str(getattr(exc, 'details', '') or exc))
+    return float(match.group(1)) if match else None
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0, exc=None):
+    """
+    Backoff exponencial com "full jitter": uniforme em [0, min(cap, base * 2^attempt)].
+    Se o servidor indicar um retryDelay, ele é usado como piso.
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    hinted = retry_after(exc) if exc is not None else None
+    if hinted is not None:
+        delay = max(delay, min(cap, hinted) + random.uniform(0, base))
+    return delay
@@ -0,0 +1,207 @@
+"""
+MÓDULO: lexis_core.report
+DESCRIÇÃO:
+    Instrumentação opcional (--report) do lexis.py e do lexis-join.py.
+    Registra, por arquivo, o tempo de cada etapa (read, clean, neardup, metadata,
+    api, write, archive), as chamadas à API (latência, retentativas, tokens de entrada
+    e saída vindos do usage_metadata do Gemini) e os bytes gravados por volume.
+
+    Ao final, gera um relatório legível por máquina (JSON, ou CSV por arquivo
+    conforme a extensão do caminho) e uma tabela-resumo para o terminal.
+    Desligado (padrão), cada chamada é praticamente gratuita.
+
+    O arquivo "atual" de uma chamada à API vem de um ContextVar (for_file), que
+    acompanha threads de asyncio.to_thread e tarefas asyncio sem precisar passar
+    o nome do arquivo por todas as funções.
+"""
+import contextvars
+import csv
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+STAGES = ("read", "clean", "neardup", "metadata", "api", "write", "archive")
+
+_current_file = contextvars.ContextVar("lexis_report_file", default=None)
+
+
+def percentile(values, pct):
+    """Percentil por posto mais próximo (values já ordenados); None se vazio."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+class RunReport:
+    """
+    Uso:
+        report = RunReport(enabled=True)
+        with report.stage(arquivo, "read"):
+            ...
+        report.record_api(latency, retries, input_tokens, output_tokens, ok=True)
+        report.write("relatorio.json"); print(report.format_table())
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.info = {}        # dados livres da execução (modelo, modo, preços...)
+        self.files = {}       # arquivo -> {etapa: segundos}
+        self.api_calls = []   # uma entrada por chamada lógica (após retentativas)
+        self.volumes = []
+        self.estimate = None  # preflight do --dry-run
+
+    def for_file(self, filename):
+        """Define o arquivo atual do contexto (threads/tarefas criadas dentro herdam)."""
+        if not self.enabled:
+            return nullcontext()
+        return self._for_file(filename)
+
+    @contextmanager
+    def _for_file(self, filename):
+        token = _current_file.set(filename)
+        try:
+            yield
+        finally:
+            _current_file.reset(token)
+
+    def stage(self, filename, name):
+        """Context manager que soma a duração do bloco na etapa `name` do arquivo."""
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(filename, name)
+
+    @contextmanager
+    def _stage(self, filename, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(filename, name, time.perf_counter() - start)
+
+    def add_time(self, filename, name, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            stages = self.files.setdefault(filename, {})
+            stages[name] = stages.get(name, 0.0) + seconds
+
+    def record_api(self, latency, retries, input_tokens=None, output_tokens=None, ok=True, elapsed=None):
+        """
+        Registra uma chamada lógica à API. `latency` é a da última tentativa,
+        `elapsed` inclui retentativas e esperas de backoff.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.api_calls.append({
+                "file": _current_file.get(),
+                "latency": latency,
+                "elapsed": latency if elapsed is None else elapsed,
+                "retries": retries,
+                "input_tokens": input_tokens or 0,
+                "output_tokens": output_tokens or 0,
+                "ok": ok,
+            })
+
+    def record_volume(self, channel, volume, path, size, chars):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.volumes.append({"channel": channel, "volume": volume, "path": path, "bytes": size, "chars": chars})
+
+    def _api_summary(self):
+        calls = self.api_calls
+        latencies = sorted(call["latency"] for call in calls)
+        input_tokens = sum(call["input_tokens"] for call in calls)
+        output_tokens = sum(call["output_tokens"] for call in calls)
+        summary = {
+            "calls": len(calls),
+            "failed": sum(1 for call in calls if not call["ok"]),
+            "retries": sum(call["retries"] for call in calls),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p90": percentile(latencies, 90),
+            "latency_p99": percentile(latencies, 99),
+            "latency_max": latencies[-1] if latencies else None,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        }
+        prices = self.info.get("price_per_mtok")
+        if prices:
+            summary["cost_usd"] = round(
+                input_tokens / 1e6 * prices["input"] + output_tokens / 1e6 * prices["output"], 6
+            )
+        return summary
+
+    def summary(self):
+        """Relatório completo como dict (o mesmo conteúdo do JSON)."""
+        with self.lock:
+            per_file = {}
+            for call in self.api_calls:
+                entry = per_file.setdefault(call["file"], {"api_calls": 0, "retries": 0,
+                                                           "input_tokens": 0, "output_tokens": 0})
+                entry["api_calls"] += 1
+                entry["retries"] += call["retries"]
+                entry["input_tokens"] += call["input_tokens"]
+                entry["output_tokens"] += call["output_tokens"]
+
+            files = {}
+            totals = {}
+            for filename, stages in sorted(self.files.items()):
+                files[filename] = {"stages": {k: round(v, 6) for k, v in stages.items()}, **per_file.get(filename, {})}
+                for name, seconds in stages.items():
+                    totals[name] = totals.get(name, 0.0) + seconds
+
+            return {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "elapsed": round(time.time() - self.started, 3),
+                "info": self.info,
+                "stage_totals": {k: round(v, 6) for k, v in totals.items()},
+                "api": self._api_summary(),
+                "volumes": list(self.volumes),
+                "estimate": self.estimate,
+                "files": files,
+            }
+
+    def write(self, path):
+        """Grava o relatório: CSV (uma linha por arquivo) se `path` termina em .csv, senão JSON."""
+        data = self.summary()
+        if path.lower().endswith(".csv"):
+            columns = ["file", *STAGES, "api_calls", "retries", "input_tokens", "output_tokens"]
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for filename, entry in data["files"].items():
+                    stages = entry["stages"]
+                    writer.writerow([filename, *(f"{stages.get(s, 0.0):.6f}" for s in STAGES),
+                                     entry.get("api_calls", 0), entry.get("retries", 0),
+                                     entry.get("input_tokens", 0), entry.get("output_tokens", 0)])
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def format_table(self):
+        """Tabela-resumo em texto: tempo por etapa, API e volumes."""
+        data = self.summary()
+        lines = [f"Relatório da execução ({len(data['files'])} arquivos, {data['elapsed']:.1f}s)"]
+        totals = data["stage_totals"]
+        if totals:
+            lines.append(f"  {'etapa':10} {'total (s)':>10} {'média (ms)':>11}")
+            for name in STAGES:
+                if name in totals:
+                    count = sum(1 for entry in data["files"].values() if name in entry["stages"])
+                    lines.append(f"  {name:10} {totals[name]:10.3f} {totals[name] / count * 1000:11.1f}")
+        api = data["api"]
+        if api["calls"]:
+            lines.append(f"  API: {api['calls']} chamadas ({api['failed']} falhas, {api['retries']} retentativas); "
+                         f"latência p50 {api['latency_p50']:.2f}s, p90 {api['latency_p90']:.2f}s, "
+                         f"p99 {api['latency_p99']:.2f}s")
+            cost = f", custo ≈ US$ {api['cost_usd']:.4f}" if "cost_usd" in api else ""
+            lines.append(f"  Tokens: {api['input_tokens']} entrada, {api['output_tokens']} saída{cost}")
+        if data["volumes"]:
+            written = sum(volume["bytes"] for volume in data["volumes"])
+            lines.append(f"  Volumes: {len(data['volumes'])} gravados, {written / (1024 * 1024):.2f} MB")
+        return "\n".join(lines)
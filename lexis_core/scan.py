@@ -0,0 +1,123 @@
+"""
+MÓDULO: lexis_core.scan
+DESCRIÇÃO:
+    Varredura da biblioteca de legendas (árvore de canais/playlists) com os.scandir,
+    compartilhada pelo lexis.py (--recursive) e pelo lexis-join.py.
+
+    - Um único scandir por pasta classifica as entradas numa passada: legendas
+      (.srt), textos (.txt), metadados (.info.json, com tamanho e mtime do próprio
+      scandir) e subpastas. O tipo vem do d_type da entrada, sem stat por arquivo.
+    - Pastas de saída (archive/, volumes_notebooklm/) e ocultas (.git, estado do
+      --batch) não são visitadas; links simbólicos para pastas não são seguidos.
+    - Com threads > 1, as pastas de cada nível da árvore são lidas em paralelo
+      (ThreadPoolExecutor: scandir libera o GIL e o ganho aparece em discos de rede
+      ou caches frios). O resultado é o mesmo, em ordem de caminho.
+    - prime_metadata entrega os .info.json já encontrados ao índice de metadados
+      (lexis_core.metadata), que assim não refaz o scandir de cada pasta.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from lexis_core.metadata import INFO_SUFFIX, get_index
+
+# Pastas geradas pelos próprios scripts (srt arquivados e volumes consolidados)
+SKIP_DIRS = frozenset({"archive", "volumes_notebooklm"})
+DEFAULT_SCAN_THREADS = 1
+
+
+class Folder:
+    """
+    Entradas de uma pasta, classificadas:
+        folder.srt / folder.txt      nomes (ordenados) das legendas e textos
+        folder.info                  [(nome, tamanho, mtime_ns)] dos .info.json
+        folder.subdirs               nomes das subpastas visitáveis
+    `relpath` é o caminho relativo à raiz da varredura ("" para a própria raiz).
+    """
+
+    __slots__ = ("path", "relpath", "srt", "txt", "info", "subdirs")
+
+    def __init__(self, path, relpath=""):
+        self.path = path
+        self.relpath = relpath
+        self.srt = []
+        self.txt = []
+        self.info = []
+        self.subdirs = []
+
+    @property
+    def name(self):
+        return os.path.basename(os.path.abspath(self.path))
+
+    def srt_paths(self):
+        """Legendas com o caminho relativo à raiz da varredura ('Canal/Canal-ID.srt')."""
+        return [os.path.join(self.relpath, name) for name in self.srt]
+
+
+def scan_folder(path, relpath="", skip=SKIP_DIRS):
+    """Um scandir de `path` -> Folder. Pasta ilegível resulta num Folder vazio."""
+    folder = Folder(path, relpath)
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in skip:
+                            folder.subdirs.append(name)
+                    elif not entry.is_file():
+                        continue
+                    elif name.endswith(INFO_SUFFIX):
+                        st = entry.stat()
+                        folder.info.append((name, st.st_size, st.st_mtime_ns))
+                    elif name.endswith('.srt'):
+                        folder.srt.append(name)
+                    elif name.endswith('.txt'):
+                        folder.txt.append(name)
+                except OSError:
+                    # Arquivo removido durante a varredura
+                    continue
+    except OSError:
+        return folder
+    folder.srt.sort()
+    folder.txt.sort()
+    folder.subdirs.sort()
+    return folder
+
+
+def scan_tree(root, max_depth=None, threads=DEFAULT_SCAN_THREADS, skip=SKIP_DIRS):
+    """
+    Varre `root` e suas subpastas até `max_depth` níveis (0 = só a raiz, None = toda a árvore).
+    Retorna a lista de Folder ordenada por caminho relativo (a raiz primeiro).
+    """
+    folders = []
+    level = [(root, "")]
+    depth = 0
+    executor = ThreadPoolExecutor(threads) if threads > 1 else None
+    try:
+        while level:
+            if executor and len(level) > 1:
+                scanned = executor.map(lambda item: scan_folder(item[0], item[1], skip), level)
+            else:
+                scanned = (scan_folder(path, relpath, skip) for path, relpath in level)
+            next_level = []
+            for folder in scanned:
+                folders.append(folder)
+                if max_depth is None or depth < max_depth:
+                    next_level.extend((os.path.join(folder.path, d), os.path.join(folder.relpath, d))
+                                      for d in folder.subdirs)
+            level = next_level
+            depth += 1
+    finally:
+        if executor:
+            executor.shutdown()
+    folders.sort(key=lambda folder: folder.relpath.split(os.sep) if folder.relpath else [])
+    return folders
+
+
+def prime_metadata(folders):
+    """Cria o índice de metadados das pastas com legendas/textos a partir do que o scandir já viu."""
+    for folder in folders:
+        if folder.info and (folder.srt or folder.txt):
+            get_index(folder.path, folder.info)
@@ -0,0 +1,576 @@
+"""
+MÓDULO: lexis_core.search (comando `lexis-search`, ou `python lexis-search.py`)
+DESCRIÇÃO:
+    Índice invertido local (BM25) dos volumes CONSOLIDADO_<canal>_VOL_NNN.txt, para achar
+    em milissegundos quais vídeos falaram de um assunto sem varrer gigabytes com grep.
+    100% offline, só com a biblioteca padrão (sqlite3).
+
+    - Cada vídeo de um volume (bloco "--- METADADOS DO DOCUMENTO ---" ... "FIM DO VÍDEO")
+      é um documento, identificado pelos campos ID / TÍTULO / ARQUIVO / DATA do cabeçalho.
+      São indexados o título e a transcrição.
+    - Tokenização para português: minúsculas, sem acentos (ação = acao), sem stopwords e
+      com o plural reduzido (orações -> oracao), aplicada igual ao texto e à consulta.
+    - O índice fica em volumes_notebooklm/.lexis_search.sqlite3. Para cada termo e volume
+      há um blob compacto com (vídeo, byte da 1ª ocorrência, frequência) de cada vídeo que
+      contém o termo; o byte dá o trecho (snippet) exibido no resultado, sem reler o vídeo.
+    - Atualização incremental por volume: o lexis-join reindexa cada volume que fecha, e
+      sync() compara (tamanho, mtime) dos volumes da pasta, reindexando só os alterados e
+      removendo os apagados.
+
+USO:
+    lexis-search "graça e fé" [-n 10] [--channel Canal] [--json]
+    lexis-search --reindex            # reconstrói o índice inteiro
+"""
+import argparse
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter
+
+INDEX_FILENAME = ".lexis_search.sqlite3"
+SCHEMA_VERSION = 1
+DEFAULT_VOLUMES_DIR = "volumes_notebooklm"
+VOLUME_PATTERN = re.compile(r"^CONSOLIDADO_(.+)_VOL_(\d{3,})\.txt$")
+
+# Parâmetros do BM25 (valores usuais)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+DEFAULT_LIMIT = 10
+SNIPPET_BYTES = 240
+READ_CHUNK_BYTES = 256 * 1024
+MAX_TERM_CHARS = 40
+TERM_CACHE_SIZE = 200000
+
+# Marcadores do bloco de cada vídeo (ver join.video_header / join.video_footer)
+MARKER_METADATA = "--- METADADOS DO DOCUMENTO ---\n".encode('utf-8')
+MARKER_TRANSCRIPTION = "--- TRANSCRICAO COMPLETA ---\n".encode('utf-8')
+MARKER_END = "FIM DO VÍDEO: ".encode('utf-8')
+FIELDS = {
+    "DATA: ".encode('utf-8'): "date",
+    "TÍTULO: ".encode('utf-8'): "title",
+    "ID: ".encode('utf-8'): "id",
+    "ARQUIVO: ".encode('utf-8'): "file",
+}
+
+# Título dos vídeos sem .info.json (join.UNKNOWN_METADATA): não é indexado
+UNTITLED = "Sem Título"
+
+REGEX_WORD = re.compile(r'[^\W_]+')
+ACCENTS = str.maketrans("áàâãäåçéèêëíìîïñóòôõöúùûüýÿ", "aaaaaaceeeeiiiinooooouuuuyy")
+
+# Stopwords do português, já sem acentos (mesma forma do texto normalizado)
+STOPWORDS = frozenset("""
+a ao aos aquela aquelas aquele aqueles aquilo as ate com como da das de dela delas dele deles depois do dos
+e ela elas ele eles em entre era eram essa essas esse esses esta estas este estes estou esta estao eu foi
+foram ha isso isto ja lhe lhes mais mas me mesmo meu meus minha minhas muito na nas nao nem no nos nossa
+nossas nosso nossos num numa o os ou para pela pelas pelo pelos por qual quando que quem se sem ser sera
+seu seus so sua suas tambem te tem tinha tu tua tuas teu teus um uma umas uns voce voces vos ai ali aqui
+assim entao la pra pro ta to vai vou
+""".split())
+
+# Passo de plural do RSLP, simplificado (aplicado a palavras já sem acento)
+PLURAL_SUFFIXES = (
+    ("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("ois", "ol"),
+    ("ns", "m"), ("res", "r"), ("zes", "z"), ("les", "l"), ("s", ""),
+)
+
+ITEM_SIZES = {code: array(code).itemsize for code in "BHI"}
+_match_group = re.Match.group
+
+_term_cache = {}
+
+
+def fold(text):
+    """Minúsculas e sem acentos, preservando o tamanho do texto (as posições continuam valendo)."""
+    return text.lower().translate(ACCENTS)
+
+
+def stem(word):
+    """Reduz o plural de uma palavra normalizada ("oracoes" -> "oracao", "igrejas" -> "igreja")."""
+    if len(word) <= 3 or not word.endswith('s'):
+        return word
+    for suffix, replacement in PLURAL_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) + len(replacement) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def _normalize(word):
+    """Palavra em minúsculas -> termo do índice ('' para stopwords e ruído). Guardado em _term_cache."""
+    folded = fold(word)
+    if folded in STOPWORDS or len(folded) > MAX_TERM_CHARS or (len(folded) < 2 and not folded.isdigit()):
+        term = ''
+    else:
+        term = stem(folded)
+    if len(_term_cache) < TERM_CACHE_SIZE:
+        _term_cache[word] = term
+    return term
+
+
+def query_terms(query):
+    """Termos distintos de uma consulta, na ordem em que aparecem."""
+    terms = (_term_cache.get(word) or _normalize(word) for word in REGEX_WORD.findall(query.lower()))
+    return list(dict.fromkeys(term for term in terms if term))
+
+
+class VideoTerms:
+    """Um vídeo de um volume: metadados, frequência de cada termo e byte da 1ª ocorrência."""
+
+    __slots__ = ("offset", "size", "meta", "counts", "firsts", "length")
+
+    def __init__(self, offset):
+        self.offset = offset
+        self.size = 0
+        self.meta = {}
+        self.counts = {}
+        self.firsts = {}
+        self.length = 0
+
+    def add_text(self, text, byte_offset):
+        """Tokeniza `text` (sem palavra cortada nas pontas), que começa no byte `byte_offset` do volume."""
+        # Acentos saem por palavra distinta (no cache de termos), não no texto inteiro
+        matches = list(REGEX_WORD.finditer(text.lower()))
+        words = list(map(_match_group, matches))
+        # Palavra -> índice do seu 1º token no trecho (o dict fica com o menor índice)
+        first_index = dict(zip(reversed(words), range(len(words) - 1, -1, -1)))
+        counts, cache = self.counts, _term_cache
+        new_terms = {}
+        length = 0
+        for word, n in Counter(words).items():
+            term = cache.get(word)
+            if term is None:
+                term = _normalize(word)
+            if not term:
+                continue
+            length += n
+            tf = counts.get(term)
+            if tf is None:
+                counts[term] = n
+                new_terms[term] = first_index[word]
+            else:
+                counts[term] = tf + n
+                # Outra forma do mesmo termo (plural, acento) pode ter aparecido antes
+                if term in new_terms and first_index[word] < new_terms[term]:
+                    new_terms[term] = first_index[word]
+        self.length += length
+
+        # Byte da 1ª ocorrência dos termos novos, codificando só o trecho desde a anterior
+        firsts = self.firsts
+        char_pos = 0
+        byte_pos = byte_offset
+        for index, term in sorted((index, term) for term, index in new_terms.items()):
+            start = matches[index].start()
+            byte_pos += len(text[char_pos:start].encode('utf-8'))
+            char_pos = start
+            firsts[term] = byte_pos
+
+
+def parse_volume(handle):
+    """
+    Lê um volume aberto em modo binário, linha a linha (linhas longas, como a transcrição,
+    em pedaços de READ_CHUNK_BYTES) e retorna a lista de VideoTerms, na ordem do arquivo.
+    """
+    videos = []
+    video = None
+    in_text = False
+    carry = b''
+    carry_offset = 0
+    offset = 0
+    line_start = True
+
+    def flush():
+        if carry and video is not None:
+            video.add_text(carry.decode('utf-8', 'replace'), carry_offset)
+        return b''
+
+    while True:
+        piece = handle.readline(READ_CHUNK_BYTES)
+        if not piece:
+            break
+        piece_offset = offset
+        offset += len(piece)
+        starts_line = line_start
+        line_start = piece.endswith(b'\n')
+
+        if starts_line and piece == MARKER_METADATA:
+            carry = flush()
+            in_text = False
+            video = VideoTerms(piece_offset)
+            videos.append(video)
+        if video is None:
+            continue
+        video.size = offset - video.offset
+        if video.offset == piece_offset:
+            continue
+        if not in_text:
+            if not starts_line:
+                continue
+            if piece == MARKER_TRANSCRIPTION:
+                in_text = True
+                continue
+            for prefix, key in FIELDS.items():
+                if piece.startswith(prefix) and key not in video.meta:
+                    value = piece[len(prefix):].decode('utf-8', 'replace').strip()
+                    video.meta[key] = value
+                    if key == "title" and value != UNTITLED:
+                        video.add_text(value, piece_offset + len(prefix))
+                    break
+            continue
+        if starts_line and piece.startswith(MARKER_END):
+            carry = flush()
+            in_text = False
+            continue
+
+        # Transcrição: só tokeniza até o último espaço; o resto segue para o próximo pedaço
+        base = carry_offset if carry else piece_offset
+        data = carry + piece if carry else piece
+        cut = len(data) if line_start else max(data.rfind(b' '), data.rfind(b'\n')) + 1
+        if cut:
+            video.add_text(data[:cut].decode('utf-8', 'replace'), base)
+        carry = data[cut:]
+        carry_offset = base + cut
+    flush()
+    return videos
+
+
+def _narrow(values):
+    """Lista de inteiros >= 0 -> array no menor tipo que comporta o maior valor."""
+    top = max(values)
+    return array('B' if top < 1 << 8 else 'H' if top < 1 << 16 else 'I', values)
+
+
+def _encode_postings(seqs, firsts, tfs):
+    """
+    Postings de um termo num volume -> blob: os tipos das três colunas (ex: b"BHB") seguidos
+    das colunas (nº do vídeo no volume, byte da 1ª ocorrência relativo ao início do vídeo,
+    frequência), cada uma no menor tipo de array que comporta os seus valores.
+    """
+    columns = (_narrow(seqs), _narrow(firsts), _narrow(tfs))
+    return ''.join(column.typecode for column in columns).encode('ascii') + b''.join(
+        column.tobytes() for column in columns)
+
+
+def _postings_count(data):
+    return (len(data) - 3) // sum(ITEM_SIZES[code] for code in data[:3].decode('ascii'))
+
+
+def _decode_postings(data):
+    """Blob -> (vídeos, bytes da 1ª ocorrência relativos ao vídeo, frequências)."""
+    n = _postings_count(data)
+    columns = []
+    pos = 3
+    for code in data[:3].decode('ascii'):
+        size = ITEM_SIZES[code] * n
+        columns.append(array(code, data[pos:pos + size]))
+        pos += size
+    return columns
+
+
+class SearchIndex:
+    """
+    Uso:
+        index = SearchIndex(os.path.join(pasta_dos_volumes, INDEX_FILENAME))
+        index.index_volume(caminho_do_volume)     # após gravar/alterar um volume
+        index.sync(pasta_dos_volumes)             # reindexa alterados, remove apagados
+        index.search("graça e fé", limit=10)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.directory = os.path.dirname(path) or "."
+        self._conn = sqlite3.connect(path)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Índice de outro formato: descartado e refeito pelo próximo sync()
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for table in ("volumes", "videos", "postings"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS volumes ("
+                " id INTEGER PRIMARY KEY,"
+                " name TEXT NOT NULL UNIQUE,"
+                " channel TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " terms BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS videos ("
+                " volume_id INTEGER NOT NULL,"
+                " seq INTEGER NOT NULL,"
+                " offset INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " length INTEGER NOT NULL,"
+                " video_id TEXT, title TEXT, date TEXT, file TEXT,"
+                " PRIMARY KEY (volume_id, seq)) WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings ("
+                " term TEXT NOT NULL,"
+                " volume_id INTEGER NOT NULL,"
+                " data BLOB NOT NULL,"
+                " PRIMARY KEY (term, volume_id)) WITHOUT ROWID"
+            )
+
+    def close(self):
+        self._conn.close()
+
+    def _delete_volume(self, volume_id):
+        # Sem índice secundário por volume (dobraria o tamanho das chaves): os termos do
+        # volume ficam guardados em volumes.terms e as postings saem pela chave primária
+        row = self._conn.execute("SELECT terms FROM volumes WHERE id = ?", (volume_id,)).fetchone()
+        if row is not None and row[0]:
+            terms = zlib.decompress(row[0]).decode('utf-8').split('\n')
+            self._conn.executemany("DELETE FROM postings WHERE term = ? AND volume_id = ?",
+                                   ((term, volume_id) for term in terms))
+        self._conn.execute("DELETE FROM videos WHERE volume_id = ?", (volume_id,))
+
+    def remove_volume(self, name):
+        with self._conn:
+            row = self._conn.execute("SELECT id FROM volumes WHERE name = ?", (name,)).fetchone()
+            if row is not None:
+                self._delete_volume(row[0])
+                self._conn.execute("DELETE FROM volumes WHERE id = ?", (row[0],))
+
+    def index_volume(self, path):
+        """(Re)indexa um volume inteiro. Retorna o número de vídeos encontrados."""
+        name = os.path.basename(path)
+        match = VOLUME_PATTERN.match(name)
+        channel = match.group(1) if match else ""
+        with open(path, 'rb') as handle:
+            st = os.fstat(handle.fileno())
+            videos = parse_volume(handle)
+
+        postings = {}
+        for seq, video in enumerate(videos):
+            firsts, start = video.firsts, video.offset
+            for term, tf in video.counts.items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = ([], [], [])
+                entry[0].append(seq)
+                entry[1].append(firsts[term] - start)
+                entry[2].append(tf)
+
+        terms = sorted(postings)
+        terms_blob = zlib.compress('\n'.join(terms).encode('utf-8'))
+        with self._conn:
+            row = self._conn.execute("SELECT id FROM volumes WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                volume_id = self._conn.execute(
+                    "INSERT INTO volumes (name, channel, size, mtime_ns, terms) VALUES (?, ?, ?, ?, ?)",
+                    (name, channel, st.st_size, st.st_mtime_ns, terms_blob)
+                ).lastrowid
+            else:
+                volume_id = row[0]
+                self._delete_volume(volume_id)
+                self._conn.execute("UPDATE volumes SET channel = ?, size = ?, mtime_ns = ?, terms = ? WHERE id = ?",
+                                   (channel, st.st_size, st.st_mtime_ns, terms_blob, volume_id))
+            self._conn.executemany(
+                "INSERT INTO videos (volume_id, seq, offset, size, length, video_id, title, date, file)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((volume_id, seq, video.offset, video.size, video.length, video.meta.get("id"),
+                  video.meta.get("title"), video.meta.get("date"), video.meta.get("file"))
+                 for seq, video in enumerate(videos))
+            )
+            self._conn.executemany(
+                "INSERT INTO postings (term, volume_id, data) VALUES (?, ?, ?)",
+                ((term, volume_id, _encode_postings(*postings[term])) for term in terms)
+            )
+        return len(videos)
+
+    def sync(self, directory=None):
+        """
+        Deixa o índice igual aos volumes da pasta: reindexa os novos/alterados (tamanho ou mtime
+        diferentes) e remove os apagados. Retorna (nomes_reindexados, nomes_removidos).
+        """
+        directory = directory or self.directory
+        current = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if VOLUME_PATTERN.match(entry.name) and entry.is_file():
+                        st = entry.stat()
+                        current[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        indexed = {name: (size, mtime_ns) for name, size, mtime_ns in
+                   self._conn.execute("SELECT name, size, mtime_ns FROM volumes")}
+
+        removed = sorted(name for name in indexed if name not in current)
+        for name in removed:
+            self.remove_volume(name)
+        changed = sorted(name for name, signature in current.items() if indexed.get(name) != signature)
+        for name in changed:
+            self.index_volume(os.path.join(directory, name))
+        return changed, removed
+
+    def clear(self):
+        with self._conn:
+            for table in ("postings", "videos", "volumes"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+    def compact(self):
+        """Regrava o arquivo do índice sem páginas vazias/fragmentadas (ex: após um --reindex)."""
+        self._conn.execute("VACUUM")
+
+    def stats(self):
+        """(volumes, vídeos) indexados."""
+        volumes = self._conn.execute("SELECT COUNT(*) FROM volumes").fetchone()[0]
+        videos = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+        return volumes, videos
+
+    def search(self, query, limit=DEFAULT_LIMIT, channel=None):
+        """
+        Vídeos mais relevantes para a consulta (BM25, termos em OU), como dicts com
+        score, canal, volume, metadados, `offset` (byte da 1ª ocorrência do termo mais raro
+        da consulta no volume) e `snippet` (trecho em volta dele).
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+        volumes = {volume_id: (name, volume_channel) for volume_id, name, volume_channel in
+                   self._conn.execute("SELECT id, name, channel FROM volumes")
+                   if channel is None or volume_channel == channel}
+        lengths = {}
+        for volume_id, seq, length in self._conn.execute("SELECT volume_id, seq, length FROM videos"):
+            if volume_id in volumes:
+                lengths.setdefault(volume_id, {})[seq] = length
+        n_videos = sum(len(by_seq) for by_seq in lengths.values())
+        if not n_videos:
+            return []
+        avg_length = sum(sum(by_seq.values()) for by_seq in lengths.values()) / n_videos or 1.0
+
+        scores = {}
+        best = {}
+        for term in terms:
+            rows = [(volume_id, data) for volume_id, data in
+                    self._conn.execute("SELECT volume_id, data FROM postings WHERE term = ?", (term,))
+                    if volume_id in volumes]
+            df = sum(_postings_count(data) for _, data in rows)
+            if not df:
+                continue
+            idf = math.log(1 + (n_videos - df + 0.5) / (df + 0.5))
+            for volume_id, data in rows:
+                by_seq = lengths[volume_id]
+                seqs, firsts, tfs = _decode_postings(data)
+                for seq, first, tf in zip(seqs, firsts, tfs):
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * by_seq[seq] / avg_length)
+                    key = (volume_id, seq)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    if idf > best.get(key, (-1.0, 0))[0]:
+                        best[key] = (idf, first)
+
+        results = []
+        for (volume_id, seq), score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            name, volume_channel = volumes[volume_id]
+            offset, size, video_id, title, date, filename = self._conn.execute(
+                "SELECT offset, size, video_id, title, date, file FROM videos WHERE volume_id = ? AND seq = ?",
+                (volume_id, seq)
+            ).fetchone()
+            first = offset + best[(volume_id, seq)][1]
+            results.append({
+                "score": round(score, 4), "channel": volume_channel, "volume": name,
+                "id": video_id, "title": title, "date": date, "file": filename,
+                "video_offset": offset, "offset": first,
+                "snippet": read_snippet(os.path.join(self.directory, name), first, offset, offset + size),
+            })
+        return results
+
+
+def read_snippet(path, offset, start=0, end=None, size=SNIPPET_BYTES):
+    """Trecho de ~`size` bytes do volume em volta do byte `offset`, sem sair do bloco [start, end) do vídeo."""
+    begin = max(start, offset - size // 3)
+    stop = offset + size - (offset - begin)
+    if end is not None:
+        stop = min(stop, end)
+    try:
+        with open(path, 'rb') as f:
+            f.seek(begin)
+            data = f.read(max(0, stop - begin))
+    except OSError:
+        return ""
+    words = data.decode('utf-8', 'ignore').split()
+    # Palavras cortadas nas pontas ficam de fora
+    if begin > start and words:
+        words = words[1:]
+    if (end is None or stop < end) and words:
+        words = words[:-1]
+    return ' '.join(words)
+
+
+def format_results(results, query, elapsed, videos):
+    lines = [f"{len(results)} vídeo(s) para \"{query}\" ({elapsed * 1000:.1f} ms, {videos} vídeos indexados)"]
+    for rank, result in enumerate(results, 1):
+        lines.append("")
+        lines.append(f"{rank}. [{result['score']:.2f}] {result['date'] or '?'} | {result['title'] or 'Sem Título'}")
+        lines.append(f"   ID: {result['id'] or '?'} | ARQUIVO: {result['file'] or '?'} | CANAL: {result['channel']}")
+        lines.append(f"   {result['volume']} (vídeo no byte {result['video_offset']}, trecho no byte {result['offset']})")
+        if result["snippet"]:
+            lines.append(f"   \"... {result['snippet']} ...\"")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Busca (BM25) nos volumes consolidados pelo lexis-join (100% offline)."
+    )
+    parser.add_argument("query", nargs="*", help="Termos da busca.")
+    parser.add_argument("-n", "--limit", type=int, default=DEFAULT_LIMIT,
+                        help=f"Número de vídeos no resultado (default: {DEFAULT_LIMIT}).")
+    parser.add_argument("--channel", help="Só busca nos volumes deste canal.")
+    parser.add_argument("--dir", default=DEFAULT_VOLUMES_DIR,
+                        help=f"Pasta dos volumes (default: {DEFAULT_VOLUMES_DIR}).")
+    parser.add_argument("--json", action="store_true", help="Resultado em JSON.")
+    parser.add_argument("--reindex", action="store_true", help="Reconstrói o índice inteiro antes de buscar.")
+    args = parser.parse_args(argv)
+    if not args.query and not args.reindex:
+        parser.error("informe os termos da busca (ou --reindex)")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.isdir(args.dir):
+        print(f"Pasta de volumes não encontrada: {args.dir} (rode o lexis-join antes).", file=sys.stderr)
+        sys.exit(1)
+
+    index = SearchIndex(os.path.join(args.dir, INDEX_FILENAME))
+    try:
+        start = time.perf_counter()
+        if args.reindex:
+            index.clear()
+        # Volumes gravados/alterados fora do lexis-join (ou com --no-index) entram aqui
+        changed, removed = index.sync(args.dir)
+        if args.reindex:
+            index.compact()
+        if changed or removed:
+            print(f"Índice atualizado: {len(changed)} volume(s) indexado(s), {len(removed)} removido(s) "
+                  f"({time.perf_counter() - start:.2f} s)", file=sys.stderr)
+        if not args.query:
+            return
+
+        query = " ".join(args.query)
+        start = time.perf_counter()
+        results = index.search(query, args.limit, args.channel)
+        elapsed = time.perf_counter() - start
+        if args.json:
+            print(json.dumps({"query": query, "terms": query_terms(query), "ms": round(elapsed * 1000, 2),
+                              "results": results}, ensure_ascii=False, indent=2))
+        else:
+            print(format_results(results, query, elapsed, index.stats()[1]))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+MÓDULO: lexis_core.settings
+DESCRIÇÃO:
+    Onde ficam os arquivos de configuração e estado compartilhados do Lexis
+    (.env, cache de resumos, calibração de tokens) e leitura do .env.
+
+    HOME_DIR é a pasta do checkout (a mesma dos scripts lexis.py e lexis-join.py),
+    ou $LEXIS_HOME quando o pacote foi instalado fora do checkout.
+    O python-dotenv só é importado quando o .env é de fato lido.
+"""
+import os
+
+HOME_DIR = os.environ.get("LEXIS_HOME") or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_PATH = os.path.join(HOME_DIR, ".env")
+
+
+def read_env(name, env_path=ENV_PATH):
+    """Valor de `name` no .env, ou na variável de ambiente de mesmo nome; None se não houver."""
+    if os.path.exists(env_path):
+        from dotenv import dotenv_values
+
+        value = dotenv_values(env_path).get(name)
+        if value:
+            return value
+    return os.environ.get(name) or None
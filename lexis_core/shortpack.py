@@ -0,0 +1,107 @@
+"""
+MÓDULO: lexis_core.shortpack
+DESCRIÇÃO:
+    Resumo de vídeos curtos em grupo (modo --pack-shorts do lexis.py).
+
+    Em canais de shorts, o que esgota a cota é o número de requisições por minuto,
+    não os tokens: cada vídeo de 2-5 minutos gastaria uma chamada inteira. Aqui as
+    transcrições curtas são agrupadas (ShortPacker) até um orçamento de tokens e de
+    vídeos, e cada grupo vira uma única chamada que pede saída JSON estruturada
+    (PACK_SCHEMA): uma lista com um resumo por vídeo, identificado pela chave
+    ("V1", "V2", ...) que precede a transcrição dele no prompt.
+
+    parse_pack_response aceita só resumos não vazios com chaves do grupo; quem chama
+    refaz em chamadas individuais os vídeos que faltarem (ou todos, se o JSON vier
+    inválido).
+"""
+import json
+import re
+
+# Cabeçalho de cada transcrição no prompt do grupo (o servidor local usa o mesmo marcador)
+PACK_MARKER = "### VÍDEO "
+PACK_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "STRING"},
+            "resumo": {"type": "STRING"},
+        },
+        "required": ["id", "resumo"],
+    },
+}
+PACK_CONFIG = {"response_mime_type": "application/json", "response_schema": PACK_SCHEMA}
+
+REGEX_CODE_FENCE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+
+def pack_keys(count):
+    return [f"V{i + 1}" for i in range(count)]
+
+
+def format_pack_videos(keys, texts):
+    """As transcrições do grupo, cada uma precedida pelo marcador com a sua chave."""
+    return "\n\n".join(f"{PACK_MARKER}{key}\n{text}" for key, text in zip(keys, texts))
+
+
+def parse_pack_response(text, keys):
+    """
+    {chave: resumo} a partir da resposta JSON do grupo. Entradas com chave desconhecida,
+    repetida ou resumo vazio são ignoradas; JSON inválido resulta em {}.
+    """
+    try:
+        data = json.loads(REGEX_CODE_FENCE.sub('', text or ""))
+    except ValueError:
+        return {}
+    if isinstance(data, dict):
+        # Alguns modelos embrulham a lista num objeto
+        data = next((value for value in data.values() if isinstance(value, list)), [])
+    if not isinstance(data, list):
+        return {}
+
+    wanted = set(keys)
+    summaries = {}
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        key = str(entry.get("id", "")).strip()
+        summary = entry.get("resumo")
+        if key in wanted and key not in summaries and isinstance(summary, str) and summary.strip():
+            summaries[key] = summary.strip()
+    return summaries
+
+
+class ShortPacker:
+    """
+    Agrupa itens em ordem até `max_tokens` (soma das transcrições) ou `max_items` por grupo.
+    Uso:
+        packer = ShortPacker(8000, 10)
+        for item, tokens in ...:
+            group = packer.add(item, tokens)
+            if group: enviar(group)
+        group = packer.flush()
+    """
+
+    def __init__(self, max_tokens, max_items):
+        self.max_tokens = max_tokens
+        self.max_items = max(2, max_items)
+        self.items = []
+        self.tokens = 0
+
+    def add(self, item, tokens):
+        """Adiciona o item; retorna o grupo que fechou com isso (ou None)."""
+        closed = None
+        if self.items and self.tokens + tokens > self.max_tokens:
+            closed = self.flush()
+        self.items.append(item)
+        self.tokens += tokens
+        if closed is None and len(self.items) >= self.max_items:
+            closed = self.flush()
+        return closed
+
+    def flush(self):
+        """Fecha e retorna o grupo atual (None se vazio)."""
+        items = self.items
+        self.items = []
+        self.tokens = 0
+        return items or None
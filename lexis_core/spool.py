@@ -0,0 +1,152 @@
+"""
+MÓDULO: lexis_core.spool
+DESCRIÇÃO:
+    Texto limpo de um vídeo gravado aos poucos (SpooledText), usado pelo lexis.py e
+    pelo lexis-join.py para que legendas de lives de várias horas não fiquem inteiras
+    na memória (nem em várias cópias) enquanto esperam o resumo ou o volume.
+
+    - Até `memory_chars` caracteres o texto fica em memória (a maioria dos vídeos);
+      passando disso, tudo vai para um arquivo temporário oculto
+      (.lexis_spool_*.tmp) na pasta indicada, e a memória usada fica limitada
+      a um pedaço, qualquer que seja o tamanho do vídeo.
+    - Caracteres, bytes UTF-8 e (opcionalmente) tokens estimados são contados na
+      escrita, então o tamanho é conhecido sem reler o texto.
+    - A leitura é sempre em pedaços: chunks() (texto), byte_chunks() e copy_to()
+      (bytes, direto para outro arquivo).
+    - O objeto pode ser enviado entre processos (pool do --jobs): o arquivo
+      temporário passa a pertencer a quem recebe. Só close() apaga o arquivo.
+"""
+import os
+import tempfile
+
+SPOOL_MEMORY_CHARS = 2 * 1024 * 1024
+SPOOL_PREFIX = ".lexis_spool_"
+READ_CHUNK_BYTES = 1 << 20
+
+
+class SpooledText:
+    """
+    Uso:
+        spool = SpooledText(pasta, count_tokens=estimador.estimate)
+        for chunk in iter_clean_chunks(arquivo): spool.write(chunk)
+        spool.finish()
+        spool.chars, spool.bytes, spool.tokens
+        spool.copy_to(arquivo_binario); spool.close()
+    Os pedaços escritos com count_tokens devem quebrar entre palavras (estimativa aditiva).
+    """
+
+    def __init__(self, directory=".", memory_chars=SPOOL_MEMORY_CHARS, count_tokens=None):
+        self.directory = directory
+        self.memory_chars = memory_chars
+        self.count_tokens = count_tokens
+        self.chars = 0
+        self.bytes = 0
+        self.tokens = 0
+        self.parts = []     # texto em memória (antes de passar de memory_chars)
+        self.path = None    # arquivo temporário, depois de passar
+        self._handle = None
+
+    def write(self, text):
+        if not text:
+            return
+        data = text.encode('utf-8')
+        self.chars += len(text)
+        self.bytes += len(data)
+        if self.count_tokens:
+            self.tokens += self.count_tokens(text)
+        if self.path is None and self.chars > self.memory_chars:
+            self._rollover()
+        if self._handle is not None:
+            self._handle.write(data)
+        else:
+            self.parts.append(text)
+
+    def _rollover(self):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix=SPOOL_PREFIX, suffix=".tmp", dir=self.directory)
+        self._handle = os.fdopen(fd, 'wb')
+        for part in self.parts:
+            self._handle.write(part.encode('utf-8'))
+        self.parts = []
+
+    def finish(self):
+        """Termina a escrita (fecha o arquivo temporário, se houver). Chamado também pela leitura."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    @property
+    def on_disk(self):
+        return self.path is not None
+
+    def chunks(self):
+        """O texto em pedaços (str)."""
+        self.finish()
+        if self.path is None:
+            yield from self.parts
+            return
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            while True:
+                chunk = f.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+
+    def byte_chunks(self):
+        """O texto codificado em UTF-8, em pedaços (bytes)."""
+        self.finish()
+        if self.path is None:
+            for part in self.parts:
+                yield part.encode('utf-8')
+            return
+        with open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+
+    def prefix(self, chars):
+        """Os primeiros `chars` caracteres (ex: o cabeçalho de um vídeo consolidado)."""
+        taken = []
+        size = 0
+        for chunk in self.chunks():
+            taken.append(chunk[:chars - size])
+            size += len(taken[-1])
+            if size >= chars:
+                break
+        return ''.join(taken)
+
+    def read(self):
+        """O texto inteiro numa string (só onde ele é realmente necessário, ex: map-reduce)."""
+        return ''.join(self.chunks())
+
+    def copy_to(self, handle):
+        """Copia o texto (UTF-8) para um arquivo aberto em modo binário."""
+        for chunk in self.byte_chunks():
+            handle.write(chunk)
+
+    def close(self):
+        """Descarta o texto e apaga o arquivo temporário."""
+        self.finish()
+        self.parts = []
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        # Enviado a outro processo: a escrita termina aqui e o estimador não vai junto
+        self.finish()
+        state = dict(self.__dict__)
+        state["_handle"] = None
+        state["count_tokens"] = None
+        return state
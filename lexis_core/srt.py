@@ -0,0 +1,420 @@
+"""
+MÓDULO: lexis_core.srt
+DESCRIÇÃO:
+    Parser de legendas .srt em passada única, orientado a linhas, compartilhado
+    pelo lexis.py (process_srt_content) e pelo lexis-join.py (clean_srt_content).
+
+    iter_cues() é um gerador que consome um arquivo aberto, uma string ou qualquer
+    iterável de linhas e produz objetos Cue(index, start, end, text) sem montar a
+    lista completa de blocos em memória. O arquivo é lido em pedaços e dividido em
+    blocos nas linhas em branco (str.split, em C); blocos bem formados são
+    interpretados direto e só os malformados passam pela máquina de estados linha
+    a linha, o que mantém o custo em Python proporcional ao número de blocos. Tolera:
+    - BOM UTF-8 e quebras de linha CRLF/CR;
+    - blocos sem número de índice ou com índice inválido;
+    - blocos sem linha em branco separadora (um novo timestamp fecha o bloco anterior);
+    - lixo entre blocos (linhas que não formam um bloco válido são ignoradas).
+
+    O texto limpo também pode sair em pedaços (iter_clean_chunks, iter_transcript_chunks):
+    legendas de lives de várias horas são limpas e gravadas aos poucos, sem montar o
+    texto inteiro nem listas de linhas/sentenças, e o pico de memória não depende do
+    tamanho do arquivo.
+
+    iter_timed_sentences + iter_overlap_windows fazem o mesmo agrupamento em parágrafos
+    do process_srt_content em streaming, guardando o tempo de cada sentença (exportação
+    de trechos para RAG do lexis.py).
+"""
+import re
+from collections import namedtuple
+from itertools import islice
+
+Cue = namedtuple('Cue', ['index', 'start', 'end', 'text'])
+
+REGEX_TIMING = re.compile(
+    r'^\s*(\d{1,2}:\d{2}:\d{2}[,.]\d{1,3})\s*-->\s*(\d{1,2}:\d{2}:\d{2}[,.]\d{1,3})'
+)
+REGEX_TAGS = re.compile(r'<[^>]*>')
+REGEX_SENTENCE_SPLIT = re.compile(r'(?<=[.!?]) +')
+
+_SEEK, _INDEX, _TEXT = range(3)
+
+
+READ_CHUNK_CHARS = 1 << 20
+# Linhas/trechos de legenda por pedaço do texto limpo gerado em streaming (~64 KB)
+TEXT_CHUNK_PIECES = 2048
+
+
+def _cue_text(text, tags_sub=REGEX_TAGS.sub):
+    if '<' in text:
+        text = tags_sub('', text)
+    return text.strip()
+
+
+def _iter_chunks(source, chunk_chars=READ_CHUNK_CHARS):
+    """Normaliza a origem (string, arquivo ou iterável de linhas) em pedaços de texto."""
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_chars)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        buffer = []
+        size = 0
+        for line in source:
+            buffer.append(line if line.endswith('\n') else line + '\n')
+            size += len(line)
+            if size >= chunk_chars:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer)
+
+
+def _iter_blocks(source):
+    """
+    Divide a origem em blocos separados por linha em branco, lendo em pedaços.
+    Normaliza BOM e CRLF/CR; o resto incompleto de cada pedaço é levado ao próximo.
+    """
+    carry = ''
+    first = True
+    for chunk in _iter_chunks(source):
+        if first:
+            chunk = chunk.lstrip('\ufeff')
+            first = False
+        data = carry + chunk
+        # Um '\r' no fim do pedaço pode ser metade de um CRLF: espera o próximo pedaço
+        if data.endswith('\r'):
+            data, tail = data[:-1], '\r'
+        else:
+            tail = ''
+        if '\r' in data:
+            data = data.replace('\r\n', '\n').replace('\r', '\n')
+        blocks = data.split('\n\n')
+        carry = blocks.pop() + tail
+        yield from blocks
+    if carry:
+        yield carry.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _iter_cues_lines(lines):
+    """
+    Máquina de estados linha a linha, usada nos blocos malformados
+    (sem índice, sem linha em branco separadora, com lixo no meio).
+    """
+    state = _SEEK
+    index = start = end = None
+    text_lines = []
+    pending_index = None
+
+    for line in lines:
+        if state == _TEXT:
+            if not line or line.isspace():
+                text = _cue_text('\n'.join(text_lines))
+                if text:
+                    yield Cue(index, start, end, text)
+                state = _SEEK
+                text_lines = []
+                continue
+            timing = REGEX_TIMING.match(line) if '-->' in line else None
+            if timing:
+                # Bloco sem linha em branco separadora: fecha o atual.
+                # Se a linha anterior era só o índice do próximo bloco, ela não é texto.
+                next_index = None
+                if text_lines and text_lines[-1].strip().isdigit():
+                    next_index = int(text_lines.pop().strip())
+                text = _cue_text('\n'.join(text_lines))
+                if text:
+                    yield Cue(index, start, end, text)
+                index, start, end = next_index, timing.group(1), timing.group(2)
+                text_lines = []
+                continue
+            text_lines.append(line)
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            state = _SEEK
+            pending_index = None
+            continue
+
+        timing = REGEX_TIMING.match(line) if '-->' in line else None
+        if timing:
+            index = pending_index if state == _INDEX else None
+            start, end = timing.group(1), timing.group(2)
+            state = _TEXT
+            text_lines = []
+            pending_index = None
+            continue
+
+        if state == _SEEK and stripped.isdigit():
+            pending_index = int(stripped)
+            state = _INDEX
+            continue
+
+        # Linha inesperada (lixo ou índice sem timestamp): descarta até o próximo bloco
+        state = _SEEK
+        pending_index = None
+
+    if state == _TEXT:
+        text = _cue_text('\n'.join(text_lines))
+        if text:
+            yield Cue(index, start, end, text)
+
+
+def iter_cues(source):
+    """Gera Cue(index, start, end, text) a partir de um arquivo/string/iterável de linhas .srt."""
+    timing_match = REGEX_TIMING.match
+    tags_sub = REGEX_TAGS.sub
+    for block in _iter_blocks(source):
+        # Caminho rápido: "índice\ntiming\ntexto" bem formado
+        head, _, rest = block.partition('\n')
+        if head.isdigit():
+            timing_line, _, text = rest.partition('\n')
+            timing = timing_match(timing_line)
+            if timing is not None and '-->' not in text:
+                if '<' in text:
+                    text = tags_sub('', text)
+                text = text.strip()
+                if text:
+                    yield Cue(int(head), timing.group(1), timing.group(2), text)
+                continue
+
+        # Bloco vazio (linhas em branco extras) ou malformado: resolve linha a linha
+        if block.strip():
+            yield from _iter_cues_lines(block.split('\n'))
+
+
+MIN_OVERLAP_WORDS = 2
+
+
+def overlap_length(prev_words, curr_words):
+    """
+    Maior k tal que as k últimas palavras de prev_words == as k primeiras de curr_words.
+    Usa a função prefixo do KMP sobre tokens: O(len(prev) + len(curr)), sem retrocesso.
+    """
+    if not prev_words or not curr_words:
+        return 0
+    # A sobreposição nunca passa do tamanho do bloco atual
+    tail = prev_words[-len(curr_words):]
+    pattern = curr_words[:len(tail)]
+    size = len(pattern)
+
+    failure = [0] * size
+    k = 0
+    for i in range(1, size):
+        word = pattern[i]
+        while k and word != pattern[k]:
+            k = failure[k - 1]
+        if word == pattern[k]:
+            k += 1
+        failure[i] = k
+
+    # Passa o final do bloco anterior pelo autômato: k termina como o maior sufixo que é prefixo
+    k = 0
+    for word in tail:
+        while k and (k == size or word != pattern[k]):
+            k = failure[k - 1]
+        if word == pattern[k]:
+            k += 1
+    return k
+
+
+def _rollup_new_words(texts, stats=None, min_overlap=MIN_OVERLAP_WORDS):
+    """Núcleo do dedup_rollup: as palavras inéditas de cada bloco não vazio (lista vazia se nenhuma)."""
+    prev_words = None
+    kept = removed = 0
+    for curr_text in texts:
+        curr_words = curr_text.split()
+        if not curr_words:
+            continue
+        k = overlap_length(prev_words, curr_words) if prev_words else 0
+        if k < min_overlap and k != len(prev_words or ()) and k != len(curr_words):
+            k = 0
+        prev_words = curr_words
+        removed += k
+        kept += len(curr_words) - k
+        yield curr_words[k:]
+
+    if stats is not None:
+        stats["words_kept"] = stats.get("words_kept", 0) + kept
+        stats["words_removed"] = stats.get("words_removed", 0) + removed
+
+
+def dedup_rollup(texts, stats=None, min_overlap=MIN_OVERLAP_WORDS):
+    """
+    Desduplica o efeito de "roll-up" automático das legendas do YouTube.
+    - O Youtube envia blocos encadeados tipo:
+      Bloco N: "Palavra 1"
+      Bloco N+1: "Palavra 1 \\n Palavra 2", etc.
+    - Para cada bloco, remove a maior sobreposição em palavras entre o fim do bloco
+      anterior e o início do atual (inclusive sobreposições parciais de linha) e gera
+      só as palavras inéditas, em tempo linear no total de palavras.
+
+    Sobreposições menores que min_overlap palavras só são removidas quando cobrem o
+    bloco anterior ou o atual inteiro, para não apagar repetições legítimas ("não, não").
+    Se stats (dict) for informado, acumula "words_kept" e "words_removed".
+    """
+    for words in _rollup_new_words(texts, stats, min_overlap):
+        if words:
+            yield ' '.join(words)
+
+
+def dedup_cues(cues, stats=None, min_overlap=MIN_OVERLAP_WORDS):
+    """dedup_rollup preservando os tempos: gera os Cue com só as palavras inéditas no texto."""
+    current = None
+
+    def texts():
+        nonlocal current
+        for cue in cues:
+            current = cue
+            yield cue.text
+
+    for words in _rollup_new_words(texts(), stats, min_overlap):
+        if words:
+            yield current._replace(text=' '.join(words))
+
+
+def dedup_ratio(stats):
+    """Razão palavras removidas / palavras mantidas de um dict de stats do dedup_rollup."""
+    kept = stats.get("words_kept", 0)
+    return stats.get("words_removed", 0) / kept if kept else 0.0
+
+
+def join_chunks(pieces, chunk_pieces=TEXT_CHUNK_PIECES):
+    """
+    ' '.join(pieces) em pedaços de chunk_pieces peças: ''.join(join_chunks(p)) == ' '.join(p).
+    Os pedaços sempre quebram no espaço entre duas peças, nunca no meio de uma palavra.
+    """
+    pieces = iter(pieces)
+    batch = list(islice(pieces, chunk_pieces))
+    separator = ''
+    while batch:
+        yield separator + ' '.join(batch)
+        separator = ' '
+        batch = list(islice(pieces, chunk_pieces))
+
+
+def iter_clean_chunks(source, stats=None):
+    """clean_srt_content em pedaços (streaming); stats só é preenchido ao fim da iteração."""
+    return join_chunks(dedup_rollup((cue.text for cue in iter_cues(source)), stats))
+
+
+def measure_chunks(chunks, lengths, key):
+    """Repassa os pedaços de um texto somando o tamanho dele (em caracteres) em lengths[key]."""
+    lengths[key] = 0
+    for chunk in chunks:
+        lengths[key] += len(chunk)
+        yield chunk
+
+
+def clean_srt_content(source, stats=None):
+    """
+    Remove formatações HTML, limpa timestamps e desduplica linhas repetitivas
+    decorrentes do efeito de "roll-up" automático de legendas do YouTube.
+    Aceita a string do arquivo ou o próprio arquivo aberto (streaming).
+    stats (dict opcional) recebe as contagens de palavras do dedup (ver dedup_rollup).
+    """
+    return ''.join(iter_clean_chunks(source, stats))
+
+
+def _transcript_lines(source):
+    for cue in iter_cues(source):
+        text = cue.text
+        if '\n' not in text:
+            # _cue_text já tirou os espaços das pontas
+            yield text
+            continue
+        for line in text.split('\n'):
+            line = line.strip()
+            if line:
+                yield line
+
+
+def iter_transcript_chunks(source):
+    """
+    Texto corrido do process_srt_content (linhas não vazias de todos os blocos, unidas por
+    espaço, sem o dedup de roll-up) em pedaços, a partir de um arquivo aberto ou string.
+    """
+    return join_chunks(_transcript_lines(source))
+
+
+def iter_overlap_windows(items, size=12, overlap=2):
+    """
+    Janelas de `size` itens consecutivos, cada uma repetindo os `overlap` últimos itens da
+    anterior (o agrupamento em parágrafos do process_srt_content), sem montar a lista de itens.
+    A última janela é menor quando sobram itens; itens já cobertos não geram janela extra.
+    """
+    if not 0 <= overlap < size:
+        raise ValueError(f"overlap ({overlap}) deve ser >= 0 e menor que size ({size})")
+    step = size - overlap
+    window = []
+    fresh = 0
+    for item in items:
+        window.append(item)
+        fresh += 1
+        if len(window) == size:
+            yield list(window)
+            del window[:step]
+            fresh = 0
+    if fresh:
+        yield window
+
+
+def iter_timed_sentences(cues, max_sentence_chars=None):
+    """
+    Sentenças do texto corrido do process_srt_content com o tempo dos blocos da legenda:
+    gera (sentença, início, fim), com o início do bloco onde a sentença começa e o fim do
+    bloco onde ela termina (timestamps do .srt, ex: '00:01:02,500').
+    Com max_sentence_chars, uma sentença que já passou desse tamanho também termina no fim
+    de um bloco (legendas automáticas quase não têm pontuação).
+    `cues` são os blocos do iter_cues (ou do dedup_cues, sem as repetições do roll-up).
+    """
+    split = REGEX_SENTENCE_SPLIT.split
+    parts = []
+    length = 0
+    start = None
+    for cue in cues:
+        for line in cue.text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            pieces = split(line)
+            if start is None:
+                start = cue.start
+            for piece in pieces[:-1]:
+                parts.append(piece)
+                yield ' '.join(parts), start, cue.end
+                parts = []
+                length = 0
+                start = cue.start
+            parts.append(pieces[-1])
+            length += len(pieces[-1]) + 1
+            if line[-1] in '.!?' or (max_sentence_chars and length > max_sentence_chars):
+                yield ' '.join(parts), start, cue.end
+                parts = []
+                length = 0
+                start = None
+    if parts:
+        yield ' '.join(parts), start, cue.end
+
+
+def process_srt_content(content, overlap_sentences=2):
+    """
+    Limpa o conteúdo do SRT, removendo timestamps e formatando.
+    Retorna (texto_formatado_rag, texto_completo_limpo)
+    """
+    # 1. Limpeza de metadados do SRT (timestamps, números, tags) via parser de blocos.
+    # As linhas de todos os blocos são unidas por espaço, descartando linhas vazias.
+    full_text = ''.join(iter_transcript_chunks(content))
+
+    # 2. Divisão em sentenças e agrupamento com Overlap (para RAG, opcional aqui mas mantido)
+    sentences = REGEX_SENTENCE_SPLIT.split(full_text)
+    chunk_size = 12
+    paragraphs = [" ".join(chunk) for chunk in iter_overlap_windows(sentences, chunk_size, overlap_sentences)]
+
+    # Retorna o texto formatado em parágrafos e o texto corrido limpo
+    return "\n\n".join(paragraphs), full_text
@@ -0,0 +1,470 @@
+"""
+MÓDULO: lexis_core.standin
+DESCRIÇÃO:
+    Servidor HTTP local que imita os endpoints do Gemini (API "mldev" v1beta) usados
+    pelo Lexis, para testar o modo --batch sem gastar cota nem depender de rede.
+
+    Endpoints emulados:
+    - POST /upload/v1beta/files               upload resumível (start + "upload, finalize")
+    - GET  /v1beta/files/{id}:download        download do arquivo de resultados
+    - POST /v1beta/models/{model}:batchGenerateContent   cria o job (arquivo JSONL ou inline)
+    - GET  /v1beta/batches/{id}               estado do job
+    - POST /v1beta/batches/{id}:cancel        cancela o job
+    - POST /v1beta/models/{model}:generateContent        resposta síncrona (texto ou JSON)
+    - POST /v1beta/models/{model}:countTokens            contagem de tokens sintética
+
+    - GET  /stats                              contadores do servidor (não existe no Gemini)
+
+    Os jobs ficam PENDING por `job_delay` segundos e então são "processados":
+    cada pedido recebe um resumo sintético determinístico.
+
+    Para testes de carga (benchmarks/bench_api_load.py), o generateContent aceita
+    falhas e latência injetadas (FaultProfile): latência sorteada de uma
+    distribuição, frações de respostas 429 e 500 e uma cota de RPM/TPM em janela
+    deslizante de 60 s, que responde 429 RESOURCE_EXHAUSTED como a API real. Os
+    tokens de cada tentativa são contabilizados em /stats, separando os atendidos
+    dos gastos em tentativas rejeitadas.
+
+USO:
+    python -m lexis_core.standin --port 8765 --job-delay 5
+    python -m lexis_core.standin --latency lognormal:0.8,0.5 --error-429 0.05 --error-500 0.01 --rpm 300
+    # e no .env do lexis:  GEMINI_BASE_URL=http://127.0.0.1:8765
+"""
+import argparse
+import collections
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lexis_core.shortpack import PACK_MARKER
+
+REGEX_BATCH_CREATE = re.compile(r'^/v1beta/models/([^/:]+):batchGenerateContent$')
+REGEX_GENERATE = re.compile(r'^/v1beta/models/([^/:]+):generateContent$')
+REGEX_COUNT_TOKENS = re.compile(r'^/v1beta/models/([^/:]+):countTokens$')
+REGEX_BATCH = re.compile(r'^/v1beta/batches/([^/:]+)(:cancel)?$')
+REGEX_DOWNLOAD = re.compile(r'^/(?:download/)?v1beta/files/([^/:]+):download$')
+REGEX_UPLOAD_SESSION = re.compile(r'^/upload-session/(\d+)$')
+
+
+REGEX_FAKE_TOKEN = re.compile(r'\w+|[^\w\s]')
+FILLER_WORDS = "o vídeo trata de fé graça e vida com exemplos".split()
+REGEX_PACK_KEY = re.compile(rf'^\s*{re.escape(PACK_MARKER)}(\S+)', re.MULTILINE)
+
+
+def fake_token_count(text):
+    """
+    Contagem sintética e determinística, com o mesmo perfil de um tokenizador real:
+    uma peça por palavra/símbolo, palavras longas divididas a cada 6 letras, um token por dígito.
+    """
+    count = 0
+    for piece in REGEX_FAKE_TOKEN.findall(text):
+        count += len(piece) if piece.isdigit() else 1 + (len(piece) - 1) // 6
+    return max(1, count)
+
+
+def parse_latency(spec):
+    """
+    Distribuição de latência (segundos) a partir de uma especificação de texto:
+        "0.2" ou "fixed:0.2"      constante
+        "uniform:0.1,0.5"         uniforme entre os dois valores
+        "normal:0.5,0.1"          média e desvio (truncada em 0)
+        "lognormal:0.8,0.5"       mediana e sigma (cauda longa, como APIs reais)
+        "exp:0.5"                 exponencial com essa média
+    Retorna uma função rng -> segundos. Levanta ValueError em especificação inválida.
+    """
+    kind, _, params = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+    arity = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+    try:
+        values = [float(value) for value in params.split(",") if value.strip()]
+    except ValueError:
+        values = None
+    if kind not in arity or not values or len(values) != arity[kind] or any(value < 0 for value in values):
+        raise ValueError(f"Latência inválida: {spec!r} (ex: 0.2, uniform:0.1,0.5, lognormal:0.8,0.5, exp:0.5)")
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        mu = math.log(values[0]) if values[0] > 0 else -math.inf
+        return lambda rng: rng.lognormvariate(mu, values[1]) if values[0] > 0 else 0.0
+    return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+
+
+class QuotaWindow:
+    """Cota de requisições/min e tokens/min em janela deslizante (None desativa cada limite)."""
+
+    def __init__(self, rpm=None, tpm=None, window=60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.events = collections.deque()   # (instante, tokens) das requisições aceitas
+        self.tokens = 0
+
+    def admit(self, tokens, now=None):
+        """Registra a requisição se ela couber na cota; retorna False (429) se não couber."""
+        now = time.monotonic() if now is None else now
+        while self.events and self.events[0][0] <= now - self.window:
+            self.tokens -= self.events.popleft()[1]
+        if self.rpm and len(self.events) + 1 > self.rpm:
+            return False
+        if self.tpm and self.events and self.tokens + tokens > self.tpm:
+            return False
+        self.events.append((now, tokens))
+        self.tokens += tokens
+        return True
+
+
+class FaultProfile:
+    """
+    Comportamento injetado no generateContent. decide() sorteia o desfecho de uma tentativa:
+    (status HTTP, segundos de espera antes de responder). 200 = sucesso.
+    """
+
+    def __init__(self, latency="0", error_429=0.0, error_500=0.0, rpm=None, tpm=None,
+                 retry_delay=None, output_tokens=0, seed=None):
+        self.latency = parse_latency(latency)
+        self.error_429 = error_429
+        self.error_500 = error_500
+        self.quota = QuotaWindow(rpm, tpm) if (rpm or tpm) else None
+        self.retry_delay = retry_delay
+        self.output_tokens = output_tokens
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def decide(self, tokens):
+        with self.lock:
+            if self.quota and not self.quota.admit(tokens):
+                return 429, 0.0
+            roll = self.rng.random()
+            delay = self.latency(self.rng)
+        if roll < self.error_429:
+            # Rejeição rápida, como a cota da API real
+            return 429, 0.0
+        if roll < self.error_429 + self.error_500:
+            return 500, delay
+        return 200, delay
+
+
+def fake_response(prompt, config=None, output_tokens=0):
+    """
+    Resposta sintética no formato GenerateContentResponse (texto + usageMetadata).
+    Pedidos com saída JSON (grupos do --pack-shorts) recebem uma lista com um resumo por
+    vídeo marcado no prompt.
+    """
+    prompt_tokens = fake_token_count(prompt)
+    text = f"Resumo simulado pelo servidor local ({len(prompt)} caracteres de entrada)."
+    if output_tokens:
+        # Resposta do tamanho de um resumo real (uma palavra curta ≈ um token)
+        text += " " + " ".join(itertools.islice(itertools.cycle(FILLER_WORDS), output_tokens))
+    if (config or {}).get("responseMimeType") == "application/json":
+        text = json.dumps([
+            {"id": key, "resumo": f"Resumo simulado do vídeo {key} pelo servidor local."}
+            for key in REGEX_PACK_KEY.findall(prompt)
+        ], ensure_ascii=False)
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": text}]},
+            "finishReason": "STOP",
+        }],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": fake_token_count(text),
+            "totalTokenCount": prompt_tokens + fake_token_count(text),
+        },
+    }
+
+
+def _prompt_text(request):
+    return "".join(
+        part.get("text", "")
+        for content in request.get("contents") or []
+        for part in content.get("parts") or []
+    )
+
+
+STAT_KEYS = ("requests", "ok", "rate_limited", "server_errors", "prompt_tokens", "output_tokens",
+             "rejected_prompt_tokens")
+
+
+class StandInState:
+    """Armazenamento em memória de arquivos, sessões de upload e jobs, e contadores do /stats."""
+
+    def __init__(self, job_delay=2.0, faults=None):
+        self.job_delay = job_delay
+        self.faults = faults or FaultProfile()
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.files = {}      # id -> bytes
+        self.sessions = {}   # id -> metadados do upload
+        self.jobs = {}       # id -> dict do job
+        # Tentativas do generateContent: atendidas, 429, 500 e tokens (atendidos / rejeitados)
+        self.stats = dict.fromkeys(STAT_KEYS, 0)
+
+    def count(self, **deltas):
+        with self.lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def new_id(self):
+        return str(next(self.ids))
+
+    def job_payload(self, job_id):
+        job = self.jobs[job_id]
+        if job["state"] == "BATCH_STATE_PENDING" and time.time() - job["created"] >= self.job_delay:
+            self._run_job(job)
+        metadata = {
+            "@type": "type.googleapis.com/google.ai.generativelanguage.v1main.GenerateContentBatch",
+            "model": f"models/{job['model']}",
+            "displayName": job["display_name"],
+            "state": job["state"],
+        }
+        if job.get("output"):
+            metadata["output"] = job["output"]
+        return {"name": f"batches/{job_id}", "metadata": metadata, "done": job["state"] != "BATCH_STATE_PENDING"}
+
+    def _run_job(self, job):
+        lines = []
+        inline = []
+        for entry in job["entries"]:
+            response = fake_response(_prompt_text(entry["request"]))
+            if job["inline"]:
+                inline.append({"response": response, "metadata": entry.get("metadata") or {}})
+            else:
+                lines.append(json.dumps({"key": entry.get("key"), "response": response}, ensure_ascii=False))
+        if job["inline"]:
+            job["output"] = {"inlinedResponses": {"inlinedResponses": inline}}
+        else:
+            file_id = "out" + self.new_id()
+            self.files[file_id] = ("\n".join(lines) + "\n").encode('utf-8')
+            job["output"] = {"responsesFile": f"files/{file_id}"}
+        job["state"] = "BATCH_STATE_SUCCEEDED"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "LexisStandIn/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status, payload=None, raw=None, headers=None):
+        data = raw if raw is not None else json.dumps(payload or {}, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Type', 'application/json' if raw is None else 'application/octet-stream')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, message, reason="NOT_FOUND"):
+        self._send(status, {"error": {"code": status, "message": message, "status": reason}})
+
+    def do_POST(self):
+        path = self.path.split('?', 1)[0]
+        body = self._body()
+        state = self.state
+
+        if path == '/upload/v1beta/files' and self.headers.get('X-Goog-Upload-Command') == 'start':
+            with state.lock:
+                session_id = state.new_id()
+                state.sessions[session_id] = json.loads(body or b"{}").get("file", {})
+            host = self.headers.get('Host')
+            self._send(200, {}, headers={
+                'X-Goog-Upload-URL': f"http://{host}/upload-session/{session_id}",
+                'X-Goog-Upload-Status': 'active',
+            })
+            return
+
+        match = REGEX_UPLOAD_SESSION.match(path)
+        if match:
+            with state.lock:
+                meta = state.sessions.pop(match.group(1), None)
+                if meta is None:
+                    return self._error(404, "Sessão de upload desconhecida")
+                file_id = state.new_id()
+                state.files[file_id] = body
+            self._send(200, {"file": {
+                "name": f"files/{file_id}",
+                "displayName": meta.get("display_name", ""),
+                "mimeType": meta.get("mime_type", "application/octet-stream"),
+                "sizeBytes": str(len(body)),
+                "state": "ACTIVE",
+            }}, headers={'X-Goog-Upload-Status': 'final'})
+            return
+
+        match = REGEX_BATCH_CREATE.match(path)
+        if match:
+            batch = json.loads(body or b"{}").get("batch", {})
+            input_config = batch.get("inputConfig", {})
+            with state.lock:
+                if "fileName" in input_config:
+                    file_id = input_config["fileName"].split('/', 1)[-1]
+                    if file_id not in state.files:
+                        return self._error(400, "Arquivo de entrada inexistente", "INVALID_ARGUMENT")
+                    lines = state.files[file_id].decode('utf-8').splitlines()
+                    entries = [json.loads(line) for line in lines if line.strip()]
+                    inline = False
+                else:
+                    entries = input_config.get("requests", {}).get("requests", [])
+                    inline = True
+                job_id = state.new_id()
+                state.jobs[job_id] = {
+                    "model": match.group(1), "display_name": batch.get("displayName", ""),
+                    "entries": entries, "inline": inline,
+                    "state": "BATCH_STATE_PENDING", "created": time.time(),
+                }
+                payload = state.job_payload(job_id)
+            self._send(200, payload)
+            return
+
+        match = REGEX_BATCH.match(path)
+        if match and match.group(2):
+            with state.lock:
+                job = state.jobs.get(match.group(1))
+                if job is None:
+                    return self._error(404, "Job inexistente")
+                if job["state"] == "BATCH_STATE_PENDING":
+                    job["state"] = "BATCH_STATE_CANCELLED"
+            self._send(200, {})
+            return
+
+        match = REGEX_GENERATE.match(path)
+        if match:
+            request = json.loads(body or b"{}")
+            prompt = _prompt_text(request)
+            tokens = fake_token_count(prompt)
+            faults = state.faults
+            status, delay = faults.decide(tokens)
+            if delay:
+                time.sleep(delay)
+            if status == 429:
+                state.count(requests=1, rate_limited=1, rejected_prompt_tokens=tokens)
+                details = []
+                if faults.retry_delay is not None:
+                    details.append({"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                                    "retryDelay": f"{faults.retry_delay:g}s"})
+                self._send(429, {"error": {"code": 429, "message": "Cota do servidor local excedida",
+                                           "status": "RESOURCE_EXHAUSTED", "details": details}})
+                return
+            if status == 500:
+                state.count(requests=1, server_errors=1, rejected_prompt_tokens=tokens)
+                return self._error(500, "Falha injetada pelo servidor local", "INTERNAL")
+            response = fake_response(prompt, request.get("generationConfig"), faults.output_tokens)
+            usage = response["usageMetadata"]
+            state.count(requests=1, ok=1, prompt_tokens=usage["promptTokenCount"],
+                        output_tokens=usage["candidatesTokenCount"])
+            self._send(200, response)
+            return
+
+        match = REGEX_COUNT_TOKENS.match(path)
+        if match:
+            self._send(200, {"totalTokens": fake_token_count(_prompt_text(json.loads(body or b"{}")))})
+            return
+
+        self._error(404, f"Endpoint não emulado: POST {path}")
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        state = self.state
+
+        if path == '/stats':
+            self._send(200, state.snapshot())
+            return
+
+        match = REGEX_BATCH.match(path)
+        if match and not match.group(2):
+            with state.lock:
+                if match.group(1) not in state.jobs:
+                    return self._error(404, "Job inexistente")
+                payload = state.job_payload(match.group(1))
+            self._send(200, payload)
+            return
+
+        match = REGEX_DOWNLOAD.match(path)
+        if match:
+            with state.lock:
+                data = state.files.get(match.group(1))
+            if data is None:
+                return self._error(404, "Arquivo inexistente")
+            self._send(200, raw=data)
+            return
+
+        self._error(404, f"Endpoint não emulado: GET {path}")
+
+
+def make_server(host="127.0.0.1", port=8765, job_delay=2.0, verbose=False, faults=None):
+    """
+    Cria (sem iniciar) o servidor. Use port=0 para uma porta livre (server.server_address).
+    `faults` (FaultProfile) injeta latência/falhas no generateContent.
+    """
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.state = StandInState(job_delay=job_delay, faults=faults)
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que imita os endpoints do Gemini usados pelo Lexis.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--job-delay", type=float, default=2.0,
+                        help="Segundos que cada job de batch fica pendente (default: 2).")
+    parser.add_argument("--latency", default="0",
+                        help="Latência do generateContent: 0.2, uniform:A,B, normal:MÉDIA,DESVIO, "
+                             "lognormal:MEDIANA,SIGMA ou exp:MÉDIA (default: 0).")
+    parser.add_argument("--error-429", type=float, default=0.0,
+                        help="Fração das chamadas respondidas com 429 RESOURCE_EXHAUSTED (default: 0).")
+    parser.add_argument("--error-500", type=float, default=0.0,
+                        help="Fração das chamadas respondidas com 500 INTERNAL (default: 0).")
+    parser.add_argument("--rpm", type=int, default=None,
+                        help="Cota de requisições/min do servidor (429 acima dela).")
+    parser.add_argument("--tpm", type=int, default=None,
+                        help="Cota de tokens de entrada/min do servidor (429 acima dela).")
+    parser.add_argument("--retry-delay", type=float, default=None,
+                        help="retryDelay (s) sugerido nas respostas 429, como a API real (default: omitido).")
+    parser.add_argument("--output-tokens", type=int, default=0,
+                        help="Tamanho aproximado das respostas em tokens (default: resposta curta).")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do sorteio de latência/falhas.")
+    parser.add_argument("--verbose", action="store_true", help="Loga cada requisição.")
+    args = parser.parse_args(argv)
+    if not 0 <= args.error_429 + args.error_500 <= 1:
+        parser.error("--error-429 + --error-500 deve ficar entre 0 e 1.")
+    try:
+        faults = FaultProfile(args.latency, args.error_429, args.error_500, args.rpm, args.tpm,
+                              args.retry_delay, args.output_tokens, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = make_server(args.host, args.port, args.job_delay, args.verbose, faults)
+    print(f"Servidor stand-in do Gemini em http://{args.host}:{server.server_address[1]} (Ctrl+C para sair)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1540 @@
+"""
+MÓDULO: lexis_core.summarize (comando `lexis`, ou `python lexis.py`)
+DESCRIÇÃO:
+    Este script processa arquivos de legenda (.srt) no diretório atual.
+    Ele realiza as seguintes etapas para cada arquivo:
+    1. Limpa o texto, removendo timestamps e formatações.
+    2. Extrai metadados do arquivo .info.json correspondente (se existir).
+    3. Utiliza a API do Google Gemini para gerar um resumo executivo do conteúdo.
+    4. Salva o resultado (Metadados + Resumo + Transcrição Limpa) em um arquivo .txt.
+    5. Arquiva o arquivo .srt original na pasta 'arquive' para evitar reprocessamento
+       (ou, com --archive-mode pack, num pacote zip indexado em archive/: lexis_core.archive).
+
+USO:
+    Execute o script na pasta contendo os arquivos .srt.
+    Certifique-se de ter o arquivo .env configurado com a GEMINI_API_KEY.
+
+    Importar este módulo não carrega o SDK do Gemini nem abre o cache: o cliente
+    e o cache são criados no primeiro uso (lexis_core.lazy), e a chave da API só
+    é exigida pelos modos que chamam a API.
+"""
+import os
+import sys
+import time
+import glob
+import shutil
+import signal
+import asyncio
+import argparse
+import threading
+import contextvars
+import concurrent.futures
+
+from lexis_core.batch import (
+    TERMINAL_STATES, BatchState, download_results, refresh_job, submit_job, write_requests_jsonl
+)
+from lexis_core.cache import SummaryCache, make_summary_key_stream
+from lexis_core.chunking import split_for_map_reduce
+from lexis_core.gemini import has_api_key, make_client
+from lexis_core.lazy import Lazy
+from lexis_core.metadata import INFO_SUFFIX, candidate_stems, get_index, save_indexes, video_metadata
+from lexis_core.ratelimit import (
+    AIMDController, RateLimiter, backoff_delay, is_rate_limited, is_retryable
+)
+from lexis_core.neardup import (
+    DEFAULT_LANGUAGE_PREFERENCE, DEFAULT_THRESHOLD, find_duplicates, parse_language_preference, transcript_signature
+)
+from lexis_core.rag import DEFAULT_CHUNK_SENTENCES, DEFAULT_OVERLAP_SENTENCES, chunk_records, write_records
+from lexis_core.report import RunReport
+from lexis_core.scan import DEFAULT_SCAN_THREADS, prime_metadata, scan_tree
+from lexis_core.settings import ENV_PATH, HOME_DIR
+from lexis_core.shortpack import PACK_CONFIG, ShortPacker, format_pack_videos, pack_keys, parse_pack_response
+from lexis_core.spool import SpooledText
+# Parser de legendas compartilhado com o lexis-join (streaming, tolerante a CRLF/BOM)
+from lexis_core.srt import REGEX_SENTENCE_SPLIT, iter_clean_chunks, iter_transcript_chunks, measure_chunks
+from lexis_core.tokens import CALIBRATION_FILENAME, TokenEstimator
+from lexis_core.watch import PendingFiles, open_watcher
+
+# --- CONFIGURAÇÃO DA IA (ATUALIZADA) ---
+# GEMINI_API_KEY e o endpoint alternativo GEMINI_BASE_URL (ex: servidor local
+# `python -m lexis_core.standin`) vêm do .env em HOME_DIR ou do ambiente.
+# O cliente (e o import do SDK) só é criado na primeira chamada à API.
+client = Lazy(lambda: make_client(ENV_PATH))
+MODEL_ID = 'gemini-flash-latest'
+
+# --- CACHE DE RESUMOS ---
+# Cache persistente endereçado por conteúdo (hash da transcrição + modelo + prompt).
+# Evita pagar a API de novo por vídeos já resumidos que foram renomeados/movidos.
+CACHE_PATH = os.path.join(HOME_DIR, ".lexis_cache.sqlite3")
+CACHE_MAX_ENTRIES = 50000
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_MAX_AGE_DAYS = 365
+
+summary_cache = Lazy(lambda: SummaryCache(
+    CACHE_PATH,
+    max_entries=CACHE_MAX_ENTRIES,
+    max_bytes=CACHE_MAX_BYTES,
+    max_age_days=CACHE_MAX_AGE_DAYS
+))
+
+# --- ESTIMATIVA DE TOKENS ---
+# Estimador offline calibrado contra o count_tokens do Gemini (--calibrate-tokens).
+# Sem calibração usa coeficientes padrão conservadores.
+TOKEN_CALIBRATION_PATH = os.path.join(HOME_DIR, CALIBRATION_FILENAME)
+token_estimator = TokenEstimator.load(TOKEN_CALIBRATION_PATH, MODEL_ID)
+# Janela de contexto de entrada do modelo (teto para --prompt-tokens)
+MODEL_CONTEXT_TOKENS = 1048576
+# Arquivos e tamanhos (caracteres) dos trechos enviados ao count_tokens na calibração
+CALIBRATION_FILES = 20
+CALIBRATION_SLICES = (1000, 4000, 16000)
+
+# --- INSTRUMENTAÇÃO (--report) ---
+# Tempos por etapa, latência/retentativas/tokens da API. Desligado por padrão.
+run_report = RunReport()
+
+# Preço (US$ por 1M de tokens) usado no --dry-run e no --report. Confira a tabela
+# atual do modelo em https://ai.google.dev/pricing ao trocar MODEL_ID.
+PRICE_INPUT_PER_MTOK = 0.30
+PRICE_OUTPUT_PER_MTOK = 2.50
+# A Batch API cobra metade do preço das chamadas síncronas.
+BATCH_PRICE_FACTOR = 0.5
+
+# --- CONTROLE DE VAZÃO ---
+# Tentativas extras (com backoff exponencial + jitter) para 429/5xx antes de desistir.
+MAX_RETRIES = 5
+DEFAULT_WORKERS = 5
+# Estimativa de tokens de saída por resumo, usada para reservar cota de TPM.
+SUMMARY_OUTPUT_TOKENS = 800
+
+# Teto de chamadas generate_content simultâneas nos modos com threads (--workers, ver
+# set_api_concurrency): vale também para os trechos do map-reduce, que rodam num pool
+# único compartilhado por todos os arquivos em vez de um pool novo por arquivo.
+api_concurrency = DEFAULT_WORKERS
+api_slots = threading.BoundedSemaphore(DEFAULT_WORKERS)
+map_pool = Lazy(lambda: concurrent.futures.ThreadPoolExecutor(
+    max_workers=api_concurrency, thread_name_prefix="lexis-map"
+))
+
+# --- MODO WATCH ---
+# Segundos sem mudança de tamanho/mtime para considerar uma legenda completa, espera
+# máxima pelo .info.json e intervalo do polling (quando não há inotify).
+WATCH_SETTLE_SECONDS = 2.0
+WATCH_INFO_TIMEOUT = 30.0
+WATCH_POLL_SECONDS = 1.0
+# Espera máxima por eventos em cada volta do laço (também o ritmo das checagens de debounce)
+WATCH_TICK_SECONDS = 0.5
+
+# --- MODO BATCH ---
+# Intervalo entre consultas ao estado dos jobs quando --wait é usado.
+BATCH_POLL_SECONDS = 30
+
+PROMPT_TEMPLATE = """
+    Atue como um analista de conteúdo sênior. Abaixo está a transcrição de um vídeo.
+    Gere um resumo executivo de 3 parágrafos focando nos conceitos-chave, 
+    teologias mencionadas ou insights técnicos.
+    Este resumo será usado como metadado para um sistema de RAG (NotebookLM).
+    
+    Texto: {text}
+    """
+
+# Orçamento de tokens da transcrição num prompt simples (≈ os 10 mil caracteres de antes).
+# O texto é cortado nesse orçamento; --prompt-tokens o altera (até a janela de contexto).
+SINGLE_PASS_TOKENS = 2500
+prompt_token_budget = SINGLE_PASS_TOKENS
+
+# --- RESUMO HIERÁRQUICO (MAP-REDUCE) ---
+# Com --hierarchical, transcrições acima do orçamento do prompt não são truncadas:
+# cada trecho é resumido em paralelo (map) e os resumos parciais viram o resumo final (reduce).
+
+MAP_PROMPT_TEMPLATE = """
+    Abaixo está o trecho {index} de {total} da transcrição de um vídeo longo.
+    Resuma este trecho em até 2 parágrafos, preservando conceitos-chave, nomes,
+    teologias mencionadas ou insights técnicos. Não invente conteúdo de outros trechos.
+    
+    Trecho: {text}
+    """
+
+REDUCE_PROMPT_TEMPLATE = """
+    Atue como um analista de conteúdo sênior. Abaixo estão, em ordem, os resumos parciais
+    de trechos consecutivos da transcrição de um vídeo longo.
+    Gere um resumo executivo de 3 parágrafos focando nos conceitos-chave, 
+    teologias mencionadas ou insights técnicos do vídeo inteiro.
+    Este resumo será usado como metadado para um sistema de RAG (NotebookLM).
+    
+    Resumos parciais:
+    {text}
+    """
+
+# --- VÍDEOS CURTOS EM GRUPO (--pack-shorts) ---
+# Transcrições que cabem inteiras no prompt simples são agrupadas (até PACK_TOKENS tokens
+# e PACK_VIDEOS vídeos) numa só chamada com saída JSON, um resumo por vídeo.
+# A saída reservada no limitador de TPM cresce com o número de vídeos do grupo.
+DEFAULT_PACK_TOKENS = 8000
+DEFAULT_PACK_VIDEOS = 10
+
+# {videos} fica na coluna 0: cada marcador "### VÍDEO" abre a linha (o servidor local depende disso)
+PACK_PROMPT_TEMPLATE = """
+    Atue como um analista de conteúdo sênior. Abaixo estão as transcrições de {count} vídeos
+    curtos, cada uma precedida por uma linha "### VÍDEO <id>".
+    Para CADA vídeo, gere um resumo executivo de 3 parágrafos focando nos conceitos-chave,
+    teologias mencionadas ou insights técnicos daquele vídeo, sem misturar vídeos diferentes.
+    Cada resumo será usado como metadado para um sistema de RAG (NotebookLM).
+    Responda em JSON: uma lista com um objeto {{"id": "<id>", "resumo": "<resumo>"}} por vídeo,
+    com os mesmos ids e na mesma ordem.
+
+{videos}
+"""
+
+# Cores para o terminal
+class Colors:
+    HEADER = '\033[95m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    GREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+
+
+def estimate_prompt_tokens(prompt):
+    """Tokens de entrada estimados de um prompt (estimador offline, ver lexis_core.tokens)."""
+    return token_estimator.estimate(prompt)
+
+
+def estimate_request_tokens(prompt, output_tokens=SUMMARY_OUTPUT_TOKENS):
+    """Estimativa do custo de uma chamada em tokens/min (entrada + saída reservada)."""
+    return estimate_prompt_tokens(prompt) + output_tokens
+
+
+def _summary_request(transcript, hierarchical=False):
+    """
+    Prepara uma chamada de resumo para a transcrição (SpooledText, ver prepare_file).
+    Retorna (resumo_pronto, cache_key, chunks): se `resumo_pronto` não for None
+    (texto curto ou acerto de cache) nenhuma chamada à API é necessária.
+    `chunks` tem um único prompt (modo simples) ou os trechos do map-reduce.
+    Só o map-reduce precisa do texto inteiro na memória; o modo simples lê apenas
+    o começo que cabe no orçamento do prompt.
+    """
+    # Se o texto for muito curto, não gasta API
+    if transcript.chars < 50:
+        return "Texto muito curto para gerar resumo.", None, None
+
+    map_reduce = hierarchical and transcript.tokens > prompt_token_budget
+    template = MAP_PROMPT_TEMPLATE + REDUCE_PROMPT_TEMPLATE if map_reduce else PROMPT_TEMPLATE
+    if not map_reduce and prompt_token_budget != SINGLE_PASS_TOKENS:
+        # Outro orçamento = outro corte do texto = outro resumo
+        template += f"[prompt_tokens={prompt_token_budget}]"
+
+    # Consulta o cache antes de gastar API (chave = conteúdo, não nome do arquivo)
+    cache_key = make_summary_key_stream(transcript.byte_chunks(), transcript.bytes, MODEL_ID, template)
+    cached = summary_cache.get(cache_key)
+    if cached is not None:
+        return cached, cache_key, None
+
+    if map_reduce:
+        text = transcript.read()
+        sentences = REGEX_SENTENCE_SPLIT.split(text)
+        chunks = split_for_map_reduce(sentences, len(text))
+        if len(chunks) > 1:
+            return None, cache_key, chunks
+
+    # Limitando ao orçamento de tokens do prompt (corte em limite de palavra)
+    if transcript.tokens <= prompt_token_budget:
+        text = transcript.read()
+    else:
+        hint = "" if hierarchical else " (use --hierarchical para resumir o texto inteiro)"
+        print(f"{Colors.WARNING}⚠ Transcrição de ~{transcript.tokens} tokens truncada em {prompt_token_budget} "
+              f"tokens em vez de resumida por partes{hint}.{Colors.ENDC}", flush=True)
+        text = token_estimator.truncate_chunks(transcript.chunks(), prompt_token_budget)
+    return None, cache_key, [PROMPT_TEMPLATE.format(text=text)]
+
+
+def _map_prompts(chunks):
+    return [
+        MAP_PROMPT_TEMPLATE.format(index=i + 1, total=len(chunks), text=chunk)
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def _reduce_prompt(partials):
+    joined = "\n\n".join(f"[Trecho {i + 1}] {partial.strip()}" for i, partial in enumerate(partials))
+    return REDUCE_PROMPT_TEMPLATE.format(text=joined)
+
+
+def _record_call(response, attempt, attempt_start, call_start, ok=True):
+    """Registra no --report a latência, as retentativas e os tokens (usage_metadata) de uma chamada."""
+    now = time.perf_counter()
+    usage = getattr(response, "usage_metadata", None)
+    run_report.record_api(
+        now - attempt_start, attempt,
+        input_tokens=getattr(usage, "prompt_token_count", None),
+        output_tokens=getattr(usage, "candidates_token_count", None),
+        ok=ok, elapsed=now - call_start
+    )
+
+
+def _generate(prompt, limiter=None, config=None, output_tokens=SUMMARY_OUTPUT_TOKENS):
+    """
+    Uma chamada generate_content com retentativas (backoff + jitter). Retorna '' em falha.
+    `config` (ex: saída JSON) vai direto para o SDK; `output_tokens` é a saída reservada no limitador.
+    """
+    call_start = time.perf_counter()
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            limiter.acquire_sync(estimate_request_tokens(prompt, output_tokens))
+        attempt_start = time.perf_counter()
+        try:
+            # A vaga é só da tentativa: esperas do limitador e do backoff não a ocupam
+            with api_slots:
+                response = client.models.generate_content(
+                    model=MODEL_ID,
+                    contents=prompt,
+                    config=config
+                )
+            _record_call(response, attempt, attempt_start, call_start)
+            return response.text or ""
+        except Exception as e:
+            if attempt < MAX_RETRIES and is_retryable(e):
+                delay = backoff_delay(attempt, exc=e)
+                print(f"{Colors.WARNING}↻ API indisponível/limitada ({e.__class__.__name__}). "
+                      f"Tentativa {attempt + 1}/{MAX_RETRIES} em {delay:.1f}s{Colors.ENDC}", flush=True)
+                time.sleep(delay)
+                continue
+            print(f"{Colors.FAIL}Erro ao gerar resumo (API): {e}{Colors.ENDC}")
+            _record_call(None, attempt, attempt_start, call_start, ok=False)
+            return ""
+
+
+async def _generate_async(prompt, limiter, controller):
+    """
+    Versão assíncrona de _generate (cliente `client.aio`).
+    Cada tentativa ocupa uma vaga do AIMDController e reserva cota no RateLimiter;
+    respostas 429 reduzem a concorrência, sucessos a aumentam.
+    """
+    call_start = time.perf_counter()
+    for attempt in range(MAX_RETRIES + 1):
+        error = None
+        async with controller:
+            await limiter.acquire(estimate_request_tokens(prompt))
+            attempt_start = time.perf_counter()
+            try:
+                response = await client.aio.models.generate_content(
+                    model=MODEL_ID,
+                    contents=prompt
+                )
+            except Exception as e:
+                error = e
+            else:
+                controller.on_success()
+                _record_call(response, attempt, attempt_start, call_start)
+                return response.text or ""
+
+        if is_rate_limited(error):
+            controller.on_throttle()
+        if attempt < MAX_RETRIES and is_retryable(error):
+            delay = backoff_delay(attempt, exc=error)
+            print(f"{Colors.WARNING}↻ API indisponível/limitada ({error.__class__.__name__}). "
+                  f"Tentativa {attempt + 1}/{MAX_RETRIES} em {delay:.1f}s "
+                  f"(concorrência: {controller.limit:.1f}){Colors.ENDC}", flush=True)
+            await asyncio.sleep(delay)
+            continue
+        print(f"{Colors.FAIL}Erro ao gerar resumo (API): {error}{Colors.ENDC}")
+        _record_call(None, attempt, attempt_start, call_start, ok=False)
+        return ""
+
+
+def get_ai_summary(transcript, limiter=None, hierarchical=False):
+    """Gera um resumo executivo para servir de mapa ao NotebookLM"""
+    ready, cache_key, chunks = _summary_request(transcript, hierarchical)
+    if ready is not None:
+        return ready
+    return _summarize_chunks(cache_key, chunks, limiter)
+
+
+def _summarize_chunks(cache_key, chunks, limiter=None):
+    """Chamadas de um pedido já preparado por _summary_request (prompt simples ou map-reduce)."""
+    if len(chunks) == 1:
+        summary = _generate(chunks[0], limiter)
+    else:
+        # Map: trechos em paralelo no pool compartilhado, dentro do teto de --workers chamadas
+        # simultâneas. Qualquer falha invalida o resumo (SRT não é arquivado).
+        prompts = _map_prompts(chunks)
+        # Cada tarefa roda numa cópia do contexto atual (arquivo do --report)
+        context = contextvars.copy_context()
+        partials = list(map_pool.map(lambda prompt: context.copy().run(_generate, prompt, limiter), prompts))
+        summary = _generate(_reduce_prompt(partials), limiter) if all(partials) else ""
+
+    summary_cache.put(cache_key, MODEL_ID, summary)
+    return summary
+
+
+def get_pack_summaries(requests, limiter=None):
+    """
+    --pack-shorts: resume várias transcrições curtas numa chamada com saída JSON.
+    `requests` são (cache_key, chunks, texto) de _summary_request (prompt simples, texto inteiro).
+    Os vídeos sem resumo válido na resposta (ou todos, se o JSON for inválido) são refeitos em
+    chamadas individuais. Retorna os resumos na ordem de `requests` ('' se a chamada falhar).
+    """
+    keys = pack_keys(len(requests))
+    prompt = PACK_PROMPT_TEMPLATE.format(
+        count=len(requests), videos=format_pack_videos(keys, (text for _, _, text in requests)))
+    response = _generate(prompt, limiter, PACK_CONFIG, SUMMARY_OUTPUT_TOKENS * len(requests))
+    if not response:
+        # Falha da API (já com retentativas): como no modo simples, os arquivos ficam para a próxima execução
+        return [""] * len(requests)
+    packed = parse_pack_response(response, keys)
+    if len(packed) < len(keys):
+        print(f"{Colors.WARNING}⚠ Resposta do grupo com {len(packed)}/{len(keys)} resumos válidos; "
+              f"refazendo os demais individualmente.{Colors.ENDC}", flush=True)
+
+    summaries = []
+    for key, (cache_key, chunks, _) in zip(keys, requests):
+        summary = packed.get(key)
+        if summary is None:
+            summary = _generate(chunks[0], limiter)
+        summary_cache.put(cache_key, MODEL_ID, summary)
+        summaries.append(summary)
+    return summaries
+
+
+async def get_ai_summary_async(transcript, limiter, controller, hierarchical=False):
+    """Versão assíncrona de get_ai_summary; os trechos do map rodam com asyncio.gather."""
+    ready, cache_key, chunks = _summary_request(transcript, hierarchical)
+    if ready is not None:
+        return ready
+
+    if len(chunks) == 1:
+        summary = await _generate_async(chunks[0], limiter, controller)
+    else:
+        partials = await asyncio.gather(
+            *(_generate_async(prompt, limiter, controller) for prompt in _map_prompts(chunks))
+        )
+        summary = await _generate_async(_reduce_prompt(partials), limiter, controller) if all(partials) else ""
+
+    summary_cache.put(cache_key, MODEL_ID, summary)
+    return summary
+
+
+def get_metadata(srt_filename):
+    """
+    Busca metadados no arquivo .info.json correspondente, se existir.
+    A busca usa o índice de metadados da pasta (lexis_core.metadata): um scandir por
+    pasta, leitura parcial do JSON e cache lateral invalidado por mtime.
+    """
+    base_name = os.path.splitext(srt_filename)[0]
+    try:
+        meta = video_metadata(srt_filename)
+    except Exception as e:
+        print(f"Erro ao ler JSON de {srt_filename}: {e}")
+        meta = None
+
+    if meta is not None:
+        return meta
+
+    candidates = [stem + INFO_SUFFIX for stem in candidate_stems(srt_filename)]
+    print(f"⚠ Aviso: Nenhum metadata encontrado para {srt_filename}. Tentado: {candidates}")
+    return {"date": "Desconhecida", "title": base_name, "id": "N/A"}
+
+def prepare_file(filename):
+    """
+    Etapa local (sem API) de um arquivo: leitura, limpeza e metadados.
+    A legenda é lida e limpa em streaming para um SpooledText (job["transcript"]): vídeos
+    grandes vão para um arquivo temporário na pasta da legenda, e a memória não cresce
+    com a duração do vídeo. Quem recebe o job deve chamar release_job() ao terminar.
+    Retorna (job, msg): `job` é None quando o arquivo deve ser pulado (msg explica o motivo).
+    """
+    output_filename = os.path.splitext(filename)[0] + ".txt"
+    
+    if os.path.exists(output_filename):
+        msg = f"{Colors.WARNING}⚠ [SKIP] {filename} -> {output_filename} já existe.{Colors.ENDC}"
+        return None, msg
+
+    transcript = SpooledText(os.path.dirname(filename) or ".", count_tokens=token_estimator.estimate)
+    try:
+        # Leitura e limpeza acontecem juntas (pedaço a pedaço): o tempo fica todo em "clean"
+        with run_report.stage(filename, "clean"):
+            with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
+                for chunk in iter_transcript_chunks(f):
+                    transcript.write(chunk)
+            transcript.finish()
+    except BaseException:
+        transcript.close()
+        raise
+    
+    if not transcript.chars:
+        transcript.close()
+        msg = f"{Colors.WARNING}⚠ [VAZIO] {filename} resultou em texto vazio.{Colors.ENDC}"
+        return None, msg
+
+    with run_report.stage(filename, "metadata"):
+        meta = get_metadata(filename)
+
+    job = {
+        "filename": filename,
+        "output_filename": output_filename,
+        "transcript": transcript,
+        "meta": meta,
+    }
+    return job, None
+
+def release_job(job):
+    """Descarta a transcrição do job (apaga o arquivo temporário, se houver)."""
+    if job is not None:
+        job["transcript"].close()
+
+def write_output(job, summary):
+    """Grava o .txt final (Metadados + Resumo + Transcrição). Retorna (success, msg)."""
+    filename = job["filename"]
+    output_filename = job["output_filename"]
+    meta = job["meta"]
+    success = False
+
+    if not summary:
+         msg = f"{Colors.WARNING}⚠ [SEM RESUMO] {filename} -> Salvo (SRT mantido).{Colors.ENDC}"
+    else:
+         success = True
+         msg = f"{Colors.GREEN}✓ [OK] {filename} -> {output_filename}{Colors.ENDC}"
+    
+    date_str = meta['date']
+    if len(date_str) == 8 and date_str.isdigit():
+        date_str = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+
+    head = (
+        f"--- METADADOS DO DOCUMENTO ---\n"
+        f"DATA: {date_str}\n"
+        f"TÍTULO: {meta['title']}\n"
+        f"ID: {meta['id']}\n\n"
+        f"--- RESUMO EXECUTIVO (VIA GEMINI) ---\n"
+        f"{summary}\n\n"
+        f"--- TRANSCRICAO COMPLETA ---\n"
+    )
+    
+    # A transcrição é copiada em pedaços do SpooledText, sem montar o arquivo final na memória
+    with run_report.stage(filename, "write"):
+        with open(output_filename, 'wb') as f_out:
+            f_out.write(head.encode('utf-8'))
+            job["transcript"].copy_to(f_out)
+            f_out.write(b"\n")
+
+    return success, msg
+
+def process_file(filename, current_dir, limiter=None, hierarchical=False):
+    """Processa um único arquivo SRT. Função isolada para rodar em thread."""
+    job = None
+    try:
+        job, msg = prepare_file(filename)
+        if job is None:
+            return filename, False, msg
+
+        with run_report.for_file(filename), run_report.stage(filename, "api"):
+            summary = get_ai_summary(job["transcript"], limiter, hierarchical)
+        success, msg = write_output(job, summary)
+        return filename, success, msg
+            
+    except Exception as e:
+        msg = f"{Colors.FAIL}✖ [ERRO] {filename}: {e}{Colors.ENDC}"
+        return filename, False, msg
+    finally:
+        release_job(job)
+
+def process_prepared(job, limiter=None):
+    """--pack-shorts: conclui um arquivo já preparado e fora dos grupos (chamadas normais)."""
+    filename = job["filename"]
+    try:
+        cache_key, chunks = job["request"]
+        with run_report.for_file(filename), run_report.stage(filename, "api"):
+            summary = _summarize_chunks(cache_key, chunks, limiter)
+        success, msg = write_output(job, summary)
+        return [(filename, success, msg)]
+    except Exception as e:
+        return [(filename, False, f"{Colors.FAIL}✖ [ERRO] {filename}: {e}{Colors.ENDC}")]
+    finally:
+        release_job(job)
+
+def process_pack(jobs, limiter=None):
+    """--pack-shorts: resume um grupo de arquivos curtos numa chamada e grava os .txt."""
+    if len(jobs) == 1:
+        return process_prepared(jobs[0], limiter)
+    results = []
+    try:
+        requests = [(*job["request"], job["transcript"].read()) for job in jobs]
+        start = time.perf_counter()
+        with run_report.for_file(jobs[0]["filename"]):
+            summaries = get_pack_summaries(requests, limiter)
+        # O tempo da chamada do grupo é dividido entre os arquivos
+        elapsed = time.perf_counter() - start
+        for job in jobs:
+            run_report.add_time(job["filename"], "api", elapsed / len(jobs))
+    except Exception as e:
+        for job in jobs:
+            release_job(job)
+        return [(job["filename"], False, f"{Colors.FAIL}✖ [ERRO] {job['filename']}: {e}{Colors.ENDC}")
+                for job in jobs]
+
+    for job, summary in zip(jobs, summaries):
+        try:
+            success, msg = write_output(job, summary)
+            if success:
+                msg += f" {Colors.CYAN}(grupo de {len(jobs)}){Colors.ENDC}"
+            results.append((job["filename"], success, msg))
+        except Exception as e:
+            results.append((job["filename"], False, f"{Colors.FAIL}✖ [ERRO] {job['filename']}: {e}{Colors.ENDC}"))
+        finally:
+            release_job(job)
+    return results
+
+def plan_pack_work(srt_files, args):
+    """
+    --pack-shorts: prepara as legendas em ordem (leitura, limpeza, cache) e gera o trabalho
+    de cada chamada à API como (função, argumento):
+    - process_pack e um grupo de transcrições que cabem inteiras no prompt simples;
+    - process_prepared e um job para as demais (longas, map-reduce).
+    Arquivos resolvidos sem API (pulados, texto curto, cache) são gravados aqui e saem como
+    (None, [resultado]).
+    """
+    packer = ShortPacker(args.pack_tokens, args.pack_videos)
+    for filename in srt_files:
+        job = None
+        try:
+            job, msg = prepare_file(filename)
+            if job is None:
+                yield None, [(filename, False, msg)]
+                continue
+            ready, cache_key, chunks = _summary_request(job["transcript"], args.hierarchical)
+            if ready is not None:
+                success, msg = write_output(job, ready)
+                release_job(job)
+                yield None, [(filename, success, msg)]
+                continue
+        except Exception as e:
+            release_job(job)
+            yield None, [(filename, False, f"{Colors.FAIL}✖ [ERRO] {filename}: {e}{Colors.ENDC}")]
+            continue
+
+        job["request"] = (cache_key, chunks)
+        tokens = job["transcript"].tokens
+        if len(chunks) == 1 and tokens <= min(prompt_token_budget, args.pack_tokens):
+            group = packer.add(job, tokens)
+            if group:
+                yield process_pack, group
+        else:
+            yield process_prepared, job
+
+    group = packer.flush()
+    if group:
+        yield process_pack, group
+
+async def process_file_async(filename, current_dir, limiter, controller, hierarchical=False):
+    """Equivalente assíncrono de process_file: I/O local em threads, resumo via client.aio."""
+    job = None
+    try:
+        job, msg = await asyncio.to_thread(prepare_file, filename)
+        if job is None:
+            return filename, False, msg
+
+        with run_report.for_file(filename), run_report.stage(filename, "api"):
+            summary = await get_ai_summary_async(job["transcript"], limiter, controller, hierarchical)
+        success, msg = await asyncio.to_thread(write_output, job, summary)
+        return filename, success, msg
+
+    except Exception as e:
+        msg = f"{Colors.FAIL}✖ [ERRO] {filename}: {e}{Colors.ENDC}"
+        return filename, False, msg
+    finally:
+        release_job(job)
+
+def run_threaded(srt_files, current_dir, args):
+    """Modo padrão: pool fixo de threads. Retorna a lista de arquivos processados com sucesso."""
+    success_files = []
+    processed_count = 0
+    total_files = len(srt_files)
+    limiter = RateLimiter(args.rpm, args.tpm) if (args.rpm or args.tpm) else None
+
+    if args.pack_shorts:
+        return run_threaded_packed(srt_files, args, limiter)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(process_file, filename, current_dir, limiter, args.hierarchical): filename for filename in srt_files}
+        
+        for future in concurrent.futures.as_completed(futures):
+            processed_count += 1
+            try:
+                fname, success, msg = future.result()
+                print(f"[{processed_count}/{total_files}] {msg}", flush=True)
+                if success:
+                    success_files.append(fname)
+            except Exception as e:
+                print(f"{Colors.FAIL}[{processed_count}/{total_files}] Erro na thread: {e}{Colors.ENDC}", flush=True)
+
+    return success_files
+
+def run_threaded_packed(srt_files, args, limiter):
+    """
+    Modo padrão com --pack-shorts: a preparação roda nesta thread (plan_pack_work) e cada
+    chamada (grupo de curtos ou arquivo longo) vai para o pool. No máximo 2 x --workers
+    chamadas ficam preparadas aguardando vaga, para a memória não crescer com a fila.
+    """
+    success_files = []
+    processed_count = 0
+    total_files = len(srt_files)
+    calls = packed = 0
+
+    def report(results):
+        nonlocal processed_count
+        for fname, success, msg in results:
+            processed_count += 1
+            print(f"[{processed_count}/{total_files}] {msg}", flush=True)
+            if success:
+                success_files.append(fname)
+
+    def collect(futures):
+        for future in futures:
+            try:
+                report(future.result())
+            except Exception as e:
+                print(f"{Colors.FAIL}Erro na thread: {e}{Colors.ENDC}", flush=True)
+
+    in_flight = set()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for work, payload in plan_pack_work(srt_files, args):
+            if work is None:
+                report(payload)
+                continue
+            calls += 1
+            if work is process_pack and len(payload) > 1:
+                packed += len(payload)
+            while len(in_flight) >= args.workers * 2:
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(work, payload, limiter))
+        collect(concurrent.futures.as_completed(in_flight))
+
+    run_report.info.setdefault("pack_shorts", {}).update({"files_packed": packed, "requests": calls})
+    print(f"{Colors.BLUE}Vídeos curtos em grupo: {packed} arquivos; {calls} pedidos de resumo "
+          f"(sem contar map-reduce e reenvios individuais).{Colors.ENDC}")
+    return success_files
+
+async def run_async(srt_files, current_dir, args):
+    """
+    Modo assíncrono: a concorrência das chamadas começa em --initial-concurrency e
+    cresce (AIMD) até encontrar 429 ou --max-concurrency, sempre dentro de --rpm/--tpm.
+    """
+    limiter = RateLimiter(args.rpm, args.tpm)
+    controller = AIMDController(initial=args.initial_concurrency, maximum=args.max_concurrency)
+    # Limita quantos arquivos ficam lidos em memória aguardando vaga na API
+    pending = asyncio.Semaphore(args.max_concurrency * 2)
+
+    async def run_one(filename):
+        async with pending:
+            return await process_file_async(filename, current_dir, limiter, controller, args.hierarchical)
+
+    success_files = []
+    processed_count = 0
+    total_files = len(srt_files)
+    tasks = [asyncio.create_task(run_one(filename)) for filename in srt_files]
+
+    for next_done in asyncio.as_completed(tasks):
+        processed_count += 1
+        try:
+            fname, success, msg = await next_done
+            print(f"[{processed_count}/{total_files}] {msg}", flush=True)
+            if success:
+                success_files.append(fname)
+        except Exception as e:
+            print(f"{Colors.FAIL}[{processed_count}/{total_files}] Erro na tarefa: {e}{Colors.ENDC}", flush=True)
+
+    print(f"{Colors.BLUE}Concorrência final: {controller.limit:.1f} (pico {controller.peak:.1f}), "
+          f"{controller.throttles} respostas 429.{Colors.ENDC}")
+    return success_files
+
+def collect_batches(state):
+    """
+    Consulta os jobs de batch registrados. Para cada job concluído grava os .txt
+    (re-lendo e limpando o .srt) e devolve os arquivos prontos para arquivamento.
+    Jobs que falharam/expiraram são descartados: seus arquivos voltam à fila.
+    """
+    success_files = []
+    for job in list(state.jobs):
+        remote = refresh_job(client, job)
+        if job["state"] not in TERMINAL_STATES:
+            waiting = sum(len(names) for names in job["entries"].values())
+            print(f"{Colors.CYAN}⧗ [BATCH] {job['name']}: {job['state']} ({waiting} arquivos aguardando){Colors.ENDC}")
+            continue
+
+        if job["state"] != "JOB_STATE_SUCCEEDED":
+            print(f"{Colors.FAIL}✖ [BATCH] {job['name']} terminou como {job['state']}. "
+                  f"Os arquivos serão reenviados na próxima execução.{Colors.ENDC}")
+            state.remove(job)
+            state.save()
+            continue
+
+        results = download_results(client, remote)
+        for key, filenames in job["entries"].items():
+            summary, error = results.get(key, ("", "resposta ausente"))
+            if error:
+                print(f"{Colors.FAIL}Erro ao gerar resumo (BATCH) para {', '.join(filenames)}: {error}{Colors.ENDC}")
+            summary_cache.put(key, job["model"], summary)
+
+            for filename in filenames:
+                prepared = None
+                try:
+                    prepared, msg = prepare_file(filename)
+                    if prepared is not None:
+                        success, msg = write_output(prepared, summary)
+                        if success:
+                            success_files.append(filename)
+                except Exception as e:
+                    msg = f"{Colors.FAIL}✖ [ERRO] {filename}: {e}{Colors.ENDC}"
+                finally:
+                    release_job(prepared)
+                print(f"[BATCH] {msg}", flush=True)
+
+        state.remove(job)
+        state.save()
+    return success_files
+
+def submit_batch(state, srt_files, current_dir):
+    """
+    Monta um JSONL com todos os pedidos de resumo pendentes e o envia como um job.
+    Arquivos resolvidos sem API (cache/texto curto) são gravados na hora.
+    Retorna os arquivos já concluídos (elegíveis para arquivamento).
+    """
+    in_flight = state.in_flight_files()
+    success_files = []
+    requests = {}
+    entries = {}
+
+    for filename in sorted(srt_files):
+        if filename in in_flight:
+            continue
+        job = None
+        try:
+            job, msg = prepare_file(filename)
+            if job is None:
+                print(msg)
+                continue
+
+            ready, cache_key, chunks = _summary_request(job["transcript"])
+            if ready is not None:
+                success, msg = write_output(job, ready)
+                print(msg)
+                if success:
+                    success_files.append(filename)
+                continue
+        except Exception as e:
+            print(f"{Colors.FAIL}✖ [ERRO] {filename}: {e}{Colors.ENDC}")
+            continue
+        finally:
+            # O pedido já tem o prompt; o .txt é regravado (relendo o .srt) na coleta
+            release_job(job)
+
+        # Transcrições idênticas compartilham a mesma chave -> um único pedido
+        requests.setdefault(cache_key, chunks[0])
+        entries.setdefault(cache_key, []).append(filename)
+
+    if not requests:
+        print(f"{Colors.BLUE}Nenhum pedido novo para enviar ao batch.{Colors.ENDC}")
+        return success_files
+
+    os.makedirs(state.dir, exist_ok=True)
+    jsonl_path = os.path.join(state.dir, time.strftime("%Y%m%d-%H%M%S") + ".jsonl")
+    write_requests_jsonl(jsonl_path, requests.items())
+
+    record = submit_job(client, MODEL_ID, jsonl_path, f"lexis-{os.path.basename(current_dir)}")
+    record["entries"] = entries
+    state.jobs.append(record)
+    state.save()
+
+    total = sum(len(names) for names in entries.values())
+    print(f"{Colors.GREEN}✓ [BATCH] Job {record['name']} enviado com {len(requests)} pedidos "
+          f"({total} arquivos). Rode novamente (ou use --wait) para coletar.{Colors.ENDC}")
+    return success_files
+
+def run_batch(srt_files, current_dir, args):
+    """
+    Modo --batch: coleta jobs anteriores já concluídos, envia os pendentes num novo job
+    e, com --wait, aguarda até todos os jobs terminarem.
+    """
+    state = BatchState(current_dir)
+    success_files = collect_batches(state)
+    collected = set(success_files)
+    pending = [filename for filename in srt_files if filename not in collected]
+    success_files += submit_batch(state, pending, current_dir)
+
+    while args.wait and state.jobs:
+        time.sleep(args.poll_interval)
+        success_files += collect_batches(state)
+
+    return success_files
+
+def preflight(srt_files, args):
+    """
+    --dry-run: lê e limpa os arquivos e consulta o cache como numa execução real, mas sem
+    chamar a API nem gravar nada. Estima chamadas, tokens de entrada/saída e custo.
+    """
+    hierarchical = args.hierarchical and not args.batch
+    totals = {"files": 0, "skipped": 0, "no_api": 0, "calls": 0, "input_tokens": 0, "output_tokens": 0}
+    packer = ShortPacker(args.pack_tokens, args.pack_videos) if args.pack_shorts else None
+
+    def add_pack(group):
+        # Um grupo de um só vídeo vai como pedido simples
+        if len(group) == 1:
+            prompt = PROMPT_TEMPLATE.format(text=group[0])
+        else:
+            keys = pack_keys(len(group))
+            prompt = PACK_PROMPT_TEMPLATE.format(count=len(group), videos=format_pack_videos(keys, group))
+        totals["calls"] += 1
+        totals["input_tokens"] += estimate_prompt_tokens(prompt)
+        totals["output_tokens"] += SUMMARY_OUTPUT_TOKENS * len(group)
+
+    for filename in sorted(srt_files):
+        try:
+            job, msg = prepare_file(filename)
+        except Exception as e:
+            print(f"{Colors.FAIL}✖ [ERRO] {filename}: {e}{Colors.ENDC}")
+            continue
+        if job is None:
+            totals["skipped"] += 1
+            continue
+        totals["files"] += 1
+
+        try:
+            ready, _, chunks = _summary_request(job["transcript"], hierarchical)
+            tokens = job["transcript"].tokens
+            if packer and ready is None and len(chunks) == 1 and tokens <= min(prompt_token_budget, args.pack_tokens):
+                group = packer.add(job["transcript"].read(), tokens)
+                if group:
+                    add_pack(group)
+                continue
+        finally:
+            release_job(job)
+        if ready is not None:
+            # Acerto de cache ou texto curto: nenhuma chamada
+            totals["no_api"] += 1
+            continue
+
+        prompts = chunks if len(chunks) == 1 else _map_prompts(chunks)
+        if len(chunks) > 1:
+            # Reduce: o prompt final carrega um resumo parcial (≈ SUMMARY_OUTPUT_TOKENS) por trecho
+            totals["calls"] += 1
+            totals["input_tokens"] += estimate_prompt_tokens(REDUCE_PROMPT_TEMPLATE) + len(chunks) * SUMMARY_OUTPUT_TOKENS
+            totals["output_tokens"] += SUMMARY_OUTPUT_TOKENS
+        for prompt in prompts:
+            totals["calls"] += 1
+            totals["input_tokens"] += estimate_prompt_tokens(prompt)
+            totals["output_tokens"] += SUMMARY_OUTPUT_TOKENS
+
+    if packer:
+        group = packer.flush()
+        if group:
+            add_pack(group)
+
+    factor = BATCH_PRICE_FACTOR if args.batch else 1.0
+    totals["cost_usd"] = round(factor * (totals["input_tokens"] / 1e6 * PRICE_INPUT_PER_MTOK
+                                         + totals["output_tokens"] / 1e6 * PRICE_OUTPUT_PER_MTOK), 6)
+    run_report.estimate = totals
+
+    print(f"{Colors.HEADER}--- Dry-run: nenhuma chamada à API foi feita ---{Colors.ENDC}")
+    print(f"Arquivos a processar: {totals['files']} ({totals['skipped']} pulados, "
+          f"{totals['no_api']} resolvidos sem API por cache/texto curto)")
+    print(f"Chamadas estimadas:   {totals['calls']}")
+    print(f"Tokens estimados:     {totals['input_tokens']} entrada + {totals['output_tokens']} saída")
+    print(f"{Colors.BOLD}Custo estimado:       US$ {totals['cost_usd']:.4f}{Colors.ENDC} "
+          f"({MODEL_ID}{', preço batch' if args.batch else ''})")
+    return totals
+
+def calibration_texts(srt_files, limit):
+    """Trechos (prompts reais, de tamanhos variados) dos primeiros `limit` arquivos para o count_tokens."""
+    texts = []
+    for filename in sorted(srt_files)[:limit]:
+        try:
+            # Só o começo do texto é usado: a limpeza para assim que passa do maior trecho
+            chunks = []
+            read_chars = 0
+            with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
+                for chunk in iter_clean_chunks(f):
+                    chunks.append(chunk)
+                    read_chars += len(chunk)
+                    if read_chars > max(CALIBRATION_SLICES):
+                        break
+            text = ''.join(chunks)
+        except Exception as e:
+            print(f"{Colors.WARNING}⚠ Ignorando {filename} na calibração: {e}{Colors.ENDC}")
+            continue
+        for size in CALIBRATION_SLICES:
+            if len(text) < size // 2:
+                break
+            cut = text[:size].rsplit(' ', 1)[0] if len(text) > size else text
+            texts.append(PROMPT_TEMPLATE.format(text=cut))
+    return texts
+
+def calibrate_tokens(srt_files, args):
+    """
+    --calibrate-tokens N: conta os tokens reais (count_tokens, sem custo de geração) de
+    trechos de N arquivos e ajusta o estimador offline, gravando em .lexis_tokens.json.
+    """
+    texts = calibration_texts(srt_files, args.calibrate_tokens)
+    if not texts:
+        print(f"{Colors.WARNING}Nenhum texto utilizável para calibrar.{Colors.ENDC}")
+        return
+
+    def count_tokens(text):
+        return client.models.count_tokens(model=MODEL_ID, contents=text).total_tokens
+
+    print(f"{Colors.BLUE}Calibrando o estimador de tokens de {MODEL_ID} com {len(texts)} trechos...{Colors.ENDC}")
+    try:
+        before, after, calls = token_estimator.calibrate(texts, count_tokens)
+    except Exception as e:
+        print(f"{Colors.FAIL}Erro ao contar tokens (API): {e}{Colors.ENDC}")
+        return
+    token_estimator.save()
+    coefficients = ", ".join(f"{name}={value:.3f}" for name, value in token_estimator.coefficients.items())
+    print(f"{Colors.GREEN}✓ Calibrado ({calls} chamadas novas ao count_tokens). Erro médio: "
+          f"{before:.1%} → {after:.1%}{Colors.ENDC}")
+    print(f"  Coeficientes: {coefficients}")
+    print(f"  Gravado em {TOKEN_CALIBRATION_PATH}")
+
+def export_rag(srt_files, args):
+    """
+    --export-rag ARQUIVO: grava os trechos com sobreposição de cada legenda (lexis_core.rag)
+    num JSONL, sem chamar a API nem arquivar. Cada legenda é lida e gravada em streaming;
+    o arquivo final só substitui o anterior quando a exportação termina.
+    """
+    output_path = args.export_rag
+    tmp_path = output_path + ".tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    files = records = 0
+    print(f"{Colors.BLUE}Exportando trechos de {len(srt_files)} arquivos ({args.chunk_sentences} sentenças, "
+          f"sobreposição de {args.overlap_sentences}) para {output_path}...{Colors.ENDC}")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            for filename in sorted(srt_files):
+                try:
+                    with run_report.stage(filename, "metadata"):
+                        meta = get_metadata(filename)
+                    with run_report.stage(filename, "clean"):
+                        with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
+                            count = write_records(chunk_records(
+                                f, meta, filename, args.chunk_sentences, args.overlap_sentences,
+                                count_tokens=token_estimator.estimate), out)
+                except Exception as e:
+                    print(f"{Colors.FAIL}✖ [ERRO] {filename}: {e}{Colors.ENDC}")
+                    continue
+                if not count:
+                    print(f"{Colors.WARNING}⚠ [VAZIO] {filename} resultou em texto vazio.{Colors.ENDC}")
+                    continue
+                files += 1
+                records += count
+                print(f"{Colors.GREEN}✓ [RAG] {filename} -> {count} trechos{Colors.ENDC}")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, output_path)
+    run_report.info["rag_export"] = {"path": output_path, "files": files, "records": records}
+    print(f"{Colors.GREEN}--- Exportação concluída: {records} trechos de {files} arquivo(s) em "
+          f"{output_path} ---{Colors.ENDC}")
+    return files, records
+
+def skip_near_duplicates(srt_files, args, known=None):
+    """
+    Pré-etapa: detecta transcrições quase idênticas (faixas -pt/-pt-orig/.en do mesmo vídeo,
+    reuploads) por MinHash/LSH sobre o texto limpo e mantém um arquivo canônico por grupo,
+    escolhido pela preferência de idioma (--lang-pref). Arquivos cujo .txt já existe são
+    sempre os canônicos do seu grupo (não são resumidos de novo).
+    `known` ({arquivo: assinatura}, modo --watch) são arquivos de rodadas anteriores: entram
+    como canônicos fixos e recebem as assinaturas dos canônicos desta rodada.
+    Retorna (arquivos_a_processar, {duplicata: canônico}).
+    """
+    signatures = {}
+    lengths = {}
+    for filename in srt_files:
+        try:
+            with run_report.stage(filename, "neardup"):
+                with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
+                    chunks = measure_chunks(iter_clean_chunks(f), lengths, filename)
+                    signatures[filename] = transcript_signature(chunks)
+        except Exception as e:
+            # Sem assinatura o arquivo segue normalmente (o erro reaparece no processamento)
+            print(f"{Colors.WARNING}⚠ Não foi possível comparar {filename}: {e}{Colors.ENDC}")
+
+    done = {filename for filename in srt_files if os.path.exists(os.path.splitext(filename)[0] + ".txt")}
+    known = {} if known is None else known
+    fixed = done | {filename for filename in known if filename not in signatures}
+    duplicates = find_duplicates({**known, **signatures}, parse_language_preference(args.lang_pref),
+                                 args.dup_threshold, lengths, fixed=fixed)
+    for duplicate, canonical in sorted(duplicates.items()):
+        print(f"{Colors.CYAN}≈ [DUPLICATA] {duplicate} ≈ {canonical} (não será resumido){Colors.ENDC}")
+    known.update((filename, signature) for filename, signature in signatures.items()
+                 if signature is not None and filename not in duplicates)
+    return [filename for filename in srt_files if filename not in duplicates], duplicates
+
+def run_join(current_dir):
+    """--join: consolidação incremental (lexis-join) da pasta atual, no mesmo processo."""
+    from lexis_core import join
+
+    print(f"{Colors.BLUE}Consolidando volumes (lexis-join incremental)...{Colors.ENDC}", flush=True)
+    try:
+        join.main([])
+    except Exception as e:
+        print(f"{Colors.FAIL}Erro no lexis-join: {e}{Colors.ENDC}")
+
+def run_watch(current_dir, args):
+    """
+    Modo --watch: processo de longa duração que processa cada .srt assim que o yt-dlp termina
+    de gravá-lo (inotify, ou polling como alternativa), com o cliente e o pool de threads
+    sempre prontos. Legendas já existentes entram na fila ao iniciar.
+
+    Cada legenda espera WATCH_SETTLE_SECONDS sem mudanças (escrita em andamento) e o seu
+    .info.json (até WATCH_INFO_TIMEOUT). Arquivos processados com sucesso são arquivados na
+    hora; com --join, a pasta é consolidada quando a fila esvazia. Ctrl+C ou SIGTERM encerram
+    após terminar os arquivos em andamento.
+    """
+    watcher = open_watcher(current_dir, args.watch_interval, polling=args.watch_polling)
+    index = get_index(current_dir)
+    pending = PendingFiles(args.settle, args.info_timeout, has_info=index.has_info)
+    for filename in glob.glob("*.srt"):
+        pending.add(filename)
+
+    limiter = RateLimiter(args.rpm, args.tpm) if (args.rpm or args.tpm) else None
+    known = {}
+    duplicates = {}
+    in_flight = {}
+    processed = 0
+    join_due = False
+
+    stop = []
+    previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: stop.append(signum))
+    print(f"{Colors.HEADER}--- Observando {current_dir} ({watcher.kind}, {args.workers} threads). "
+          f"Ctrl+C para sair. ---{Colors.ENDC}", flush=True)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as executor:
+        try:
+            while not stop:
+                changed = watcher.poll(WATCH_TICK_SECONDS if not in_flight else 0.1)
+                if any(name.endswith(INFO_SUFFIX) for name in changed):
+                    index.refresh()
+                for name in changed:
+                    if name.endswith(".srt") and os.path.exists(name):
+                        pending.add(name)
+
+                ready = [name for name in pending.pop_ready() if name not in in_flight.values()]
+                found = {}
+                if ready and not args.keep_duplicates:
+                    ready, found = skip_near_duplicates(ready, args, known)
+                    duplicates.update(found)
+                for filename in ready:
+                    future = executor.submit(process_file, filename, current_dir, limiter, args.hierarchical)
+                    in_flight[future] = filename
+
+                finished = [future for future in in_flight if future.done()]
+                done = []
+                for future in finished:
+                    del in_flight[future]
+                    processed += 1
+                    fname, success, msg = future.result()
+                    print(f"[{processed}] {msg}", flush=True)
+                    if success:
+                        done.append(fname)
+                        join_due = True
+                if done:
+                    # Um lote de arquivamento por volta (no modo pack, um único fsync para todos)
+                    archive_files(done, current_dir, args.archive_mode)
+                if finished or found:
+                    # Duplicatas saem assim que o .txt do canônico existir (talvez só numa volta seguinte)
+                    archive_duplicates({d: c for d, c in duplicates.items() if os.path.exists(d)}, current_dir,
+                                       args.archive_mode)
+                    save_indexes()
+                if join_due and args.join and not in_flight and not len(pending):
+                    run_join(current_dir)
+                    join_due = False
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            watcher.close()
+            if in_flight:
+                print(f"{Colors.WARNING}Encerrando: aguardando {len(in_flight)} arquivo(s) em andamento...{Colors.ENDC}")
+                done = []
+                for future in concurrent.futures.as_completed(list(in_flight)):
+                    fname, success, msg = future.result()
+                    print(msg, flush=True)
+                    if success:
+                        done.append(fname)
+                if done:
+                    archive_files(done, current_dir, args.archive_mode)
+
+    print(f"{Colors.GREEN}--- Watch encerrado: {processed} arquivo(s) processado(s) ---{Colors.ENDC}")
+
+def find_srt_files(current_dir, args):
+    """
+    Legendas a processar, numa única varredura (lexis_core.scan): as da pasta atual ou, com
+    --recursive, as de toda a árvore (caminhos relativos, ex: 'Canal/Playlist/Canal-ID.srt').
+    Os .info.json vistos na varredura já alimentam o índice de metadados de cada pasta.
+    """
+    folders = scan_tree(current_dir, max_depth=None if args.recursive else 0, threads=args.scan_threads)
+    prime_metadata(folders)
+    return [path for folder in folders for path in folder.srt_paths()]
+
+def archive_path(filename, current_dir):
+    """Destino de um .srt arquivado: a pasta archive/ ao lado dele (na subpasta, com --recursive)."""
+    folder, name = os.path.split(filename)
+    return os.path.join(current_dir, folder, "archive", name)
+
+def _archive_video_id(filename):
+    """ID do vídeo pelo .info.json da legenda (None: o lexis_core.archive tenta pelo nome)."""
+    try:
+        fields = get_index(os.path.dirname(filename)).lookup(filename)
+    except Exception:
+        fields = None
+    return (fields or {}).get("id")
+
+def _info_companions(folder, archived):
+    """
+    {caminho do .info.json: legenda} das legendas arquivadas cujo .info.json nenhuma outra
+    legenda que continua na pasta usa (ex: a versão em outro idioma ainda não processada).
+    """
+    index = get_index(folder)
+
+    def info_stem(name):
+        return next((stem for stem in candidate_stems(name) if stem in index.infos), None)
+
+    with os.scandir(folder or ".") as entries:
+        in_use = {info_stem(entry.name) for entry in entries
+                  if entry.name.endswith(".srt") and os.path.join(folder, entry.name) not in archived}
+    companions = {}
+    for filename in archived:
+        stem = info_stem(os.path.basename(filename))
+        if stem is not None and stem not in in_use:
+            path = os.path.join(folder, index.infos[stem][0])
+            if os.path.exists(path):
+                companions.setdefault(path, filename)
+    return companions
+
+def archive_packed(labels, current_dir):
+    """
+    --archive-mode pack: anexa as legendas (e os .info.json que ficaram sem uso) aos pacotes
+    compactados de archive/ de cada pasta, um lote por pasta, e só então apaga os originais.
+    `labels` é {legenda: complemento da mensagem de arquivamento}.
+    """
+    # Import tardio: o zipfile (e bz2/lzma) só é carregado quando o modo pack é usado
+    from lexis_core.archive import ARCHIVE_DIR_NAME, ArchivePacks
+
+    by_folder = {}
+    for filename in labels:
+        by_folder.setdefault(os.path.dirname(filename), []).append(filename)
+
+    for folder, filenames in sorted(by_folder.items()):
+        directory = os.path.join(current_dir, folder, ARCHIVE_DIR_NAME)
+        start = time.perf_counter()
+        try:
+            companions = _info_companions(folder, set(filenames))
+            entries = [(filename, _archive_video_id(filename)) for filename in filenames]
+            entries += [(path, _archive_video_id(srt)) for path, srt in sorted(companions.items())]
+            packs = ArchivePacks(directory)
+            try:
+                archived = packs.add_files(entries)
+            finally:
+                packs.close()
+        except Exception as e:
+            print(f"{Colors.FAIL}Erro ao arquivar em pacote ({directory}): {e}{Colors.ENDC}")
+            continue
+
+        for path, pack in archived:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"{Colors.FAIL}Erro ao remover {path} (já está no pacote): {e}{Colors.ENDC}")
+                continue
+            if path in labels:
+                where = pack or "já estava no pacote"
+                print(f"{Colors.GREEN}Arquivado{labels[path]}: {path} -> {where}{Colors.ENDC}")
+        if companions:
+            get_index(folder).refresh()
+        elapsed = time.perf_counter() - start
+        for filename in filenames:
+            run_report.add_time(filename, "archive", elapsed / len(filenames))
+
+def archive_duplicates(duplicates, current_dir, mode="move"):
+    """Move para archive/ as duplicatas cujo canônico já tem .txt (o conteúdo está preservado nele)."""
+    packed = {}
+    for duplicate, canonical in sorted(duplicates.items()):
+        if not os.path.exists(os.path.splitext(canonical)[0] + ".txt"):
+            continue
+        if mode == "pack":
+            packed[duplicate] = f" (duplicata de {canonical})"
+            continue
+        try:
+            destination = archive_path(duplicate, current_dir)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            with run_report.stage(duplicate, "archive"):
+                shutil.move(duplicate, destination)
+            print(f"{Colors.GREEN}Arquivado (duplicata de {canonical}): {duplicate}{Colors.ENDC}")
+        except Exception as e:
+            print(f"{Colors.FAIL}Erro ao arquivar {duplicate}: {e}{Colors.ENDC}")
+    if packed:
+        archive_packed(packed, current_dir)
+
+def archive_files(success_files, current_dir, mode="move"):
+    """
+    Move para archive/ os .srt processados com sucesso (apenas se o .txt existir), ou, com
+    mode="pack", anexa-os aos pacotes compactados de archive/ (archive_packed).
+    """
+    if success_files:
+        print(f"{Colors.BLUE}Arquivando {len(success_files)} arquivos com sucesso...{Colors.ENDC}")
+        packed = {}
+        
+        for filename in success_files:
+             # Safety check: ensure .txt exists before archiving .srt
+             txt_filename = os.path.splitext(filename)[0] + ".txt"
+             if not os.path.exists(txt_filename):
+                 print(f"{Colors.FAIL}CRÍTICO: .txt não encontrado para {filename}. Não arquivando.{Colors.ENDC}")
+                 continue
+             if mode == "pack":
+                 packed[filename] = ""
+                 continue
+
+             try:
+                destination = archive_path(filename, current_dir)
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                with run_report.stage(filename, "archive"):
+                    shutil.move(filename, destination)
+                print(f"{Colors.GREEN}Arquivado: {filename}{Colors.ENDC}")
+             except Exception as e:
+                print(f"{Colors.FAIL}Erro ao arquivar {filename}: {e}{Colors.ENDC}")
+        if packed:
+            archive_packed(packed, current_dir)
+    else:
+        print(f"{Colors.WARNING}Nenhum arquivo elegível para arquivamento.{Colors.ENDC}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Processa .srt do diretório atual: limpeza, resumo via Gemini e arquivamento."
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Threads no modo padrão (default: {DEFAULT_WORKERS}).")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Pipeline assíncrono com concorrência adaptativa (AIMD) e backoff para 429.")
+    parser.add_argument("--rpm", type=int, default=None,
+                        help="Limite de requisições por minuto (token bucket).")
+    parser.add_argument("--tpm", type=int, default=None,
+                        help="Limite de tokens por minuto (token bucket).")
+    parser.add_argument("--initial-concurrency", type=int, default=4,
+                        help="Chamadas simultâneas iniciais no modo --async (default: 4).")
+    parser.add_argument("--max-concurrency", type=int, default=32,
+                        help="Teto de chamadas simultâneas no modo --async (default: 32).")
+    parser.add_argument("--hierarchical", action="store_true",
+                        help="Resumo map-reduce para transcrições acima do orçamento do prompt "
+                             "(em vez de truncar).")
+    parser.add_argument("--prompt-tokens", type=int, default=SINGLE_PASS_TOKENS,
+                        help=f"Tokens da transcrição enviados num resumo simples; o excesso é cortado "
+                             f"(default: {SINGLE_PASS_TOKENS}; máximo: janela de contexto de {MODEL_CONTEXT_TOKENS}).")
+    parser.add_argument("--calibrate-tokens", type=int, nargs="?", const=CALIBRATION_FILES, default=None, metavar="N",
+                        help="Calibra o estimador offline de tokens com count_tokens sobre N arquivos "
+                             f"(default: {CALIBRATION_FILES}) e sai.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Envia os resumos pendentes como um job da Batch API (retomável; rode de novo para coletar). "
+                             "Usa sempre o prompt simples (--hierarchical não se aplica).")
+    parser.add_argument("--wait", action="store_true",
+                        help="Com --batch, aguarda os jobs terminarem e coleta os resultados.")
+    parser.add_argument("--poll-interval", type=float, default=BATCH_POLL_SECONDS,
+                        help=f"Segundos entre consultas de estado com --wait (default: {BATCH_POLL_SECONDS}).")
+    parser.add_argument("--watch", action="store_true",
+                        help="Fica rodando e processa cada .srt assim que o download termina (inotify ou polling).")
+    parser.add_argument("--join", action="store_true",
+                        help="Com --watch, roda o lexis-join.py incremental na pasta quando a fila esvazia.")
+    parser.add_argument("--settle", type=float, default=WATCH_SETTLE_SECONDS,
+                        help=f"Com --watch, segundos sem mudanças para considerar a legenda completa "
+                             f"(default: {WATCH_SETTLE_SECONDS}).")
+    parser.add_argument("--info-timeout", type=float, default=WATCH_INFO_TIMEOUT,
+                        help=f"Com --watch, segundos de espera pelo .info.json da legenda (default: {WATCH_INFO_TIMEOUT}).")
+    parser.add_argument("--watch-interval", type=float, default=WATCH_POLL_SECONDS,
+                        help=f"Intervalo do polling quando não há inotify (default: {WATCH_POLL_SECONDS}).")
+    parser.add_argument("--watch-polling", action="store_true",
+                        help="Com --watch, força o polling mesmo com inotify disponível (ex: pastas de rede).")
+    parser.add_argument("--recursive", action="store_true",
+                        help="Processa os .srt de toda a árvore de pastas (canais/playlists), não só da pasta atual; "
+                             "archive/ e volumes_notebooklm/ são ignoradas.")
+    parser.add_argument("--scan-threads", type=int, default=DEFAULT_SCAN_THREADS,
+                        help=f"Com --recursive, threads para varrer as pastas em paralelo (útil em discos de rede; "
+                             f"default: {DEFAULT_SCAN_THREADS}).")
+    parser.add_argument("--archive-mode", choices=("move", "pack"), default="move",
+                        help="move: cada .srt vai para archive/ (padrão); pack: .srt e .info.json vão para "
+                             "pacotes zip indexados em archive/ (ver lexis-archive).")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Não detecta transcrições quase idênticas (resume todas as faixas/cópias).")
+    parser.add_argument("--lang-pref", default=",".join(DEFAULT_LANGUAGE_PREFERENCE),
+                        help="Ordem de preferência do idioma da faixa canônica entre duplicatas "
+                             f"(default: {','.join(DEFAULT_LANGUAGE_PREFERENCE)}).")
+    parser.add_argument("--dup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similaridade (Jaccard estimado) para considerar duplicata (default: {DEFAULT_THRESHOLD}).")
+    parser.add_argument("--pack-shorts", action="store_true",
+                        help="Agrupa transcrições curtas (que cabem inteiras no prompt) numa só chamada com "
+                             "saída JSON, um resumo por vídeo; reduz as requisições por minuto em canais de shorts.")
+    parser.add_argument("--pack-tokens", type=int, default=DEFAULT_PACK_TOKENS,
+                        help=f"Com --pack-shorts, tokens de transcrição por chamada (default: {DEFAULT_PACK_TOKENS}).")
+    parser.add_argument("--pack-videos", type=int, default=DEFAULT_PACK_VIDEOS,
+                        help=f"Com --pack-shorts, vídeos por chamada (default: {DEFAULT_PACK_VIDEOS}).")
+    parser.add_argument("--export-rag", metavar="ARQUIVO",
+                        help="Exporta as transcrições em trechos com sobreposição (JSONL, um registro por trecho, "
+                             "com ID, título, data e tempos do vídeo) e sai; não chama a API nem arquiva.")
+    parser.add_argument("--chunk-sentences", type=int, default=DEFAULT_CHUNK_SENTENCES,
+                        help=f"Com --export-rag, sentenças por trecho (default: {DEFAULT_CHUNK_SENTENCES}).")
+    parser.add_argument("--overlap-sentences", type=int, default=DEFAULT_OVERLAP_SENTENCES,
+                        help=f"Com --export-rag, sentenças repetidas entre trechos vizinhos "
+                             f"(default: {DEFAULT_OVERLAP_SENTENCES}).")
+    parser.add_argument("--report", metavar="ARQUIVO",
+                        help="Grava um relatório da execução (tempos por etapa, latência, tokens, custo) "
+                             "em JSON, ou CSV por arquivo se terminar em .csv, e mostra um resumo.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Só estima chamadas, tokens e custo; não chama a API nem grava/arquiva nada.")
+    args = parser.parse_args(argv)
+    if args.recursive and args.watch:
+        parser.error("--watch observa só a pasta atual; não combine com --recursive.")
+    if args.pack_shorts and (args.use_async or args.batch or args.watch):
+        parser.error("--pack-shorts vale para o modo padrão (threads); não combine com --async, --batch ou --watch.")
+    if args.pack_videos < 2:
+        parser.error("--pack-videos deve ser >= 2.")
+    if args.export_rag and args.watch:
+        parser.error("--export-rag exporta as legendas encontradas e sai; não combine com --watch.")
+    if args.chunk_sentences < 1 or not 0 <= args.overlap_sentences < args.chunk_sentences:
+        parser.error("--overlap-sentences deve ser >= 0 e menor que --chunk-sentences (>= 1).")
+    return args
+
+def finish_report(args):
+    """Grava o relatório do --report (JSON/CSV) e mostra a tabela-resumo."""
+    if not args.report:
+        return
+    run_report.info["cache"] = summary_cache.stats()
+    run_report.write(args.report)
+    print(f"{Colors.BLUE}{run_report.format_table()}{Colors.ENDC}")
+    print(f"{Colors.BLUE}Relatório gravado em {args.report}{Colors.ENDC}")
+
+def set_prompt_budget(tokens):
+    """Define o orçamento do prompt simples, limitado à janela de contexto (menos template e saída)."""
+    global prompt_token_budget
+    ceiling = MODEL_CONTEXT_TOKENS - estimate_prompt_tokens(PROMPT_TEMPLATE) - SUMMARY_OUTPUT_TOKENS
+    if tokens > ceiling:
+        print(f"{Colors.WARNING}⚠ --prompt-tokens {tokens} passa da janela de contexto de {MODEL_ID}; "
+              f"usando {ceiling}.{Colors.ENDC}")
+        tokens = ceiling
+    prompt_token_budget = max(1, tokens)
+
+def set_api_concurrency(workers):
+    """Teto de chamadas simultâneas dos modos com threads; recria o pool do map-reduce no novo tamanho."""
+    global api_concurrency, api_slots
+    api_concurrency = max(1, workers)
+    api_slots = threading.BoundedSemaphore(api_concurrency)
+    if map_pool.created:
+        map_pool.shutdown(wait=True)
+    map_pool.reset()
+
+def main(argv=None):
+    args = parse_args(argv)
+    set_prompt_budget(args.prompt_tokens)
+    set_api_concurrency(args.workers)
+
+    # Só o --dry-run e o --export-rag funcionam sem a chave (o cliente em si só é criado na primeira chamada)
+    if not args.dry_run and not args.export_rag and not has_api_key():
+        print(f"ERRO: A variável GEMINI_API_KEY não foi encontrada no arquivo .env em: {ENV_PATH}")
+        print("Por favor, crie um arquivo .env com: GEMINI_API_KEY=sua_chave_aqui")
+        sys.exit(1)
+
+    # Define o diretório de trabalho como o diretório atual
+    current_dir = os.getcwd()
+    print(f"Iniciando processamento em: {current_dir}")
+    
+    if args.watch:
+        run_report.enabled = bool(args.report)
+        run_report.info.update({
+            "script": "lexis.py", "model": MODEL_ID, "mode": "watch",
+            "price_per_mtok": {"input": PRICE_INPUT_PER_MTOK, "output": PRICE_OUTPUT_PER_MTOK},
+        })
+        run_watch(current_dir, args)
+        save_indexes()
+        finish_report(args)
+        summary_cache.close()
+        return
+
+    # Busca todos os arquivos .srt (da árvore inteira com --recursive)
+    srt_files = find_srt_files(current_dir, args)
+    
+    if not srt_files:
+        where = "na árvore de pastas" if args.recursive else "na pasta atual"
+        print(f"{Colors.WARNING}Nenhum arquivo .srt encontrado {where}.{Colors.ENDC}")
+        return
+
+    if args.calibrate_tokens is not None:
+        calibrate_tokens(srt_files, args)
+        summary_cache.close()
+        return
+
+    mode = "batch" if args.batch else "async" if args.use_async else "threaded"
+    if args.export_rag:
+        mode = "export-rag"
+    price_factor = BATCH_PRICE_FACTOR if args.batch else 1.0
+    run_report.enabled = bool(args.report)
+    run_report.info.update({
+        "script": "lexis.py", "model": MODEL_ID, "mode": mode, "dry_run": args.dry_run,
+        "prompt_tokens": prompt_token_budget,
+        "token_calibration": token_estimator.calibration,
+        "price_per_mtok": {"input": PRICE_INPUT_PER_MTOK * price_factor,
+                           "output": PRICE_OUTPUT_PER_MTOK * price_factor},
+    })
+
+    if args.pack_shorts:
+        run_report.info["pack_shorts"] = {"tokens": args.pack_tokens, "videos": args.pack_videos}
+
+    duplicates = {}
+    if not args.keep_duplicates:
+        srt_files, duplicates = skip_near_duplicates(srt_files, args)
+        run_report.info["duplicates"] = duplicates
+
+    if args.export_rag:
+        export_rag(srt_files, args)
+        save_indexes()
+        finish_report(args)
+        summary_cache.close()
+        return
+
+    if args.dry_run:
+        print(f"{Colors.BLUE}Encontrados {len(srt_files)} arquivos .srt. Estimando (modo {mode})...{Colors.ENDC}")
+        preflight(srt_files, args)
+        save_indexes()
+        finish_report(args)
+        summary_cache.close()
+        return
+
+    if args.batch:
+        print(f"{Colors.BLUE}Encontrados {len(srt_files)} arquivos .srt. Modo batch (Gemini Batch API)...{Colors.ENDC}")
+        success_files = run_batch(srt_files, current_dir, args)
+    elif args.use_async:
+        print(f"{Colors.BLUE}Encontrados {len(srt_files)} arquivos .srt. Iniciando processamento assíncrono "
+              f"(concorrência adaptativa {args.initial_concurrency}→{args.max_concurrency})...{Colors.ENDC}")
+        success_files = asyncio.run(run_async(srt_files, current_dir, args))
+    else:
+        print(f"{Colors.BLUE}Encontrados {len(srt_files)} arquivos .srt. Iniciando processamento paralelo (max {args.workers} threads)...{Colors.ENDC}")
+        success_files = run_threaded(srt_files, current_dir, args)
+
+    # Persiste o cache lateral de metadados (.lexis_meta_cache.json) para a próxima execução
+    save_indexes()
+
+    print(f"{Colors.GREEN}\n--- Processamento concluído. Iniciando Arquivamento ---{Colors.ENDC}")
+    
+    # Arquivamento em lote
+    archive_files(success_files, current_dir, args.archive_mode)
+    archive_duplicates(duplicates, current_dir, args.archive_mode)
+
+    print(f"{Colors.GREEN}\n--- Processamento concluído ---{Colors.ENDC}")
+    print(f"{Colors.BLUE}Modelo utilizado: {Colors.BOLD}{MODEL_ID}{Colors.ENDC}")
+
+    stats = summary_cache.stats()
+    print(f"{Colors.BLUE}Cache de resumos: {stats['hits']} acertos, {stats['misses']} falhas "
+          f"(taxa {stats['hit_rate']:.0%}), {stats['entries']} entradas em {CACHE_PATH}{Colors.ENDC}")
+    finish_report(args)
+    summary_cache.close()
+
+if __name__ == "__main__":
+    main()
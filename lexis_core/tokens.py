@@ -0,0 +1,216 @@
+"""
+MÓDULO: lexis_core.tokens
+DESCRIÇÃO:
+    Estimativa offline de tokens do Gemini, usada no lugar de "caracteres / 4":
+    - lexis.py: orçamento do prompt (--prompt-tokens), cota de TPM e --dry-run;
+    - lexis-join.py: volumes fechados por orçamento de tokens (--max-tokens).
+
+    Texto em português com acentos e números foge muito da regra dos 4 caracteres:
+    cada dígito costuma ser um token, pontuação também, e palavras longas ou
+    acentuadas se dividem em mais pedaços. O estimador é um modelo linear sobre
+    contagens baratas do texto (FEATURES):
+        tokens ≈ a·palavras + b·letras + c·dígitos + d·símbolos + e·letras_não_ascii
+    Os coeficientes padrão são conservadores; `lexis.py --calibrate-tokens N`
+    ajusta-os (mínimos quadrados) contra o count_tokens do Gemini para o modelo
+    em uso e grava o resultado em .lexis_tokens.json, junto com as contagens já
+    pagas (por hash do texto), para que recalibrações não repitam chamadas.
+    O lexis-join.py (offline) só lê esse arquivo.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+
+CALIBRATION_FILENAME = ".lexis_tokens.json"
+
+FEATURES = ("words", "letters", "digits", "symbols", "non_ascii")
+DEFAULT_COEFFICIENTS = {"words": 0.8, "letters": 0.09, "digits": 1.0, "symbols": 1.0, "non_ascii": 0.15}
+
+# Contagens guardadas por modelo no arquivo de calibração (as mais antigas saem primeiro)
+MAX_CACHED_COUNTS = 2000
+
+REGEX_LETTERS = re.compile(r'[^\W\d_]+')
+REGEX_DIGIT = re.compile(r'\d')
+REGEX_SYMBOL = re.compile(r'[^\w\s]|_')
+# Mesma divisão, numa passada só (usada para cortar o texto no orçamento)
+REGEX_PIECE = re.compile(r'([^\W\d_]+)|\d|[^\w\s]|_')
+
+
+def text_features(text):
+    """Contagens de FEATURES do texto."""
+    words = REGEX_LETTERS.findall(text)
+    letters = sum(map(len, words))
+    non_ascii = len(text) - len(text.encode('ascii', 'ignore'))
+    return {
+        "words": len(words),
+        "letters": letters,
+        "digits": len(REGEX_DIGIT.findall(text)),
+        "symbols": len(REGEX_SYMBOL.findall(text)),
+        "non_ascii": non_ascii,
+    }
+
+
+def text_key(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def fit_coefficients(samples):
+    """
+    Mínimos quadrados não negativos (simplificado) de [(features, tokens_reais)].
+    Coeficientes que sairiam negativos são zerados e o ajuste é refeito sem eles.
+    """
+    active = list(FEATURES)
+    while active:
+        n = len(active)
+        # Equações normais (XᵀX)·c = Xᵀy, resolvidas por eliminação de Gauss
+        matrix = [[0.0] * (n + 1) for _ in range(n)]
+        for features, tokens in samples:
+            row = [features[name] for name in active]
+            for i in range(n):
+                for j in range(n):
+                    matrix[i][j] += row[i] * row[j]
+                matrix[i][n] += row[i] * tokens
+        for i in range(n):
+            # Regularização mínima: features sempre zero (ex: sem dígitos) não tornam o sistema singular
+            matrix[i][i] += 1e-6
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(matrix[r][col]))
+            matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+            for r in range(n):
+                if r != col and matrix[r][col]:
+                    factor = matrix[r][col] / matrix[col][col]
+                    for c in range(col, n + 1):
+                        matrix[r][c] -= factor * matrix[col][c]
+        solution = {name: matrix[i][n] / matrix[i][i] for i, name in enumerate(active)}
+        negative = [name for name, value in solution.items() if value < 0]
+        if not negative:
+            return {name: round(solution.get(name, 0.0), 6) for name in FEATURES}
+        active = [name for name in active if name not in negative]
+    return dict(DEFAULT_COEFFICIENTS)
+
+
+def mean_relative_error(coefficients, samples):
+    """Erro relativo médio (|estimado - real| / real) dos coeficientes sobre as amostras."""
+    errors = [
+        abs(sum(coefficients[name] * features[name] for name in FEATURES) - tokens) / tokens
+        for features, tokens in samples if tokens
+    ]
+    return sum(errors) / len(errors) if errors else None
+
+
+class TokenEstimator:
+    """
+    Uso:
+        estimator = TokenEstimator.load(caminho_do_json, "gemini-flash-latest")
+        estimator.estimate(texto)             # tokens estimados
+        estimator.truncate(texto, 2500)       # maior prefixo (em palavras) que cabe no orçamento
+        estimator.truncate_chunks(pedacos, 2500)  # idem, lendo o texto em pedaços
+    """
+
+    def __init__(self, coefficients=None, model_id=None, path=None):
+        self.coefficients = dict(coefficients or DEFAULT_COEFFICIENTS)
+        self.model_id = model_id
+        self.path = path
+        self.calibration = None   # dados da última calibração do modelo (se houver)
+        self.counts = {}          # hash do texto -> tokens reais (count_tokens)
+
+    @classmethod
+    def load(cls, path, model_id):
+        """Estimador do modelo a partir do arquivo de calibração; coeficientes padrão se não houver."""
+        estimator = cls(model_id=model_id, path=path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return estimator
+        entry = data.get("models", {}).get(model_id)
+        if entry:
+            estimator.calibration = {k: v for k, v in entry.items() if k != "counts"}
+            estimator.coefficients.update(entry.get("coefficients", {}))
+            estimator.counts = entry.get("counts", {})
+        return estimator
+
+    def estimate(self, text):
+        features = text_features(text)
+        return round(sum(self.coefficients[name] * features[name] for name in FEATURES))
+
+    def truncate(self, text, max_tokens):
+        """Corta o texto no orçamento de tokens, sem quebrar palavras (texto que cabe volta inteiro)."""
+        if self.estimate(text) <= max_tokens:
+            return text
+        cut, _ = self._cut(text, max_tokens)
+        return text if cut is None else text[:cut].rstrip()
+
+    def truncate_chunks(self, chunks, max_tokens):
+        """
+        O mesmo corte de truncate para um texto lido em pedaços (quebrados entre palavras),
+        consumindo só os pedaços necessários. Não testa se o texto inteiro cabe: quem chama
+        já conhece a estimativa total (ex: SpooledText.tokens).
+        """
+        kept = []
+        total = 0.0
+        for chunk in chunks:
+            cut, total = self._cut(chunk, max_tokens, total)
+            if cut is not None:
+                kept.append(chunk[:cut])
+                break
+            kept.append(chunk)
+        return ''.join(kept).rstrip()
+
+    def _cut(self, text, max_tokens, total=0.0):
+        """(posição onde o acumulado passa de max_tokens ou None, acumulado) percorrendo o texto."""
+        c = self.coefficients
+        word_cost, letter_cost, non_ascii_cost = c["words"], c["letters"], c["non_ascii"]
+        for match in REGEX_PIECE.finditer(text):
+            word = match.group(1)
+            if word is not None:
+                total += word_cost + letter_cost * len(word)
+                if not word.isascii():
+                    total += non_ascii_cost * (len(word) - len(word.encode('ascii', 'ignore')))
+            else:
+                piece = match.group(0)
+                total += c["digits"] if piece.isdigit() else c["symbols"]
+            if total > max_tokens:
+                return match.start(), total
+        return None, total
+
+    def calibrate(self, texts, count_tokens):
+        """
+        Ajusta os coeficientes contra `count_tokens(texto) -> int` (a API do Gemini).
+        Textos já contados (mesmo hash) não são enviados de novo.
+        Retorna (erro_antes, erro_depois, chamadas_feitas).
+        """
+        samples = []
+        calls = 0
+        for text in texts:
+            key = text_key(text)
+            if key not in self.counts:
+                self.counts[key] = count_tokens(text)
+                calls += 1
+            samples.append((text_features(text), self.counts[key]))
+
+        before = mean_relative_error(self.coefficients, samples)
+        self.coefficients = fit_coefficients(samples)
+        after = mean_relative_error(self.coefficients, samples)
+        self.calibration = {
+            "coefficients": self.coefficients,
+            "samples": len(samples),
+            "mean_relative_error": round(after, 4) if after is not None else None,
+            "calibrated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        return before, after, calls
+
+    def save(self):
+        """Grava a calibração deste modelo no arquivo (preservando a de outros modelos)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        counts = dict(list(self.counts.items())[-MAX_CACHED_COUNTS:])
+        data.setdefault("models", {})[self.model_id] = {**(self.calibration or {}), "counts": counts}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
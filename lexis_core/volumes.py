@@ -0,0 +1,142 @@
+"""
+MÓDULO: lexis_core.volumes
+DESCRIÇÃO:
+    Escrita em streaming dos volumes CONSOLIDADO_<canal>_VOL_NNN.txt.
+    Cada vídeo processado é codificado uma única vez e gravado direto no arquivo
+    aberto, sem acumular o volume inteiro em memória (pico = um vídeo; um vídeo
+    num SpooledText em disco é copiado em pedaços).
+
+    O orçamento de cada volume pode ser medido em bytes (tamanho real do arquivo
+    em UTF-8, incluindo o cabeçalho), em caracteres ou em tokens estimados
+    (lexis_core.tokens; a estimativa é aditiva, então o volume soma a dos vídeos). Um vídeo nunca é dividido:
+    se ele não couber no volume atual (e o volume não estiver vazio), o volume
+    é fechado e um novo é aberto.
+"""
+import os
+
+
+def volume_filename(channel, volume):
+    return f"CONSOLIDADO_{channel}_VOL_{volume:03d}.txt"
+
+
+def volume_header(channel, volume):
+    return f"CANAL: {channel} | VOLUME: {volume}\n--- CONTEÚDO DOS VÍDEOS ---\n"
+
+
+class VolumeWriter:
+    """
+    Uso:
+        writer = VolumeWriter(output_dir, canal, max_bytes=..., on_close=callback)
+        volume = writer.add(texto_do_video)   # retorna o número do volume usado
+        writer.close()
+
+    Para continuar um volume existente (modo incremental), informe start_volume,
+    start_bytes (tamanho atual do arquivo), start_chars e start_tokens; o arquivo é aberto em append.
+    Com max_tokens, count_tokens(texto) estima os tokens de textos que chegam sem contagem.
+    on_close(volume, path, bytes, chars, tokens) é chamado sempre que um volume é fechado.
+    """
+
+    def __init__(self, output_dir, channel, max_bytes=None, max_chars=None, max_tokens=None,
+                 start_volume=1, start_bytes=0, start_chars=0, start_tokens=0, count_tokens=None, on_close=None):
+        if max_bytes is None and max_chars is None and max_tokens is None:
+            raise ValueError("Informe max_bytes, max_chars ou max_tokens")
+        if max_tokens is not None and count_tokens is None:
+            raise ValueError("max_tokens exige count_tokens")
+        self.output_dir = output_dir
+        self.channel = channel
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens
+        self.on_close = on_close
+        self.volume = start_volume
+        self.bytes = start_bytes
+        self.chars = start_chars
+        self.tokens = start_tokens
+        self.videos = 0
+        # Volume retomado já contém vídeos: o próximo só entra se couber
+        self.has_content = start_bytes > 0
+        self._handle = None
+
+    @property
+    def path(self):
+        return os.path.join(self.output_dir, volume_filename(self.channel, self.volume))
+
+    def _fits(self, data_len, text_len, tokens):
+        if self.max_bytes is not None and self.bytes + data_len > self.max_bytes:
+            return False
+        if self.max_chars is not None and self.chars + text_len > self.max_chars:
+            return False
+        if self.max_tokens is not None and self.tokens + tokens > self.max_tokens:
+            return False
+        return True
+
+    def _open(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.bytes > 0:
+            self._handle = open(self.path, 'ab')
+            return
+        header = volume_header(self.channel, self.volume)
+        encoded = header.encode('utf-8')
+        self._handle = open(self.path, 'wb')
+        self._handle.write(encoded)
+        self.bytes = len(encoded)
+        self.chars = len(header)
+        self.tokens = self.count_tokens(header) if self.count_tokens else 0
+
+    def _close_current(self):
+        if self._handle is None:
+            return
+        self._handle.close()
+        self._handle = None
+        if self.on_close:
+            self.on_close(self.volume, self.path, self.bytes, self.chars, self.tokens)
+
+    def new_volume(self):
+        """Fecha o volume atual (se tiver conteúdo); o próximo add() abre o volume seguinte."""
+        if not self.has_content:
+            return
+        self._close_current()
+        self.volume += 1
+        self.bytes = 0
+        self.chars = 0
+        self.tokens = 0
+        self.has_content = False
+
+    def add(self, text, tokens=None):
+        """
+        Grava o texto de um vídeo inteiro, abrindo um novo volume se necessário.
+        `text` é uma str ou um SpooledText (lexis_core.spool), copiado para o volume em pedaços.
+        `tokens` é a estimativa já calculada (ex: num processo do pool); None = calcular aqui.
+        """
+        if isinstance(text, str):
+            data = text.encode('utf-8')
+            data_len, text_len = len(data), len(text)
+        else:
+            data = None
+            data_len, text_len = text.bytes, text.chars
+        if tokens is None:
+            tokens = self._estimate(text) if self.count_tokens else 0
+        if self.has_content and not self._fits(data_len, text_len, tokens):
+            self.new_volume()
+
+        if self._handle is None:
+            self._open()
+        if data is not None:
+            self._handle.write(data)
+        else:
+            text.copy_to(self._handle)
+        self.bytes += data_len
+        self.chars += text_len
+        self.tokens += tokens
+        self.videos += 1
+        self.has_content = True
+        return self.volume
+
+    def _estimate(self, text):
+        if isinstance(text, str):
+            return self.count_tokens(text)
+        return sum(self.count_tokens(chunk) for chunk in text.chunks())
+
+    def close(self):
+        self._close_current()
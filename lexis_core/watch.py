@@ -0,0 +1,179 @@
+"""
+MÓDULO: lexis_core.watch
+DESCRIÇÃO:
+    Observação de diretório para o modo --watch do lexis.py: legendas novas são
+    processadas poucos segundos depois que o yt-dlp as grava, sem esperar o fim
+    do lote inteiro.
+
+    - InotifyWatcher: inotify do Linux via ctypes (sem dependências), acordado
+      pelo kernel em IN_CLOSE_WRITE / IN_MOVED_TO / IN_CREATE / IN_MODIFY.
+    - PollingWatcher: alternativa portátil (macOS, sistemas de arquivos de rede),
+      compara (tamanho, mtime) de um scandir a cada `interval` segundos.
+    - PendingFiles: "debounce" de arquivos ainda sendo escritos. Um arquivo só fica
+      pronto quando (tamanho, mtime) não muda por `settle` segundos e o .info.json
+      correspondente existe (ou após `info_timeout` segundos sem ele).
+
+    Os dois watchers expõem poll(timeout) -> conjunto de nomes alterados no diretório.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (seguido do nome com padding)
+_READ_SIZE = 64 * 1024
+
+
+def _list_names(directory):
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
+
+
+class InotifyWatcher:
+    """Observa um diretório (não recursivo) com inotify. Levanta OSError se indisponível."""
+
+    kind = "inotify"
+
+    def __init__(self, directory):
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        # AttributeError aqui (libc sem inotify, ex: macOS) também cai no PollingWatcher
+        init1, add_watch = libc.inotify_init1, libc.inotify_add_watch
+        fd = init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        if add_watch(fd, os.fsencode(directory), WATCH_MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch falhou em {directory}")
+        self.fd = fd
+
+    def poll(self, timeout):
+        """Nomes alterados desde a última chamada (espera até `timeout` segundos por eventos)."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        names = set()
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                if mask & IN_Q_OVERFLOW:
+                    # Fila do kernel estourou: eventos perdidos, relista o diretório
+                    names |= _list_names(self.directory)
+                elif length:
+                    names.add(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+                offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Alternativa sem inotify: compara (tamanho, mtime) de um scandir a cada `interval` segundos."""
+
+    kind = "polling"
+
+    def __init__(self, directory, interval=1.0):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        st = entry.stat()
+                        snapshot[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        return snapshot
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {name for name, signature in current.items() if self.snapshot.get(name) != signature}
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory, interval=1.0, polling=False):
+    """InotifyWatcher quando disponível (e polling=False); senão PollingWatcher."""
+    if not polling:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, interval)
+
+
+class PendingFiles:
+    """
+    Arquivos aguardando ficar prontos.
+        pending = PendingFiles(settle=2.0, info_timeout=30.0, has_info=indice.has_info)
+        pending.add("Canal-abc.pt.srt")       # a cada evento do arquivo
+        for name in pending.pop_ready(): ...  # a cada volta do laço
+    """
+
+    def __init__(self, settle=2.0, info_timeout=30.0, has_info=None):
+        self.settle = settle
+        self.info_timeout = info_timeout
+        self.has_info = has_info
+        self.files = {}   # nome -> [assinatura (tamanho, mtime_ns), estável desde, visto em]
+
+    def __len__(self):
+        return len(self.files)
+
+    def add(self, name, now=None):
+        now = time.monotonic() if now is None else now
+        entry = self.files.get(name)
+        if entry is None:
+            self.files[name] = [None, now, now]
+        else:
+            # Novo evento: o arquivo ainda está sendo escrito, reinicia a espera
+            entry[1] = now
+
+    def pop_ready(self, now=None):
+        """Remove e retorna (em ordem de nome) os arquivos prontos para processar."""
+        now = time.monotonic() if now is None else now
+        ready = []
+        for name, entry in list(self.files.items()):
+            try:
+                st = os.stat(name)
+            except OSError:
+                # Removido ou renomeado antes de ficar pronto
+                del self.files[name]
+                continue
+            signature = (st.st_size, st.st_mtime_ns)
+            if signature != entry[0]:
+                entry[0], entry[1] = signature, now
+            if st.st_size == 0 or now - entry[1] < self.settle:
+                continue
+            if self.has_info and not self.has_info(name) and now - entry[2] < self.info_timeout:
+                continue
+            del self.files[name]
+            ready.append(name)
+        return sorted(ready)